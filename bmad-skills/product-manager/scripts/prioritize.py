@@ -7,6 +7,7 @@ RICE = (Reach × Impact × Confidence) / Effort
 Usage:
     python prioritize.py                    # Interactive mode
     python prioritize.py --batch features.csv  # Batch mode from CSV
+    python prioritize.py --batch lines/        # Rank every CSV in a directory
     python prioritize.py --help             # Show help
 
 Interactive mode will prompt for:
@@ -16,12 +17,141 @@ Interactive mode will prompt for:
 - Effort: Person-months of work
 
 Batch mode expects CSV with columns: name,reach,impact,confidence,effort
+
+Batch mode reads the CSV in chunks and validates and scores each chunk
+column by column (with NumPy when it is installed, plain Python otherwise),
+keeping only the name and RICE columns of valid rows. Rows are ranked
+once, by RICE score with ties in input order, and the ranking feeds both
+the table and the export. --top K keeps only a bounded heap of the best K
+rows; full rankings of very large files are merge-sorted through
+temporary files.
+
+--batch also takes several files, directories or globs (one file per
+product line, say). Each file is ranked in a process pool and the results
+are merged into one global ranking with source and source_rank columns.
+
+--store DB keeps the last ranking of a batch file in SQLite and reports
+new, changed and removed features and each feature's rank movement.
+
+--sensitivity treats reach, confidence and effort as estimates: it
+perturbs them over many trials (as NumPy arrays when available) and
+reports how likely each feature is to stay in the top N and its rank
+interval.
+
+--budget N picks the set of features with the highest total RICE score
+whose effort fits in N person-months (--require and --exclude pin
+features in or out). It is solved exactly by dynamic programming or
+branch and bound, or greedily with a bound on the distance from optimal
+when the search would be too large.
 """
 
+import os
 import sys
-import csv
+import heapq
+import hashlib
 import argparse
-from typing import List, Dict, Tuple
+import bisect
+import struct
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple, Union
+
+# NumPy once _load_numpy() has imported it; None until then or if not installed.
+# Batch loading, sensitivity analysis and the portfolio optimizer load it, so
+# --help, usage errors and interactive ranking skip the import.
+np = None
+_numpy_tried = False
+
+# Allowed impact values (minimal, low, medium, high, massive)
+ALLOWED_IMPACTS = (0.25, 0.5, 1, 2, 3)
+
+# Batch-mode validation failures, in the order each row is checked
+SKIP_REASONS = (
+    "Reach must be positive",
+    "Impact must be 0.25, 0.5, 1, 2, or 3",
+    "Confidence must be 0-100",
+    "Effort must be positive",
+)
+
+# CSV rows read, validated and scored together in batch mode
+CHUNK_ROWS = 8192
+
+# Rows sorted in memory at once; longer batches are merge-sorted from temporary files
+SORT_RUN_ROWS = 100000
+
+# Rows per pickled block in a temporary sort file
+SPILL_BLOCK_ROWS = 4096
+
+# Temporary sort files merged at once (bounds open files)
+MERGE_FAN_IN = 64
+
+# Sensitivity analysis: trials, top group size and relative spread per field
+DEFAULT_TRIALS = 1000
+DEFAULT_SENSITIVITY_TOP = 10
+DEFAULT_SPREADS = {'reach': 0.2, 'confidence': 0.2, 'effort': 0.3}
+DISTRIBUTIONS = ('uniform', 'triangular', 'normal')
+
+# Smallest multiplier normal noise can apply (keeps effort positive)
+MIN_MULTIPLIER = 0.01
+
+# Percentiles of a feature's simulated rank reported as its rank interval
+RANK_INTERVAL = (5, 95)
+
+# Rank histogram bins per feature (ranks are exact up to this many features)
+RANK_BINS = 1000
+
+# Score cells (trials x features) computed per NumPy batch
+SENSITIVITY_BATCH_CELLS = 1 << 21
+
+# Portfolio optimizer: largest exact DP table (features x budget steps) with
+# and without NumPy, branch-and-bound node limit, and effort rounding slack
+DP_MAX_CELLS = 50000000
+DP_MAX_CELLS_PYTHON = 2000000
+BNB_MAX_NODES = 200000
+EFFORT_TOLERANCE = 1e-9
+
+# Suffixes of the default exports written next to a batch file
+# (features.csv -> features_results.csv); find_feature_files skips them
+RESULTS_SUFFIX = '_results'
+PORTFOLIO_SUFFIX = '_portfolio'
+SENSITIVITY_SUFFIX = '_sensitivity'
+GENERATED_SUFFIXES = (RESULTS_SUFFIX, PORTFOLIO_SUFFIX, SENSITIVITY_SUFFIX)
+
+# Default export file when --batch names several CSV files
+MULTI_FILE_OUTPUT = 'prioritized' + RESULTS_SUFFIX + '.csv'
+
+# Table of the --store database; rank is the feature's rank in the last run
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS features (
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    occurrence INTEGER NOT NULL,
+    row_hash TEXT NOT NULL,
+    rice_score REAL,
+    rank INTEGER NOT NULL,
+    PRIMARY KEY (source, name, occurrence)
+) WITHOUT ROWID
+"""
+
+# Removed feature names listed after a --store run
+STORE_REMOVED_SHOWN = 10
+
+# (name, reach, impact, confidence, effort, rice_score), plus source and
+# source_rank for multi-file batches or rank_change with --store
+RankedRow = Tuple[str, float, float, float, float, float]
+
+
+def _load_numpy():
+    """Import NumPy on first use; returns None if it is not installed."""
+    global np, _numpy_tried
+    if not _numpy_tried:
+        _numpy_tried = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
 
 
 class Feature:
@@ -45,10 +175,55 @@ class Feature:
         return f"Feature(name='{self.name}', rice={self.rice_score:.2f})"
 
 
+class FeatureTable:
+    """
+    Features stored column by column.
+
+    Holds a list of names and one packed float array per RICE component
+    instead of one Feature object (with its attribute dict) per row.
+    """
+
+    __slots__ = ('name', 'reach', 'impact', 'confidence', 'effort', 'rice_score')
+
+    def __init__(self):
+        self.name = []
+        self.reach = array('d')
+        self.impact = array('d')
+        self.confidence = array('d')
+        self.effort = array('d')
+        self.rice_score = array('d')
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def extend(self, names: List[str], reach, impact, confidence, effort, rice_score):
+        """Append rows given as columns (lists or NumPy arrays)."""
+        self.name.extend(names)
+        for column, values in ((self.reach, reach), (self.impact, impact), (self.confidence, confidence),
+                               (self.effort, effort), (self.rice_score, rice_score)):
+            if np is not None and isinstance(values, np.ndarray):
+                column.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+            else:
+                column.extend(values)
+
+    @classmethod
+    def from_features(cls, features: List[Feature]) -> 'FeatureTable':
+        """Build a table from Feature objects (e.g. from interactive mode)."""
+        table = cls()
+        table.extend([f.name for f in features], [f.reach for f in features], [f.impact for f in features],
+                     [f.confidence for f in features], [f.effort for f in features],
+                     [f.rice_score for f in features])
+        return table
+
+    def row(self, i: int) -> Tuple[str, float, float, float, float, float]:
+        """Return row i as (name, reach, impact, confidence, effort, rice_score)."""
+        return (self.name[i], self.reach[i], self.impact[i], self.confidence[i],
+                self.effort[i], self.rice_score[i])
+
+
 def validate_impact(value: float) -> bool:
     """Validate impact is one of the allowed values."""
-    allowed = [0.25, 0.5, 1, 2, 3]
-    return value in allowed
+    return value in ALLOWED_IMPACTS
 
 
 def validate_confidence(value: float) -> bool:
@@ -149,10 +324,132 @@ def interactive_mode() -> List[Feature]:
     return features
 
 
-def batch_mode(csv_file: str) -> List[Feature]:
-    """Load features from CSV file."""
-    features = []
+def _data_rows(reader: 'csv.DictReader') -> Iterator[List[str]]:
+    """Yield raw data rows, skipping blank lines like csv.DictReader does."""
+    for row in reader.reader:
+        if row:
+            yield row
+
+
+def _parse_chunk(rows: List[List[str]], indexes: List[int]):
+    """
+    Parse a chunk of rows into a name column and four float columns.
+
+    All values are converted column-wise first; only if that fails is the
+    chunk redone row by row to find the failing rows. Values are read in
+    the same order as a per-row parse (name, reach, impact, confidence,
+    effort), so the first error of a row is the one reported.
+
+    Returns:
+        Tuple of (positions of parsed rows, names, [reach, impact,
+        confidence, effort], {position: error message}, fatal error or None).
+        A fatal error (e.g. a missing field) stops parsing at that row.
+    """
+    columns = [[row[i] if i < len(row) else None for row in rows] for i in indexes]
+    try:
+        names = [value.strip() for value in columns[0]]
+        numbers = [list(map(float, column)) for column in columns[1:]]
+        return range(len(rows)), names, numbers, {}, None
+    except (AttributeError, TypeError, ValueError):
+        pass
+
+    positions, names, numbers, errors = [], [], [[], [], [], []], {}
+    for position in range(len(rows)):
+        try:
+            name = columns[0][position].strip()
+            values = [float(column[position]) for column in columns[1:]]
+        except ValueError as e:
+            errors[position] = f"Invalid data, skipping ({e})"
+            continue
+        except Exception as e:
+            return positions, names, numbers, errors, e
+        positions.append(position)
+        names.append(name)
+        for column, value in zip(numbers, values):
+            column.append(value)
+    return positions, names, numbers, errors, None
+
+
+def _score_columns(reach, impact, confidence, effort):
+    """
+    Validate and score parsed columns.
+
+    Returns:
+        Tuple of (per-row index into SKIP_REASONS plus one, 0 for valid
+        rows; RICE scores, meaningful for valid rows only)
+    """
+    if np is not None:
+        reach, impact, confidence, effort = (np.asarray(c, dtype=np.float64)
+                                             for c in (reach, impact, confidence, effort))
+        reasons = np.select(
+            [~(reach > 0), ~np.isin(impact, ALLOWED_IMPACTS),
+             ~((0 <= confidence) & (confidence <= 100)), ~(effort > 0)],
+            [1, 2, 3, 4], 0)
+        with np.errstate(all='ignore'):
+            rice = (reach * impact * (confidence / 100)) / effort
+        return reasons, rice
+
+    reasons = []
+    rice = []
+    for r, i, c, e in zip(reach, impact, confidence, effort):
+        if not validate_positive(r):
+            reasons.append(1)
+        elif not validate_impact(i):
+            reasons.append(2)
+        elif not validate_confidence(c):
+            reasons.append(3)
+        elif not validate_positive(e):
+            reasons.append(4)
+        else:
+            reasons.append(0)
+            rice.append((r * i * (c / 100)) / e)
+            continue
+        rice.append(0.0)
+    return reasons, rice
+
+
+def _load_chunk(features: FeatureTable, rows: List[List[str]], indexes: List[int], first_row_num: int):
+    """Parse, validate and score one chunk, printing skipped-row warnings in row order."""
+    positions, names, numbers, warnings, fatal = _parse_chunk(rows, indexes)
+    reasons, rice = _score_columns(*numbers)
 
+    if np is not None:
+        valid = reasons == 0
+        invalid = np.flatnonzero(~valid).tolist()
+    else:
+        invalid = [k for k, reason in enumerate(reasons) if reason]
+    for k in invalid:
+        warnings[positions[k]] = SKIP_REASONS[int(reasons[k]) - 1] + ", skipping"
+
+    for position in sorted(warnings):
+        print(f"Warning: Row {first_row_num + position} - {warnings[position]}")
+
+    if np is not None:
+        features.extend([n for n, ok in zip(names, valid.tolist()) if ok],
+                        *(np.asarray(column, dtype=np.float64)[valid] for column in numbers), rice[valid])
+    elif invalid:
+        keep = [k for k, reason in enumerate(reasons) if not reason]
+        features.extend([names[k] for k in keep], *([column[k] for k in keep] for column in numbers),
+                        [rice[k] for k in keep])
+    else:
+        features.extend(names, *numbers, rice)
+
+    if fatal is not None:
+        raise fatal
+
+
+def read_batch(csv_file: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[FeatureTable]:
+    """
+    Yield the valid features of a CSV file, one chunk at a time.
+
+    Rows are read chunk_rows at a time and only the name and RICE columns
+    of valid rows are kept. Skipped rows are reported one warning per row,
+    in file order, exactly as a row-by-row load would. Unreadable files
+    print an error and exit.
+    """
+    import csv  # imported here so --help and usage errors skip it
+
+    _load_numpy()
     try:
         with open(csv_file, 'r') as f:
             reader = csv.DictReader(f)
@@ -162,38 +459,20 @@ def batch_mode(csv_file: str) -> List[Feature]:
                 print(f"Error: CSV must contain columns: {', '.join(required_columns)}")
                 sys.exit(1)
 
-            for row_num, row in enumerate(reader, start=2):
-                try:
-                    name = row['name'].strip()
-                    reach = float(row['reach'])
-                    impact = float(row['impact'])
-                    confidence = float(row['confidence'])
-                    effort = float(row['effort'])
-
-                    # Validate
-                    if not validate_positive(reach):
-                        print(f"Warning: Row {row_num} - Reach must be positive, skipping")
-                        continue
-                    if not validate_impact(impact):
-                        print(f"Warning: Row {row_num} - Impact must be 0.25, 0.5, 1, 2, or 3, skipping")
-                        continue
-                    if not validate_confidence(confidence):
-                        print(f"Warning: Row {row_num} - Confidence must be 0-100, skipping")
-                        continue
-                    if not validate_positive(effort):
-                        print(f"Warning: Row {row_num} - Effort must be positive, skipping")
-                        continue
-
-                    feature = Feature(name, reach, impact, confidence, effort)
-                    features.append(feature)
-
-                except (ValueError, KeyError) as e:
-                    print(f"Warning: Row {row_num} - Invalid data, skipping ({e})")
-                    continue
-
-        if not features:
-            print("Error: No valid features found in CSV")
-            sys.exit(1)
+            # Like DictReader, a repeated column name refers to its last occurrence
+            position = {column: i for i, column in enumerate(reader.fieldnames)}
+            indexes = [position[column] for column in ('name', 'reach', 'impact', 'confidence', 'effort')]
+
+            rows = _data_rows(reader)
+            row_num = 2
+            while True:
+                chunk = list(islice(rows, chunk_rows))
+                if not chunk:
+                    break
+                features = FeatureTable()
+                _load_chunk(features, chunk, indexes, row_num)
+                row_num += len(chunk)
+                yield features
 
     except FileNotFoundError:
         print(f"Error: File '{csv_file}' not found")
@@ -202,23 +481,464 @@ def batch_mode(csv_file: str) -> List[Feature]:
         print(f"Error reading CSV: {e}")
         sys.exit(1)
 
+
+def _no_features():
+    """Report a batch without valid features and exit."""
+    print("Error: No valid features found in CSV")
+    sys.exit(1)
+
+
+def batch_mode(csv_file: str, chunk_rows: int = CHUNK_ROWS) -> FeatureTable:
+    """Load features from CSV file."""
+    features = FeatureTable()
+    for chunk in read_batch(csv_file, chunk_rows):
+        features.extend(chunk.name, chunk.reach, chunk.impact, chunk.confidence,
+                        chunk.effort, chunk.rice_score)
+
+    if not features:
+        _no_features()
+
     return features
 
 
-def display_results(features: List[Feature]):
-    """Display prioritized features in a formatted table."""
-    # Sort by RICE score descending
-    sorted_features = sorted(features, key=lambda f: f.rice_score, reverse=True)
+def rank_key(entry: Tuple[int, RankedRow]) -> Tuple[int, float, int]:
+    """
+    Sort key for (sequence number, row) entries.
+
+    Ranking rules: higher RICE score first; equal scores keep input order
+    (CSV row or entry order); undefined (NaN) scores rank last.
+    """
+    seq, row = entry
+    rice_score = row[5]
+    if rice_score != rice_score:
+        return (1, 0.0, seq)
+    return (0, -rice_score, seq)
+
+
+def _select(entries: Iterable[Tuple[int, RankedRow]], top: Optional[int] = None) -> List[Tuple[int, RankedRow]]:
+    """Sort entries by rank_key, keeping only a bounded heap of the best top entries if given."""
+    if top is None:
+        return sorted(entries, key=rank_key)
+    return heapq.nsmallest(top, entries, key=rank_key)
+
+
+def ranked_rows(features: Union[List[Feature], FeatureTable], top: Optional[int] = None) -> List[RankedRow]:
+    """
+    Rank features in memory.
+
+    Returns:
+        (name, reach, impact, confidence, effort, rice_score) rows, best
+        first, limited to the first top rows if given
+    """
+    if isinstance(features, FeatureTable):
+        entries = ((i, features.row(i)) for i in range(len(features)))
+    else:
+        entries = enumerate((f.name, f.reach, f.impact, f.confidence, f.effort, f.rice_score)
+                            for f in features)
+    return [row for _, row in _select(entries, top)]
+
+
+def _write_blocks(entries: Iterable, spill_file):
+    """Pickle entries to a file in blocks of SPILL_BLOCK_ROWS."""
+    import pickle  # imported only when a ranking is spilled to disk
+
+    entries = iter(entries)
+    while True:
+        block = list(islice(entries, SPILL_BLOCK_ROWS))
+        if not block:
+            break
+        pickle.dump(block, spill_file, pickle.HIGHEST_PROTOCOL)
+
+
+def _spill(entries: Iterable[Tuple[int, RankedRow]]):
+    """Write sorted entries to a temporary file and return it, rewound."""
+    import tempfile
+
+    spill_file = tempfile.TemporaryFile()
+    _write_blocks(entries, spill_file)
+    spill_file.seek(0)
+    return spill_file
+
+
+def _spill_path(entries: Iterable) -> str:
+    """Write sorted entries to a named temporary file (readable by another process)."""
+    import tempfile
+
+    fd, path = tempfile.mkstemp(prefix='rice-', suffix='.run')
+    with os.fdopen(fd, 'wb') as spill_file:
+        _write_blocks(entries, spill_file)
+    return path
+
+
+def _read_spill_path(path: str) -> Iterator:
+    """Yield the entries of a named spill file, deleting it once read."""
+    try:
+        yield from _read_spill(open(path, 'rb'))
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _read_spill(spill_file) -> Iterator[Tuple[int, RankedRow]]:
+    """Yield the entries of a spilled run, closing the file at the end."""
+    import pickle
+
+    with spill_file:
+        while True:
+            try:
+                block = pickle.load(spill_file)
+            except EOFError:
+                return
+            yield from block
+
+
+def _add_spill(levels: List[List], spill_file, level: int = 0):
+    """
+    Add a spilled run to a merge tree.
+
+    levels[i] holds runs merged from MERGE_FAN_IN**i original runs; a
+    level that fills up is merged into one run on the next level, so at
+    most MERGE_FAN_IN - 1 files per level stay open.
+    """
+    while True:
+        if len(levels) == level:
+            levels.append([])
+        levels[level].append(spill_file)
+        if len(levels[level]) < MERGE_FAN_IN:
+            return
+        spill_file = _spill(heapq.merge(*map(_read_spill, levels[level]), key=rank_key))
+        levels[level] = []
+        level += 1
+
+
+def rank_batch(csv_file: str, top: Optional[int] = None, chunk_rows: int = CHUNK_ROWS,
+               run_rows: int = SORT_RUN_ROWS) -> Iterator[RankedRow]:
+    """
+    Rank the features of a CSV file while streaming it.
+
+    With top, only a heap of the top best rows is kept. Otherwise rows are
+    sorted in runs of run_rows; when there is more than one run, full runs
+    are spilled to temporary files and merged, so memory stays bounded by
+    the run size. The whole file is read (and its warnings printed) before
+    this returns.
+
+    Returns:
+        Iterator over ranked (name, reach, impact, confidence, effort,
+        rice_score) rows
+    """
+    entries = enumerate(row for chunk in read_batch(csv_file, chunk_rows)
+                        for row in map(chunk.row, range(len(chunk))))
+
+    if top is not None:
+        best = _select(entries, top)
+        if not best:
+            _no_features()
+        return (row for _, row in best)
+
+    levels = []
+    run = []
+    for entry in entries:
+        run.append(entry)
+        if len(run) >= run_rows:
+            _add_spill(levels, _spill(_select(run)))
+            run = []
+
+    spilled = [spill_file for level in levels for spill_file in level]
+    if not spilled and not run:
+        _no_features()
+
+    run = _select(run)
+    if not spilled:
+        return (row for _, row in run)
+    merged = heapq.merge(*map(_read_spill, spilled), run, key=rank_key)
+    return (row for _, row in merged)
+
+
+def default_export_path(source: str, suffix: str) -> str:
+    """Export file written next to a batch file, e.g. features_results.csv."""
+    return source.rsplit('.', 1)[0] + suffix + '.csv'
+
+
+def is_generated_export(path: str) -> bool:
+    """True for a CSV this script wrote with one of GENERATED_SUFFIXES."""
+    stem, ext = os.path.splitext(path)
+    return ext == '.csv' and stem.endswith(GENERATED_SUFFIXES)
+
+
+def find_feature_files(paths: List[str]) -> List[str]:
+    """
+    Expand --batch arguments into CSV files.
+
+    Files are used as given; directories are searched recursively for
+    *.csv (skipping the *_results.csv, *_portfolio.csv and
+    *_sensitivity.csv exports this script writes) and patterns such as
+    'lines/*.csv' are globbed. The result is de-duplicated and sorted per
+    argument.
+    """
+    import glob
+
+    found = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = sorted(c for c in glob.glob(os.path.join(path, '**', '*.csv'), recursive=True)
+                                if not is_generated_export(c))
+        elif glob.has_magic(path) and not os.path.exists(path):
+            candidates = sorted(glob.glob(path, recursive=True))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                found.append(candidate)
+    return found
+
+
+def score_source(source: str, index: int, top: Optional[int] = None, chunk_rows: int = CHUNK_ROWS,
+                 run_rows: int = SORT_RUN_ROWS) -> Dict:
+    """
+    Rank one file of a multi-file batch (runs in a pool worker).
+
+    Rows get two provenance fields, the source file and the row's rank
+    within it; entries are keyed (index, source rank) so that equal
+    scores in the global ranking keep file order, then row order.
+
+    Returns:
+        Dict with source, output (the file's warnings and errors) and either
+        rows (the top entries), spill (a temporary file of all ranked
+        entries) or neither if the file could not be scored
+    """
+    import contextlib
+    import io
+
+    output = io.StringIO()
+    result = {'source': source}
+    try:
+        with contextlib.redirect_stdout(output):
+            ranked = rank_batch(source, top, chunk_rows, run_rows)
+            entries = (((index, source_rank), row + (source, source_rank))
+                       for source_rank, row in enumerate(ranked, start=1))
+            if top is not None:
+                result['rows'] = list(entries)
+            else:
+                result['spill'] = _spill_path(entries)
+    except SystemExit:
+        pass
+    result['output'] = output.getvalue()
+    return result
+
+
+def rank_sources(files: List[str], top: Optional[int] = None, workers: Optional[int] = None,
+                 chunk_rows: int = CHUNK_ROWS, run_rows: int = SORT_RUN_ROWS) -> Iterator[RankedRow]:
+    """
+    Rank several CSV files separately and merge them into one ranking.
+
+    Files are scored in a process pool; each worker ranks its file (only
+    its top rows with top) and the sorted results are merged, so the
+    parent never sorts. Warnings and errors are printed per file, prefixed
+    with the file name; unreadable files are skipped.
+
+    Args:
+        files: CSV files, in tie-break order
+        top: Keep only the top rows overall
+        workers: Process pool size (None uses the CPU count)
+
+    Returns:
+        Iterator over ranked rows with source and source_rank appended
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor  # imported only when a pool is used
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            results = pool.map(score_source, files, range(len(files)), [top] * len(files),
+                               [chunk_rows] * len(files), [run_rows] * len(files),
+                               chunksize=max(1, len(files) // (workers * 4)))
+            results = list(results)
+    else:
+        results = [score_source(f, i, top, chunk_rows, run_rows) for i, f in enumerate(files)]
+
+    for result in results:
+        for line in result['output'].splitlines():
+            print(f"{result['source']}: {line}" if line else line)
+
+    runs = [result['rows'] for result in results if 'rows' in result]
+    paths = [result['spill'] for result in results if 'spill' in result]
+    if not runs and not paths:
+        print("Error: No valid features found in CSV files")
+        sys.exit(1)
+
+    # Keep the number of files open at once bounded
+    while len(paths) > MERGE_FAN_IN:
+        paths = [_spill_path(heapq.merge(*map(_read_spill_path, paths[i:i + MERGE_FAN_IN]), key=rank_key))
+                 for i in range(0, len(paths), MERGE_FAN_IN)]
+
+    merged = heapq.merge(*runs, *map(_read_spill_path, paths), key=rank_key)
+    if top is not None:
+        merged = islice(merged, top)
+    return (row for _, row in merged)
+
+
+def _row_hash(reach: float, impact: float, confidence: float, effort: float) -> str:
+    """Hash a row's RICE inputs (stable across runs and Python versions)."""
+    return hashlib.blake2b(struct.pack('<4d', reach, impact, confidence, effort), digest_size=8).hexdigest()
+
+
+def update_store(store_path: str, source: str, features: FeatureTable) -> Tuple[List[RankedRow], Dict]:
+    """
+    Rank features and record the ranking in a SQLite store.
+
+    Features are keyed by name (plus an occurrence number when a name
+    repeats in the file) and carry a hash of their RICE inputs, so each
+    run can tell new, changed, unchanged and removed features apart. Only
+    rows that are new, changed or moved are written; removed ones are
+    deleted. One store can hold several backlogs, keyed by file path.
+
+    Returns:
+        Tuple of (ranked rows with rank_change appended, i.e. the previous
+        rank minus the new one, None for new features; summary dict with
+        new, changed and unchanged counts and the removed names)
+    """
+    import sqlite3  # imported only when a store is used
+
+    occurrences = {}
+    keys = []
+    for name in features.name:
+        occurrence = occurrences.get(name, 0)
+        occurrences[name] = occurrence + 1
+        keys.append((name, occurrence))
+
+    source = os.path.abspath(source)
+    summary = {'new': 0, 'changed': 0, 'unchanged': 0, 'removed': []}
+    ranked = []
+    writes = []
+    try:
+        conn = sqlite3.connect(store_path)
+        try:
+            with conn:
+                conn.execute(STORE_SCHEMA)
+                previous = {(name, occurrence): (row_hash, rank) for name, occurrence, row_hash, rank in conn.execute(
+                    "SELECT name, occurrence, row_hash, rank FROM features WHERE source = ?", (source,))}
+
+                entries = ((i, features.row(i)) for i in range(len(features)))
+                for rank, (i, row) in enumerate(_select(entries), start=1):
+                    row_hash = _row_hash(*row[1:5])
+                    old = previous.pop(keys[i], None)
+                    if old is None:
+                        summary['new'] += 1
+                        change = None
+                    else:
+                        summary['changed' if old[0] != row_hash else 'unchanged'] += 1
+                        change = old[1] - rank
+                    if old != (row_hash, rank):
+                        writes.append((source, keys[i][0], keys[i][1], row_hash, row[5], rank))
+                    ranked.append(row + (change,))
+
+                conn.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?)", writes)
+                conn.executemany("DELETE FROM features WHERE source = ? AND name = ? AND occurrence = ?",
+                                 [(source, name, occurrence) for name, occurrence in previous])
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"Error: Cannot update store '{store_path}': {e}")
+        sys.exit(1)
+
+    summary['removed'] = [name for name, _ in previous]
+    return ranked, summary
+
+
+def print_store_summary(store_path: str, summary: Dict):
+    """Print what changed since the last run recorded in a store."""
+    removed = summary['removed']
+    print(f"\nStore {store_path}: {summary['new']} new, {summary['changed']} changed, "
+          f"{summary['unchanged']} unchanged, {len(removed)} removed")
+    if removed:
+        more = f" (and {len(removed) - STORE_REMOVED_SHOWN} more)" if len(removed) > STORE_REMOVED_SHOWN else ""
+        print(f"Removed since last run: {', '.join(removed[:STORE_REMOVED_SHOWN])}{more}")
+
+
+def _format_change(change: Optional[int]) -> str:
+    """Format a rank movement for the table: new, =, +3 or -2."""
+    if change is None:
+        return 'new'
+    return '=' if change == 0 else f"{change:+d}"
+
+
+# Optional columns appended to ranked rows: column -> (table heading, cell format)
+EXTRA_COLUMNS = {
+    'source': ('Source', str),
+    'source_rank': ('(rank)', '({})'.format),
+    'rank_change': ('Move', _format_change),
+}
+
+
+def _export_row(rank: int, row: RankedRow, extra_columns: Tuple[str, ...] = ()) -> Dict:
+    name, reach, impact, confidence, effort, rice_score = row[:6]
+    export_row = {
+        'rank': rank,
+        'name': name,
+        'reach': reach,
+        'impact': impact,
+        'confidence': confidence,
+        'effort': effort,
+        'rice_score': round(rice_score, 2)
+    }
+    export_row.update(zip(extra_columns, row[6:]))
+    return export_row
+
+
+def _open_export(output_file: str, extra_columns: Tuple[str, ...] = ()):
+    """Open an export file and write its header; returns (file, writer)."""
+    import csv
+
+    f = open(output_file, 'w', newline='')
+    fieldnames = ['rank', 'name', 'reach', 'impact', 'confidence', 'effort', 'rice_score']
+    fieldnames += extra_columns
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+    return f, writer
+
+
+def display_results(rows: Iterable[RankedRow], output_file: Optional[str] = None,
+                    extra_columns: Tuple[str, ...] = ()):
+    """
+    Display ranked rows in a formatted table.
+
+    If output_file is given, the rows are exported in the same pass (see
+    export_results), so a streamed ranking is only produced once.
+    extra_columns names the EXTRA_COLUMNS fields that follow the six RICE
+    fields in each row (e.g. source and source_rank from rank_sources).
+    """
+    export = None
+    export_error = None
+    if output_file:
+        try:
+            export = _open_export(output_file, extra_columns)
+        except Exception as e:
+            export_error = e
 
     print("\n" + "=" * 100)
     print("PRIORITIZATION RESULTS (Ranked by RICE Score)")
     print("=" * 100)
-    print(f"\n{'Rank':<6} {'Feature':<30} {'Reach':<10} {'Impact':<10} {'Confidence':<12} {'Effort':<10} {'RICE Score':<12}")
+    print(f"\n{'Rank':<6} {'Feature':<30} {'Reach':<10} {'Impact':<10} {'Confidence':<12} {'Effort':<10} {'RICE Score':<12}"
+          + "".join(f" {EXTRA_COLUMNS[column][0]}" for column in extra_columns))
     print("-" * 100)
 
-    for rank, feature in enumerate(sorted_features, start=1):
-        print(f"{rank:<6} {feature.name:<30} {feature.reach:<10.0f} {feature.impact:<10.2f} "
-              f"{feature.confidence:<12.0f}% {feature.effort:<10.2f} {feature.rice_score:<12.2f}")
+    for rank, row in enumerate(rows, start=1):
+        name, reach, impact, confidence, effort, rice_score = row[:6]
+        line = (f"{rank:<6} {name:<30} {reach:<10.0f} {impact:<10.2f} "
+                f"{confidence:<12.0f}% {effort:<10.2f} {rice_score:<12.2f}")
+        for column, value in zip(extra_columns, row[6:]):
+            line += " " + EXTRA_COLUMNS[column][1](value)
+        print(line)
+        if export is not None:
+            try:
+                export[1].writerow(_export_row(rank, row, extra_columns))
+            except Exception as e:
+                export[0].close()
+                export, export_error = None, e
 
     print("\n" + "=" * 100)
     print("INTERPRETATION:")
@@ -227,26 +947,539 @@ def display_results(features: List[Feature]):
     print("  - Consider strategic alignment and dependencies alongside scores")
     print("=" * 100 + "\n")
 
+    if export is not None:
+        try:
+            export[0].close()
+        except Exception as e:
+            export_error = e
+    if export_error is not None:
+        print(f"Error exporting results: {export_error}")
+    elif output_file:
+        print(f"\n✓ Results exported to: {output_file}")
 
-def export_results(features: List[Feature], output_file: str):
-    """Export results to CSV file."""
-    sorted_features = sorted(features, key=lambda f: f.rice_score, reverse=True)
+
+def export_results(rows: Iterable[RankedRow], output_file: str, extra_columns: Tuple[str, ...] = ()):
+    """Export ranked rows to CSV file."""
+    try:
+        f, writer = _open_export(output_file, extra_columns)
+        with f:
+            for rank, row in enumerate(rows, start=1):
+                writer.writerow(_export_row(rank, row, extra_columns))
+
+        print(f"\n✓ Results exported to: {output_file}")
+    except Exception as e:
+        print(f"Error exporting results: {e}")
+
+
+def parse_spreads(values: Optional[List[str]]) -> Dict[str, float]:
+    """
+    Parse --spread FIELD=FRACTION arguments over the default spreads.
+
+    Raises:
+        ValueError: If a field is unknown or a fraction is not in [0, 1)
+    """
+    spreads = dict(DEFAULT_SPREADS)
+    for value in values or []:
+        field, _, fraction = value.partition('=')
+        if field not in DEFAULT_SPREADS:
+            raise ValueError(f"unknown field '{field}' (use {', '.join(DEFAULT_SPREADS)})")
+        spreads[field] = float(fraction)
+        if not 0 <= spreads[field] < 1:
+            raise ValueError(f"spread for {field} must be at least 0 and below 1")
+    return spreads
+
+
+def _multipliers_numpy(rng, distribution: str, spread: float, size: Tuple[int, int]):
+    """Draw multiplicative noise centred on 1 (see sensitivity_analysis)."""
+    if spread == 0:
+        return np.ones(size)
+    if distribution == 'uniform':
+        return rng.uniform(1 - spread, 1 + spread, size)
+    if distribution == 'triangular':
+        return rng.triangular(1 - spread, 1, 1 + spread, size)
+    return np.maximum(rng.normal(1, spread, size), MIN_MULTIPLIER)
+
+
+def _multiplier_python(rng, distribution: str, spread: float) -> float:
+    if spread == 0:
+        return 1.0
+    if distribution == 'uniform':
+        return rng.uniform(1 - spread, 1 + spread)
+    if distribution == 'triangular':
+        return rng.triangular(1 - spread, 1 + spread, 1)
+    return max(rng.gauss(1, spread), MIN_MULTIPLIER)
+
+
+def _simulate_ranks_numpy(features: FeatureTable, trials: int, top_n: int, spreads: Dict[str, float],
+                          distribution: str, seed, width: int, bins: int):
+    """
+    Simulate the trials.
+
+    Returns:
+        Tuple of per-feature top-N hit counts, sums of 0-based ranks, and
+        for each RANK_INTERVAL percentile the rank bin (of width ranks)
+        where it falls
+    """
+    n = len(features)
+    reach, impact, confidence, effort = (np.frombuffer(column, dtype=np.float64) for column in
+                                         (features.reach, features.impact, features.confidence, features.effort))
+    rng = np.random.default_rng(seed)
+    hits = np.zeros(n, dtype=np.int64)
+    rank_sums = np.zeros(n, dtype=np.float64)
+    histogram = np.zeros(n * bins, dtype=np.int64)
+    bin_base = np.arange(n) * bins
+
+    batch = max(1, SENSITIVITY_BATCH_CELLS // n)
+    for start in range(0, trials, batch):
+        size = (min(batch, trials - start), n)
+        r = reach * _multipliers_numpy(rng, distribution, spreads['reach'], size)
+        c = np.minimum(confidence * _multipliers_numpy(rng, distribution, spreads['confidence'], size), 100)
+        e = effort * _multipliers_numpy(rng, distribution, spreads['effort'], size)
+        with np.errstate(all='ignore'):
+            scores = (r * impact * (c / 100)) / e
+
+        # Same ranking rules as rank_key: score descending, ties in input order, NaN last.
+        # A stable sort is several times slower, so ties are put back in input order
+        # by a second sort on (tie group, index), which is already nearly sorted.
+        order = np.argsort(-scores, axis=1)
+        ordered = np.take_along_axis(scores, order, axis=1)
+        tied = (ordered[:, 1:] == ordered[:, :-1]) | (np.isnan(ordered[:, 1:]) & np.isnan(ordered[:, :-1]))
+        if tied.any():
+            groups = np.zeros(size, dtype=np.int64)
+            np.cumsum(~tied, axis=1, out=groups[:, 1:])
+            order = np.take_along_axis(order, np.argsort(groups * n + order, axis=1, kind='stable'), axis=1)
+        ranks = np.empty(size, dtype=np.int64)
+        np.put_along_axis(ranks, order, np.broadcast_to(np.arange(n), size), axis=1)
+
+        hits += (ranks < top_n).sum(axis=0)
+        rank_sums += ranks.sum(axis=0)
+        histogram += np.bincount((bin_base + ranks // width).ravel(), minlength=n * bins)
+
+    # Per feature, the first rank bin reaching each RANK_INTERVAL percentile
+    cumulative = histogram.reshape(n, bins).cumsum(axis=1)
+    interval_bins = [np.argmax(cumulative >= q / 100 * trials, axis=1).tolist() for q in RANK_INTERVAL]
+    return hits.tolist(), rank_sums.tolist(), interval_bins
+
+
+def _simulate_ranks_python(features: FeatureTable, trials: int, top_n: int, spreads: Dict[str, float],
+                           distribution: str, seed, width: int, bins: int):
+    """Pure-Python equivalent of _simulate_ranks_numpy (same statistics, different random stream)."""
+    import random
+
+    n = len(features)
+    rng = random.Random(seed)
+    hits = [0] * n
+    rank_sums = [0.0] * n
+    histogram = [0] * (n * bins)
+
+    for _ in range(trials):
+        entries = []
+        for i in range(n):
+            r = features.reach[i] * _multiplier_python(rng, distribution, spreads['reach'])
+            c = min(features.confidence[i] * _multiplier_python(rng, distribution, spreads['confidence']), 100)
+            e = features.effort[i] * _multiplier_python(rng, distribution, spreads['effort'])
+            entries.append((i, (None, None, None, None, None, (r * features.impact[i] * (c / 100)) / e)))
+        for rank, (i, _) in enumerate(_select(entries)):
+            if rank < top_n:
+                hits[i] += 1
+            rank_sums[i] += rank
+            histogram[i * bins + rank // width] += 1
+
+    interval_bins = [[], []]
+    for i in range(n):
+        cumulative = 0
+        bounds = iter(enumerate(RANK_INTERVAL))
+        k, q = next(bounds)
+        for b in range(bins):
+            cumulative += histogram[i * bins + b]
+            while q is not None and cumulative >= q / 100 * trials:
+                interval_bins[k].append(b)
+                k, q = next(bounds, (None, None))
+            if q is None:
+                break
+    return hits, rank_sums, interval_bins
+
+
+def sensitivity_analysis(features: FeatureTable, trials: int = DEFAULT_TRIALS,
+                         top_n: int = DEFAULT_SENSITIVITY_TOP, spreads: Optional[Dict[str, float]] = None,
+                         distribution: str = 'uniform', seed: Optional[int] = None) -> Dict:
+    """
+    Monte Carlo rank stability of RICE scores.
+
+    Each trial multiplies every feature's reach, confidence and effort by
+    independent noise centred on 1: uniform on [1 - s, 1 + s], triangular
+    on the same range with its mode at 1, or normal with standard
+    deviation s (floored at MIN_MULTIPLIER), where s is the field's spread.
+    Confidence is capped at 100. Trials are computed as trials x features
+    NumPy arrays in batches; without NumPy a Python loop gives the same
+    statistics more slowly.
+
+    Args:
+        features: Features to analyse
+        trials: Number of trials
+        top_n: Size of the top group whose membership probability is reported
+        spreads: Relative spread per field (DEFAULT_SPREADS if None)
+        distribution: 'uniform', 'triangular' or 'normal'
+        seed: RNG seed for reproducible results (per backend)
+
+    Returns:
+        Dict with trials, top_n, distribution, spreads, backend and
+        features: one dict per feature in baseline rank order with name,
+        rice_score, rank, top_probability, rank_low and rank_high (the
+        RANK_INTERVAL percentiles of its simulated rank, exact for up to
+        RANK_BINS features and rounded outward to bins of ranks above
+        that) and mean_rank
+    """
+    spreads = spreads or dict(DEFAULT_SPREADS)
+    n = len(features)
+    width = -(-n // RANK_BINS)
+    bins = -(-n // width)
+
+    simulate = _simulate_ranks_numpy if _load_numpy() is not None else _simulate_ranks_python
+    hits, rank_sums, (low_bins, high_bins) = simulate(features, trials, top_n, spreads, distribution, seed,
+                                                      width, bins)
+
+    results = []
+    baseline = _select((i, features.row(i)) for i in range(n))
+    for rank, (i, row) in enumerate(baseline, start=1):
+        results.append({
+            'name': row[0],
+            'rice_score': row[5],
+            'rank': rank,
+            'top_probability': hits[i] / trials,
+            'rank_low': low_bins[i] * width + 1,
+            'rank_high': min(n, (high_bins[i] + 1) * width),
+            'mean_rank': rank_sums[i] / trials + 1,
+        })
+
+    return {
+        'trials': trials,
+        'top_n': top_n,
+        'distribution': distribution,
+        'spreads': spreads,
+        'backend': 'numpy' if np is not None else 'python',
+        'features': results,
+    }
+
+
+def display_sensitivity(result: Dict, output_file: Optional[str] = None):
+    """Display a sensitivity analysis and optionally export it to CSV."""
+    top_n = result['top_n']
+    interval = f"P{RANK_INTERVAL[0]}-P{RANK_INTERVAL[1]} rank"
+    spreads = ", ".join(f"{field} {spread:.0%}" for field, spread in result['spreads'].items())
+
+    print("\n" + "=" * 100)
+    print(f"RANK SENSITIVITY ({result['trials']} trials, {result['distribution']} noise: {spreads})")
+    print("=" * 100)
+    print(f"\n{'Rank':<6} {'Feature':<30} {'RICE Score':<12} {f'P(top {top_n})':<12} {interval:<16} {'Mean rank':<10}")
+    print("-" * 100)
+
+    for feature in result['features']:
+        rank_range = f"{feature['rank_low']}-{feature['rank_high']}"
+        print(f"{feature['rank']:<6} {feature['name']:<30} {feature['rice_score']:<12.2f} "
+              f"{feature['top_probability']:<12.1%} {rank_range:<16} {feature['mean_rank']:<10.1f}")
+
+    print("\n" + "=" * 100)
+    print("INTERPRETATION:")
+    print(f"  - P(top {top_n}) is the share of trials in which the feature ranked in the top {top_n}")
+    print("  - A wide rank interval means the ranking depends on uncertain estimates")
+    print(f"  - Features ranked in the top {top_n} with a low P(top {top_n}) are fragile; firm up their estimates")
+    print("=" * 100 + "\n")
+
+    if not output_file:
+        return
+    import csv
 
     try:
         with open(output_file, 'w', newline='') as f:
-            fieldnames = ['rank', 'name', 'reach', 'impact', 'confidence', 'effort', 'rice_score']
+            fieldnames = ['rank', 'name', 'rice_score', 'top_probability', 'rank_low', 'rank_high', 'mean_rank']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
+            for feature in result['features']:
+                writer.writerow({
+                    'rank': feature['rank'],
+                    'name': feature['name'],
+                    'rice_score': round(feature['rice_score'], 2),
+                    'top_probability': round(feature['top_probability'], 4),
+                    'rank_low': feature['rank_low'],
+                    'rank_high': feature['rank_high'],
+                    'mean_rank': round(feature['mean_rank'], 2),
+                })
+
+        print(f"\n✓ Results exported to: {output_file}")
+    except Exception as e:
+        print(f"Error exporting results: {e}")
+
+
+def _portfolio_value(rice_score: float) -> float:
+    """A feature's contribution to a portfolio (undefined and zero scores add nothing)."""
+    return rice_score if rice_score > 0 else 0.0
+
+
+def _effort_scale(efforts: List[float]) -> Optional[int]:
+    """Return the smallest power of ten making every effort a whole number (up to 1000), or None."""
+    for scale in (1, 10, 100, 1000):
+        if all(abs(e * scale - round(e * scale)) <= 1e-9 * max(1.0, e * scale) for e in efforts):
+            return scale
+    return None
 
-            for rank, feature in enumerate(sorted_features, start=1):
+
+def _knapsack_dp(values: List[float], weights: List[int], capacity: int) -> List[int]:
+    """Exact 0/1 knapsack over whole-number weights; returns the chosen positions."""
+    n = len(values)
+    if np is not None:
+        best = np.zeros(capacity + 1)
+        take = np.zeros((n, capacity + 1), dtype=bool)
+        for i, (value, weight) in enumerate(zip(values, weights)):
+            candidate = best[:capacity + 1 - weight] + value
+            better = candidate > best[weight:]
+            take[i, weight:] = better
+            best[weight:] = np.where(better, candidate, best[weight:])
+    else:
+        best = [0.0] * (capacity + 1)
+        take = []
+        for value, weight in zip(values, weights):
+            row = [False] * (capacity + 1)
+            for c in range(capacity, weight - 1, -1):
+                candidate = best[c - weight] + value
+                if candidate > best[c]:
+                    best[c] = candidate
+                    row[c] = True
+            take.append(row)
+
+    chosen = []
+    room = capacity
+    for i in range(n - 1, -1, -1):
+        if take[i][room]:
+            chosen.append(i)
+            room -= weights[i]
+    return chosen
+
+
+def _by_density(values: List[float], weights: List[float]) -> List[int]:
+    """Positions ordered by value per unit of effort, best first (ties in input order)."""
+    return sorted(range(len(values)), key=lambda i: -values[i] / weights[i])
+
+
+def _fractional_bound(values: List[float], weights: List[float], order: List[int], capacity: float) -> float:
+    """Upper bound on the knapsack value: greedy by density with a fraction of the first item that does not fit."""
+    bound = 0.0
+    for i in order:
+        if weights[i] <= capacity:
+            bound += values[i]
+            capacity -= weights[i]
+        else:
+            return bound + values[i] * capacity / weights[i]
+    return bound
+
+
+def _knapsack_greedy(values: List[float], weights: List[float], order: List[int], capacity: float) -> List[int]:
+    """
+    Greedy fill by density, or the best single feature if that is worth more.
+
+    The result is at least half the optimum; its actual gap is measured
+    against _fractional_bound.
+    """
+    chosen = []
+    room = capacity + EFFORT_TOLERANCE
+    for i in order:
+        if weights[i] <= room:
+            chosen.append(i)
+            room -= weights[i]
+    fits = [i for i in range(len(values)) if weights[i] <= capacity + EFFORT_TOLERANCE]
+    if fits:
+        single = max(fits, key=lambda i: values[i])
+        if values[single] > sum(values[i] for i in chosen):
+            return [single]
+    return chosen
+
+
+def _knapsack_branch_and_bound(values: List[float], weights: List[float], order: List[int], capacity: float,
+                               initial: List[int], max_nodes: int) -> Optional[List[int]]:
+    """
+    Exact 0/1 knapsack by depth-first branch and bound.
+
+    Items are branched in density order and each node is bounded by its
+    fractional fill (found by bisection on prefix sums). Returns None if
+    more than max_nodes nodes are needed.
+    """
+    v = [values[i] for i in order]
+    w = [weights[i] for i in order]
+    prefix_v = [0.0]
+    prefix_w = [0.0]
+    for value, weight in zip(v, w):
+        prefix_v.append(prefix_v[-1] + value)
+        prefix_w.append(prefix_w[-1] + weight)
+    n = len(v)
+
+    best_value = sum(values[i] for i in initial)
+    best = None
+    stack = [(0, 0.0, capacity + EFFORT_TOLERANCE, ())]
+    nodes = 0
+    while stack:
+        k, value, room, chosen = stack.pop()
+        nodes += 1
+        if nodes > max_nodes:
+            return None
+        if value > best_value:
+            best_value, best = value, chosen
+        if k == n:
+            continue
+
+        # Items k..j-1 fit whole; item j (if any) fits in part
+        j = bisect.bisect_right(prefix_w, prefix_w[k] + room, k) - 1
+        bound = value + prefix_v[j] - prefix_v[k]
+        if j < n:
+            bound += v[j] * (room - (prefix_w[j] - prefix_w[k])) / w[j]
+        if bound <= best_value * (1 + 1e-12):
+            continue
+
+        stack.append((k + 1, value, room, chosen))
+        if w[k] <= room:
+            stack.append((k + 1, value + v[k], room - w[k], chosen + (k,)))
+
+    return initial if best is None else [order[k] for k in best]
+
+
+def optimize_portfolio(features: FeatureTable, budget: float, required: Iterable[str] = (),
+                       excluded: Iterable[str] = ()) -> Dict:
+    """
+    Pick the features with the highest total RICE score within an effort budget.
+
+    Required features are always taken and excluded ones never are; a
+    name selects every row with that name. The rest is a 0/1 knapsack
+    solved by the first method that applies:
+        - 'dynamic programming' (exact) when efforts have at most three
+          decimals and (features x budget steps) stays under DP_MAX_CELLS
+        - 'branch and bound' (exact) within BNB_MAX_NODES nodes
+        - 'greedy' (by score per person-month) otherwise, with its
+          distance from the optimum bounded by the fractional relaxation
+
+    Returns:
+        Dict with selected (feature indexes in rank order), total_score,
+        total_effort, budget, method, upper_bound (no selection can score
+        more), gap (1 - total_score / upper_bound), required and
+        ranked_total (what taking features in RICE order would score);
+        rank maps each feature index to its 0-based RICE rank
+
+    Raises:
+        ValueError: If a name is unknown or the required features exceed the budget
+    """
+    required = set(required)
+    excluded = set(excluded)
+    unknown = sorted((required | excluded) - set(features.name))
+    if unknown:
+        raise ValueError(f"Unknown feature(s): {', '.join(unknown)}")
+    both = sorted(required & excluded)
+    if both:
+        raise ValueError(f"Feature(s) both required and excluded: {', '.join(both)}")
+
+    n = len(features)
+    forced = [i for i in range(n) if features.name[i] in required]
+    forced_effort = sum(features.effort[i] for i in forced)
+    if forced_effort > budget + EFFORT_TOLERANCE:
+        raise ValueError(f"Required features need {forced_effort:g} person-months, over the budget of {budget:g}")
+    capacity = budget - forced_effort
+
+    candidates = [i for i in range(n)
+                  if features.name[i] not in required and features.name[i] not in excluded
+                  and _portfolio_value(features.rice_score[i]) > 0
+                  and features.effort[i] <= capacity + EFFORT_TOLERANCE]
+    values = [features.rice_score[i] for i in candidates]
+    weights = [features.effort[i] for i in candidates]
+    order = _by_density(values, weights)
+    upper_bound = _fractional_bound(values, weights, order, capacity)
+
+    chosen = None
+    scale = _effort_scale(weights)
+    dp_cells = DP_MAX_CELLS if _load_numpy() is not None else DP_MAX_CELLS_PYTHON
+    if scale is not None and len(candidates) * (capacity * scale + 1) <= dp_cells:
+        method = 'dynamic programming'
+        chosen = _knapsack_dp(values, [round(w * scale) for w in weights],
+                              int(capacity * scale + EFFORT_TOLERANCE * scale))
+    else:
+        greedy = _knapsack_greedy(values, weights, order, capacity)
+        chosen = _knapsack_branch_and_bound(values, weights, order, capacity, greedy, BNB_MAX_NODES)
+        method = 'branch and bound'
+        if chosen is None:
+            chosen, method = greedy, 'greedy'
+
+    optimum = sum(values[i] for i in chosen)
+    if method != 'greedy':
+        upper_bound = optimum
+    selected = forced + [candidates[i] for i in chosen]
+    rank = {i: r for r, (i, _) in enumerate(_select((i, features.row(i)) for i in range(n)))}
+    selected.sort(key=rank.__getitem__)
+
+    ranked_total = 0.0
+    room = capacity + EFFORT_TOLERANCE
+    for i in sorted(candidates, key=rank.__getitem__):
+        if features.effort[i] <= room:
+            ranked_total += features.rice_score[i]
+            room -= features.effort[i]
+
+    forced_value = sum(_portfolio_value(features.rice_score[i]) for i in forced)
+    return {
+        'selected': selected,
+        'required': forced,
+        'total_score': forced_value + optimum,
+        'total_effort': sum(features.effort[i] for i in selected),
+        'budget': budget,
+        'method': method,
+        'upper_bound': forced_value + upper_bound,
+        'gap': 1 - optimum / upper_bound if upper_bound > 0 else 0.0,
+        'ranked_total': forced_value + ranked_total,
+        'rank': rank,
+    }
+
+
+def display_portfolio(features: FeatureTable, result: Dict, output_file: Optional[str] = None):
+    """Display an optimized portfolio and optionally export it to CSV."""
+    required = set(result['required'])
+
+    print("\n" + "=" * 100)
+    print(f"PORTFOLIO FOR {result['budget']:g} PERSON-MONTHS (maximum total RICE score)")
+    print("=" * 100)
+    print(f"\n{'Rank':<6} {'Feature':<30} {'Effort':<10} {'RICE Score':<12} {'Score/Effort':<14}")
+    print("-" * 100)
+
+    for i in result['selected']:
+        note = "  (required)" if i in required else ""
+        density = _portfolio_value(features.rice_score[i]) / features.effort[i]
+        print(f"{result['rank'][i] + 1:<6} {features.name[i]:<30} {features.effort[i]:<10.2f} "
+              f"{features.rice_score[i]:<12.2f} {density:<14.2f}{note}")
+
+    if result['method'] == 'greedy':
+        quality = f"within {result['gap']:.2%} of optimal (upper bound {result['upper_bound']:.2f})"
+    else:
+        quality = "optimal"
+    print("\n" + "=" * 100)
+    print(f"Selected {len(result['selected'])} features: effort {result['total_effort']:g} of "
+          f"{result['budget']:g}, total RICE score {result['total_score']:.2f}")
+    print(f"Solution: {quality} ({result['method']})")
+    print(f"Taking features in RICE order until the budget runs out would score {result['ranked_total']:.2f}")
+    print("=" * 100 + "\n")
+
+    if not output_file:
+        return
+    import csv
+
+    try:
+        with open(output_file, 'w', newline='') as f:
+            fieldnames = ['rank', 'name', 'reach', 'impact', 'confidence', 'effort', 'rice_score', 'required']
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            for i in result['selected']:
+                name, reach, impact, confidence, effort, rice_score = features.row(i)
                 writer.writerow({
-                    'rank': rank,
-                    'name': feature.name,
-                    'reach': feature.reach,
-                    'impact': feature.impact,
-                    'confidence': feature.confidence,
-                    'effort': feature.effort,
-                    'rice_score': round(feature.rice_score, 2)
+                    'rank': result['rank'][i] + 1,
+                    'name': name,
+                    'reach': reach,
+                    'impact': impact,
+                    'confidence': confidence,
+                    'effort': effort,
+                    'rice_score': round(rice_score, 2),
+                    'required': i in required,
                 })
 
         print(f"\n✓ Results exported to: {output_file}")
@@ -263,6 +1496,12 @@ Examples:
   python prioritize.py                      # Interactive mode
   python prioritize.py --batch features.csv # Batch mode
   python prioritize.py -b features.csv -o results.csv  # Batch with export
+  python prioritize.py -b features.csv --top 50        # Only the 50 highest scores
+  python prioritize.py -b lines/ -o all.csv            # Every CSV in a directory, ranked globally
+  python prioritize.py -b 'lines/*.csv' --workers 4    # Glob, scored in 4 processes
+  python prioritize.py -b backlog.csv --store rice.db  # Track rank movement between runs
+  python prioritize.py -b features.csv --sensitivity --trials 5000 --top 10 --spread effort=0.5
+  python prioritize.py -b features.csv --budget 12 --require SSO --exclude "Dark mode"
 
 CSV Format (for batch mode):
   name,reach,impact,confidence,effort
@@ -281,7 +1520,8 @@ Impact Values:
     parser.add_argument(
         '-b', '--batch',
         metavar='FILE',
-        help='Load features from CSV file (batch mode)'
+        nargs='+',
+        help='Load features from CSV file (batch mode); several files, directories or globs are ranked globally'
     )
 
     parser.add_argument(
@@ -290,24 +1530,175 @@ Impact Values:
         help='Export results to CSV file'
     )
 
+    parser.add_argument(
+        '-t', '--top',
+        metavar='K',
+        type=int,
+        help='Only display and export the K highest-scoring features'
+    )
+
+    parser.add_argument(
+        '-w', '--workers',
+        metavar='N',
+        type=int,
+        help='Processes for multi-file batches (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '-s', '--store',
+        metavar='DB',
+        help='SQLite file recording each run, adds rank movement since the last run (single batch file)'
+    )
+
+    parser.add_argument(
+        '--sensitivity',
+        action='store_true',
+        help='Estimate rank stability by perturbing reach, confidence and effort (--top sets the group size)'
+    )
+
+    parser.add_argument(
+        '--trials',
+        metavar='N',
+        type=int,
+        default=DEFAULT_TRIALS,
+        help=f'Sensitivity trials (default: {DEFAULT_TRIALS})'
+    )
+
+    parser.add_argument(
+        '--spread',
+        metavar='FIELD=FRACTION',
+        action='append',
+        help='Relative spread of reach, confidence or effort, e.g. effort=0.5 (default: '
+             + ', '.join(f'{field}={spread}' for field, spread in DEFAULT_SPREADS.items()) + ')'
+    )
+
+    parser.add_argument(
+        '--distribution',
+        choices=DISTRIBUTIONS,
+        default='uniform',
+        help='Noise distribution for --sensitivity (default: uniform)'
+    )
+
+    parser.add_argument(
+        '--seed',
+        metavar='S',
+        type=int,
+        help='Random seed for reproducible sensitivity results'
+    )
+
+    parser.add_argument(
+        '--budget',
+        metavar='PM',
+        type=float,
+        help='Pick the features with the highest total RICE score within this many person-months'
+    )
+
+    parser.add_argument(
+        '--require',
+        metavar='NAME',
+        action='append',
+        default=[],
+        help='Feature the --budget portfolio must include (repeatable)'
+    )
+
+    parser.add_argument(
+        '--exclude',
+        metavar='NAME',
+        action='append',
+        default=[],
+        help='Feature the --budget portfolio must leave out (repeatable)'
+    )
+
     args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.store and not args.batch:
+        parser.error("--store needs --batch")
+
+    if (args.require or args.exclude) and args.budget is None:
+        parser.error("--require and --exclude need --budget")
+
+    if args.budget is not None:
+        if args.store or args.sensitivity:
+            parser.error("--budget cannot be combined with --store or --sensitivity")
+        if not args.budget > 0:
+            parser.error("--budget must be positive")
+
+        output_file = args.output
+        if args.batch:
+            files = find_feature_files(args.batch)
+            if len(files) != 1:
+                parser.error("--budget takes a single batch file")
+            features = batch_mode(files[0])
+            output_file = output_file or default_export_path(files[0], PORTFOLIO_SUFFIX)
+        else:
+            features = FeatureTable.from_features(interactive_mode())
 
-    # Determine mode and collect features
+        try:
+            result = optimize_portfolio(features, args.budget, args.require, args.exclude)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        display_portfolio(features, result, output_file)
+        return
+
+    if args.sensitivity:
+        if args.store:
+            parser.error("--sensitivity cannot be combined with --store")
+        if args.trials < 1:
+            parser.error("--trials must be at least 1")
+        try:
+            spreads = parse_spreads(args.spread)
+        except ValueError as e:
+            parser.error(f"--spread: {e}")
+
+        output_file = args.output
+        if args.batch:
+            files = find_feature_files(args.batch)
+            if len(files) != 1:
+                parser.error("--sensitivity takes a single batch file")
+            features = batch_mode(files[0])
+            output_file = output_file or default_export_path(files[0], SENSITIVITY_SUFFIX)
+        else:
+            features = FeatureTable.from_features(interactive_mode())
+
+        result = sensitivity_analysis(features, args.trials, args.top or DEFAULT_SENSITIVITY_TOP,
+                                      spreads, args.distribution, args.seed)
+        display_sensitivity(result, output_file)
+        return
+
+    # Determine mode and rank features (once, for both display and export)
+    extra_columns = ()
+    output_file = args.output
     if args.batch:
-        features = batch_mode(args.batch)
+        files = find_feature_files(args.batch)
+        if not files:
+            print("Error: No CSV files found")
+            sys.exit(1)
+        if args.store and len(files) > 1:
+            parser.error("--store takes a single batch file")
+        if args.store:
+            rows, summary = update_store(args.store, files[0], batch_mode(files[0]))
+            rows = rows[:args.top]
+            print_store_summary(args.store, summary)
+            extra_columns = ('rank_change',)
+            default_output = default_export_path(files[0], RESULTS_SUFFIX)
+        elif len(files) == 1:
+            rows = rank_batch(files[0], args.top)
+            default_output = default_export_path(files[0], RESULTS_SUFFIX)
+        else:
+            rows = rank_sources(files, args.top, args.workers)
+            extra_columns = ('source', 'source_rank')
+            default_output = MULTI_FILE_OUTPUT
+        # Auto-export in batch mode
+        output_file = output_file or default_output
     else:
-        features = interactive_mode()
+        rows = ranked_rows(interactive_mode(), args.top)
 
     # Display results
-    display_results(features)
-
-    # Export if requested
-    if args.output:
-        export_results(features, args.output)
-    elif args.batch:
-        # Auto-export in batch mode
-        output_file = args.batch.rsplit('.', 1)[0] + '_results.csv'
-        export_results(features, output_file)
+    display_results(rows, output_file, extra_columns)
 
 
 if __name__ == '__main__':
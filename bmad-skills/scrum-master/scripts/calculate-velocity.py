@@ -9,38 +9,420 @@ Outputs:
 - Velocity trend (increasing/decreasing/stable)
 - Recommended capacity for next sprint
 
+With --series (or --json) it also reports the full velocity history
+analytics computed in one pass: rolling means and standard deviations for
+configurable windows, EWMA, least-squares trend slopes and percentiles.
+
+With --forecast it runs a Monte Carlo simulation that resamples historical
+completed points to estimate next-sprint points and, with --backlog N, the
+number of sprints needed to finish N points (P50/P85/P95). Sampling is
+batched with NumPy when installed, seedable with --seed, and can be split
+across a process pool with --workers.
+
+With --rollup it reports velocity, trend and recommended capacity for every
+given sprint-status file (or every sprint-status.yaml found under a
+directory), one row per team plus an aggregate, as JSON or CSV. Files are
+spread across a process pool; a missing or broken file only yields an error
+row for that team.
+
 Usage:
-    python calculate-velocity.py <sprint-status-file>
+    python calculate-velocity.py <sprint-status-file> [--no-cache]
     python calculate-velocity.py .bmad/sprint-status.yaml
+    python calculate-velocity.py .bmad/sprint-status.yaml --series --windows 3,6,13
+    python calculate-velocity.py .bmad/sprint-status.yaml --json --ewma-alpha 0.3
+    python calculate-velocity.py .bmad/sprint-status.yaml --forecast --backlog 240 --seed 7
+    python calculate-velocity.py --rollup <file-or-dir>... [--csv] [--workers N]
+
+Sprint status is read into the shared model in sprint_model.py. Parsed
+sprint status is cached between runs; pass --no-cache to bypass it.
 """
 
+import os
 import sys
-import yaml
+import json
+import math
+import random
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sprint_model import Sprint, SprintStatus, VelocityEntry
+from sprint_status import CURRENT_SPRINT, find_status_files, load_status, yaml_error
+
+# NumPy once _load_numpy() has imported it; None until then or if not installed.
+# Only the forecaster uses it, so other runs skip the import.
+np = None
+_numpy_tried = False
+
+
+def _load_numpy():
+    """Import NumPy on first use; returns None if it is not installed."""
+    global np, _numpy_tried
+    if not _numpy_tried:
+        _numpy_tried = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
 
 
-def load_sprint_status(file_path: str) -> Dict:
-    """Load sprint status from YAML file."""
+def load_sprint_status(file_path: str, use_cache: bool = True) -> SprintStatus:
+    """
+    Load sprint status from YAML file.
+
+    Only velocity_history and the current sprint are materialized;
+    the rest of the file is skipped while streaming. Parsed results are
+    cached between runs unless use_cache is False.
+    """
     try:
-        with open(file_path, 'r') as f:
-            return yaml.safe_load(f)
+        return SprintStatus.from_dict(load_status(file_path, sections=('velocity_history',),
+                                                  sprint=CURRENT_SPRINT, use_cache=use_cache))
     except FileNotFoundError:
         print(f"Error: File not found: {file_path}")
         sys.exit(1)
-    except yaml.YAMLError as e:
+    except yaml_error() as e:
         print(f"Error: Invalid YAML format: {e}")
         sys.exit(1)
 
 
-def calculate_current_sprint_velocity(sprint_data: Dict) -> int:
+# Defaults for the analytics engine
+DEFAULT_WINDOWS = (3,)
+DEFAULT_EWMA_ALPHA = 0.3
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+
+# Defaults for the Monte Carlo forecaster
+DEFAULT_SIMULATIONS = 100_000
+FORECAST_CONFIDENCE = (50, 85, 95)
+MAX_FORECAST_SPRINTS = 1000
+SIMULATION_BATCH = 16_384
+
+
+class _Window:
+    """
+    Running statistics over the last `size` sprints.
+
+    Keeps sum(y) and sum(x*y) for the mean and least-squares slope, and a
+    running mean and sum of squared deviations (Welford's method, undone
+    the same way when a sprint leaves the window) for the standard
+    deviation, which avoids the cancellation in sum(y^2) - n*mean^2. Each
+    push is O(1). Partial windows are used until `size` sprints have been seen.
+    """
+
+    __slots__ = ('size', 'values', 'mean', 'm2', 'sum_y', 'sum_xy')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.values = deque(maxlen=size)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.sum_y = 0
+        self.sum_xy = 0
+
+    def push(self, x: int, y: float):
+        if len(self.values) == self.size:
+            # Full window: the append below evicts the oldest sprint
+            old_x, old_y = self.values[0]
+            old_mean = self.mean
+            self.mean += (y - old_y) / self.size
+            self.m2 += (y - old_y) * (y - self.mean + old_y - old_mean)
+            self.sum_y -= old_y
+            self.sum_xy -= old_x * old_y
+        else:
+            delta = y - self.mean
+            self.mean += delta / (len(self.values) + 1)
+            self.m2 += delta * (y - self.mean)
+        self.values.append((x, y))
+        self.sum_y += y
+        self.sum_xy += x * y
+
+    def stats(self, x: int) -> Tuple[float, float, Optional[float]]:
+        """Return (mean, sample std, slope) for the window ending at index x."""
+        n = len(self.values)
+        mean = self.sum_y / n
+        variance = self.m2 / (n - 1) if n > 1 else 0.0
+        std = math.sqrt(max(variance, 0.0))
+
+        if n < 2:
+            return mean, std, None
+        # x runs over the consecutive indices first..x, so its sums are closed-form
+        first = x - n + 1
+        sum_x = n * (first + x) / 2
+        sum_xx = (x * (x + 1) * (2 * x + 1) - (first - 1) * first * (2 * first - 1)) / 6
+        denominator = n * sum_xx - sum_x * sum_x
+        slope = (n * self.sum_xy - sum_x * self.sum_y) / denominator if denominator else 0.0
+        return mean, std, slope
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def analyze_velocity(velocity_history: List[VelocityEntry], windows: Iterable[int] = DEFAULT_WINDOWS,
+                     ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+                     percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict:
+    """
+    Compute velocity analytics for the full history in a single pass.
+
+    Args:
+        velocity_history: Velocity entries from sprint status
+        windows: Rolling window sizes (in sprints)
+        ewma_alpha: Smoothing factor for the exponentially weighted mean
+        percentiles: Percentiles of completed points to report
+
+    Returns:
+        Dict with per-sprint series (sprints, planned, completed,
+        completion_rates, ewma, rolling_mean/rolling_std/rolling_slope keyed
+        by window) and whole-history summaries (mean, std, trend_slope,
+        percentiles). Rolling series use partial windows for the first
+        sprints; slopes are None until a window holds two sprints.
+    """
+    windows = sorted(set(int(w) for w in windows if int(w) > 0))
+    trackers = [_Window(w) for w in windows]
+    overall = _Window(max(len(velocity_history), 1))
+
+    result = {
+        'sprints': [],
+        'planned': [],
+        'completed': [],
+        'completion_rates': [],
+        'ewma': [],
+        'rolling_mean': {w: [] for w in windows},
+        'rolling_std': {w: [] for w in windows},
+        'rolling_slope': {w: [] for w in windows},
+    }
+
+    ewma = None
+    for i, sprint in enumerate(velocity_history):
+        planned = sprint.planned
+        completed = sprint.completed
+
+        result['sprints'].append(sprint.sprint if sprint.sprint is not None else i + 1)
+        result['planned'].append(planned)
+        result['completed'].append(completed)
+        result['completion_rates'].append(round((completed / planned) * 100, 1) if planned > 0 else 0.0)
+
+        ewma = completed if ewma is None else ewma_alpha * completed + (1 - ewma_alpha) * ewma
+        result['ewma'].append(ewma)
+
+        overall.push(i, completed)
+        for tracker in trackers:
+            tracker.push(i, completed)
+            mean, std, slope = tracker.stats(i)
+            result['rolling_mean'][tracker.size].append(mean)
+            result['rolling_std'][tracker.size].append(std)
+            result['rolling_slope'][tracker.size].append(slope)
+
+    if velocity_history:
+        mean, std, slope = overall.stats(len(velocity_history) - 1)
+    else:
+        mean, std, slope = 0.0, 0.0, None
+    result['mean'] = mean
+    result['std'] = std
+    result['trend_slope'] = slope
+
+    ordered = sorted(result['completed'])
+    result['percentiles'] = {pct: _percentile(ordered, pct) for pct in percentiles}
+    return result
+
+
+def _simulate_chunk(values: List[float], backlog_points: float, simulations: int,
+                    seed) -> Tuple[List[int], Dict[int, int], int]:
+    """
+    Run one chunk of Monte Carlo simulations.
+
+    Returns histograms instead of raw samples so chunks merge cheaply:
+        - draws per entry of sorted(set(values)) for the next-sprint question
+        - {sprints needed: count} for the backlog question
+        - number of simulations that did not finish within MAX_FORECAST_SPRINTS
+    """
+    unique = sorted(set(values))
+    if _load_numpy() is not None:
+        return _simulate_chunk_numpy(values, unique, backlog_points, simulations, seed)
+
+    rng = random.Random(seed)
+    position = {v: i for i, v in enumerate(unique)}
+    next_counts = [0] * len(unique)
+    sprint_counts = {}
+    unfinished = 0
+    count = len(values)
+
+    for _ in range(simulations):
+        next_counts[position[values[int(rng.random() * count)]]] += 1
+        if backlog_points <= 0:
+            continue
+        done = 0
+        for sprint in range(1, MAX_FORECAST_SPRINTS + 1):
+            done += values[int(rng.random() * count)]
+            if done >= backlog_points:
+                sprint_counts[sprint] = sprint_counts.get(sprint, 0) + 1
+                break
+        else:
+            unfinished += 1
+
+    return next_counts, sprint_counts, unfinished
+
+
+def _simulate_chunk_numpy(values: List[float], unique: List[float], backlog_points: float,
+                          simulations: int, seed) -> Tuple[List[int], Dict[int, int], int]:
+    """Vectorized _simulate_chunk: every draw is a batched array operation."""
+    rng = np.random.default_rng(seed)
+    samples = np.asarray(values, dtype=np.float64)
+    slot = np.searchsorted(np.asarray(unique, dtype=np.float64), samples)
+
+    next_counts = np.bincount(slot[rng.integers(0, len(samples), size=simulations)], minlength=len(unique))
+    sprint_hist = np.zeros(MAX_FORECAST_SPRINTS + 1, dtype=np.int64)
+    unfinished = 0
+
+    if backlog_points > 0:
+        mean = samples.mean()
+        # Draw roughly the expected number of sprints per round, then top up
+        block = int(min(64, max(4, math.ceil(backlog_points / mean) + 2))) if mean > 0 else 64
+
+        for offset in range(0, simulations, SIMULATION_BATCH):
+            size = min(SIMULATION_BATCH, simulations - offset)
+            remaining = np.full(size, float(backlog_points))
+            active = np.arange(size)
+            sprints_done = 0
+
+            while active.size and sprints_done < MAX_FORECAST_SPRINTS:
+                width = min(block, MAX_FORECAST_SPRINTS - sprints_done)
+                cumulative = np.cumsum(samples[rng.integers(0, len(samples), size=(active.size, width))], axis=1)
+                reached = cumulative >= remaining[active, None]
+                finished = reached.any(axis=1)
+
+                needed = sprints_done + reached[finished].argmax(axis=1) + 1
+                sprint_hist += np.bincount(needed, minlength=sprint_hist.size)
+
+                remaining[active] -= cumulative[:, -1]
+                active = active[~finished]
+                sprints_done += width
+
+            unfinished += int(active.size)
+
+    sprint_counts = {int(k): int(c) for k, c in enumerate(sprint_hist) if c}
+    return next_counts.tolist(), sprint_counts, unfinished
+
+
+def forecast_capacity(velocity_history: List[VelocityEntry], backlog_points: float = 0,
+                      simulations: int = DEFAULT_SIMULATIONS, seed: Optional[int] = None,
+                      workers: int = 1) -> Dict:
+    """
+    Monte Carlo forecast from historical completed points.
+
+    Each simulated sprint resamples (with replacement) one historical
+    `completed` value.
+
+    Args:
+        velocity_history: Velocity entries from sprint status
+        backlog_points: Points to finish for the sprints-to-complete forecast (0 to skip)
+        simulations: Number of simulations
+        seed: RNG seed for reproducible results (per seed and worker count)
+        workers: Processes to split the simulations across
+
+    Returns:
+        Dict with:
+            - next_sprint: {confidence: points}; P85 means 85% of
+              simulations delivered at least that many points
+            - sprints_to_complete: {confidence: sprints}; P85 means 85% of
+              simulations finished the backlog within that many sprints
+              (None if not reached within MAX_FORECAST_SPRINTS)
+            - simulations, unfinished, backend
+    """
+    values = [sprint.completed or 0 for sprint in velocity_history]
+    if not values or simulations <= 0:
+        return {}
+
+    workers = max(1, min(workers, simulations))
+    sizes = [simulations // workers + (1 if i < simulations % workers else 0) for i in range(workers)]
+    if _load_numpy() is not None:
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+    else:
+        seeds = [None if seed is None else f"{seed}-{i}" for i in range(workers)]
+
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor  # imported only when a pool is used
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, [values] * workers, [backlog_points] * workers, sizes, seeds))
+    else:
+        chunks = [_simulate_chunk(values, backlog_points, sizes[0], seeds[0])]
+
+    unique = sorted(set(values))
+    next_counts = [sum(chunk[0][i] for chunk in chunks) for i in range(len(unique))]
+    sprint_counts = {}
+    for chunk in chunks:
+        for sprints, count in chunk[1].items():
+            sprint_counts[sprints] = sprint_counts.get(sprints, 0) + count
+    unfinished = sum(chunk[2] for chunk in chunks)
+
+    result = {
+        'simulations': simulations,
+        'backend': 'numpy' if np is not None else 'python',
+        'next_sprint': {},
+        'sprints_to_complete': {},
+        'backlog_points': backlog_points,
+        'unfinished': unfinished,
+    }
+
+    for confidence in FORECAST_CONFIDENCE:
+        needed = confidence / 100 * simulations
+
+        # Largest points value that at least `confidence`% of simulations reach
+        at_least = 0
+        for value, count in zip(reversed(unique), reversed(next_counts)):
+            at_least += count
+            if at_least >= needed:
+                result['next_sprint'][confidence] = value
+                break
+
+        if backlog_points > 0:
+            finished = 0
+            result['sprints_to_complete'][confidence] = None
+            for sprints in sorted(sprint_counts):
+                finished += sprint_counts[sprints]
+                if finished >= needed:
+                    result['sprints_to_complete'][confidence] = sprints
+                    break
+
+    return result
+
+
+def format_forecast_section(forecast: Dict) -> List[str]:
+    """Format a Monte Carlo forecast as report lines."""
+    lines = ["FORECAST (Monte Carlo):", "-" * 60]
+    if not forecast:
+        lines.append("Insufficient data for a forecast (need velocity history).")
+        return lines
+
+    lines.append(f"Simulations: {forecast['simulations']:,} ({forecast['backend']})")
+    lines.append("Next sprint points (at least):")
+    for confidence, points in forecast['next_sprint'].items():
+        lines.append(f"  P{confidence}: {points} points")
+
+    if forecast['backlog_points'] > 0:
+        lines.append(f"Sprints to complete {forecast['backlog_points']:g} points (at most):")
+        for confidence, sprints in forecast['sprints_to_complete'].items():
+            text = f"{sprints} sprints" if sprints is not None else f"more than {MAX_FORECAST_SPRINTS} sprints"
+            lines.append(f"  P{confidence}: {text}")
+    return lines
+
+
+def calculate_current_sprint_velocity(sprint_data: Sprint) -> int:
     """Calculate velocity for current sprint."""
-    if not sprint_data or 'metrics' not in sprint_data:
+    if not sprint_data:
         return 0
-    return sprint_data['metrics'].get('completed_points', 0)
+    return sprint_data.completed_points
 
 
-def calculate_three_sprint_average(velocity_history: List[Dict]) -> float:
+def calculate_three_sprint_average(velocity_history: List[VelocityEntry]) -> float:
     """Calculate 3-sprint rolling average velocity."""
     if not velocity_history:
         return 0.0
@@ -51,12 +433,12 @@ def calculate_three_sprint_average(velocity_history: List[Dict]) -> float:
         return 0.0
 
     # Calculate average of completed points
-    total = sum(sprint.get('completed', 0) for sprint in recent_sprints)
+    total = sum(sprint.completed for sprint in recent_sprints)
     average = total / len(recent_sprints)
     return round(average, 1)
 
 
-def calculate_velocity_trend(velocity_history: List[Dict]) -> str:
+def calculate_velocity_trend(velocity_history: List[VelocityEntry]) -> str:
     """
     Determine velocity trend from last 3 sprints.
     Returns: 'increasing', 'decreasing', or 'stable'
@@ -65,7 +447,7 @@ def calculate_velocity_trend(velocity_history: List[Dict]) -> str:
         return 'insufficient_data'
 
     recent = velocity_history[-3:]
-    velocities = [s.get('completed', 0) for s in recent]
+    velocities = [s.completed for s in recent]
 
     # Calculate differences
     diff1 = velocities[1] - velocities[0]
@@ -85,12 +467,12 @@ def calculate_velocity_trend(velocity_history: List[Dict]) -> str:
         return 'variable'
 
 
-def get_completion_rates(velocity_history: List[Dict]) -> List[float]:
+def get_completion_rates(velocity_history: List[VelocityEntry]) -> List[float]:
     """Calculate completion rates for each sprint."""
     rates = []
     for sprint in velocity_history:
-        planned = sprint.get('planned', 0)
-        completed = sprint.get('completed', 0)
+        planned = sprint.planned
+        completed = sprint.completed
         if planned > 0:
             rate = (completed / planned) * 100
             rates.append(round(rate, 1))
@@ -100,7 +482,7 @@ def get_completion_rates(velocity_history: List[Dict]) -> List[float]:
 
 
 def recommend_next_sprint_capacity(
-    velocity_history: List[Dict],
+    velocity_history: List[VelocityEntry],
     three_sprint_avg: float,
     trend: str
 ) -> int:
@@ -111,8 +493,9 @@ def recommend_next_sprint_capacity(
         return 40  # Default conservative capacity
 
     if len(velocity_history) < 3:
-        # Use last sprint velocity
-        return velocity_history[-1].get('completed', 40)
+        # Use last sprint velocity, or the default if it was not recorded
+        last = velocity_history[-1]
+        return last.completed if last.has_completed else 40
 
     # Use 3-sprint average as base
     base_capacity = three_sprint_avg
@@ -131,26 +514,87 @@ def recommend_next_sprint_capacity(
     return round(recommended)
 
 
-def format_velocity_report(data: Dict) -> str:
-    """Format velocity metrics as readable report."""
-    project = data.get('project', 'Unknown Project')
-    current_sprint = data.get('current_sprint', 0)
-    velocity_history = data.get('velocity_history', [])
-    sprints_data = data.get('sprints', [])
-
-    # Find current sprint data
-    current_sprint_data = None
-    for sprint in sprints_data:
-        if sprint.get('number') == current_sprint:
-            current_sprint_data = sprint
-            break
-
-    # Calculate metrics
-    current_velocity = calculate_current_sprint_velocity(current_sprint_data) if current_sprint_data else 0
-    three_sprint_avg = calculate_three_sprint_average(velocity_history)
+def velocity_summary(status: SprintStatus, windows: Iterable[int] = DEFAULT_WINDOWS,
+                     ewma_alpha: float = DEFAULT_EWMA_ALPHA, forecast: Optional[Dict] = None) -> Dict:
+    """
+    Compute the headline velocity metrics plus full-history analytics.
+
+    The 3-sprint average and completion rates come from the single
+    analyze_velocity pass (window 3 is always included). `forecast` holds
+    forecast_capacity keyword arguments, or None to skip the forecast.
+    """
+    current_sprint = status.current_sprint
+    velocity_history = status.velocity_history
+    current_sprint_data = status.current()
+
+    analytics = analyze_velocity(velocity_history, set(windows) | {3}, ewma_alpha)
+    three_sprint_avg = round(analytics['rolling_mean'][3][-1], 1) if velocity_history else 0.0
     trend = calculate_velocity_trend(velocity_history)
-    completion_rates = get_completion_rates(velocity_history)
-    recommended_capacity = recommend_next_sprint_capacity(velocity_history, three_sprint_avg, trend)
+
+    summary = {
+        'project': status.project if status.project is not None else 'Unknown Project',
+        'current_sprint': current_sprint,
+        'current_sprint_data': current_sprint_data,
+        'current_velocity': calculate_current_sprint_velocity(current_sprint_data) if current_sprint_data else 0,
+        'three_sprint_average': three_sprint_avg,
+        'trend': trend,
+        'recommended_capacity': recommend_next_sprint_capacity(velocity_history, three_sprint_avg, trend),
+        'analytics': analytics,
+    }
+
+    if forecast is not None:
+        summary['forecast'] = forecast_capacity(velocity_history, **forecast)
+
+    return summary
+
+
+def format_analytics_section(analytics: Dict, windows: Iterable[int]) -> List[str]:
+    """Format the full-history analytics as report lines."""
+    windows = sorted(set(windows))
+    lines = ["VELOCITY ANALYTICS:", "-" * 60]
+    if not analytics['sprints']:
+        lines.append("No velocity history available.")
+        return lines
+
+    header = f"{'Sprint':<8} {'Done':<7} {'EWMA':<8}"
+    for w in windows:
+        header += f" {f'Mean({w})':<9} {f'Std({w})':<8} {f'Slope({w})':<9}"
+    lines.append(header)
+
+    for i, sprint_num in enumerate(analytics['sprints']):
+        row = f"{str(sprint_num):<8} {analytics['completed'][i]:<7} {analytics['ewma'][i]:<8.1f}"
+        for w in windows:
+            slope = analytics['rolling_slope'][w][i]
+            slope_text = f"{slope:+.2f}" if slope is not None else "-"
+            row += (f" {analytics['rolling_mean'][w][i]:<9.1f} {analytics['rolling_std'][w][i]:<8.1f}"
+                    f" {slope_text:<9}")
+        lines.append(row)
+
+    lines.append("")
+    slope = analytics['trend_slope']
+    lines.append(f"Mean: {analytics['mean']:.1f} points   Std Dev: {analytics['std']:.1f}")
+    lines.append(f"Trend Slope: {slope:+.2f} points/sprint" if slope is not None else "Trend Slope: n/a")
+    lines.append("Percentiles: " + "  ".join(
+        f"P{pct:g}={value:.1f}" for pct, value in analytics['percentiles'].items()))
+    return lines
+
+
+def format_velocity_report(status: SprintStatus, windows: Iterable[int] = DEFAULT_WINDOWS,
+                           ewma_alpha: float = DEFAULT_EWMA_ALPHA, show_series: bool = False,
+                           forecast: Optional[Dict] = None) -> str:
+    """Format velocity metrics as readable report."""
+    summary = velocity_summary(status, windows, ewma_alpha, forecast)
+    project = summary['project']
+    current_sprint = summary['current_sprint']
+    velocity_history = status.velocity_history
+    current_sprint_data = summary['current_sprint_data']
+
+    # Metrics (from the single analytics pass)
+    current_velocity = summary['current_velocity']
+    three_sprint_avg = summary['three_sprint_average']
+    trend = summary['trend']
+    completion_rates = summary['analytics']['completion_rates']
+    recommended_capacity = summary['recommended_capacity']
 
     # Build report
     report = []
@@ -162,11 +606,13 @@ def format_velocity_report(data: Dict) -> str:
     # Current sprint info
     report.append(f"Current Sprint: {current_sprint}")
     if current_sprint_data:
-        report.append(f"Sprint Goal: {current_sprint_data.get('sprint_goal', 'N/A')}")
-        report.append(f"Capacity: {current_sprint_data.get('capacity', 0)} points")
+        sprint_goal = current_sprint_data.sprint_goal
+        capacity = current_sprint_data.capacity if current_sprint_data.capacity is not None else 0
+        report.append(f"Sprint Goal: {sprint_goal if sprint_goal is not None else 'N/A'}")
+        report.append(f"Capacity: {capacity} points")
         report.append(f"Completed: {current_velocity} points")
-        if current_sprint_data.get('capacity', 0) > 0:
-            pct = (current_velocity / current_sprint_data['capacity']) * 100
+        if capacity > 0:
+            pct = (current_velocity / capacity) * 100
             report.append(f"Completion Rate: {pct:.1f}%")
     report.append("")
 
@@ -177,9 +623,9 @@ def format_velocity_report(data: Dict) -> str:
         report.append(f"{'Sprint':<10} {'Planned':<10} {'Completed':<12} {'Rate':<10}")
         report.append("-" * 60)
         for i, sprint in enumerate(velocity_history):
-            sprint_num = sprint.get('sprint', i + 1)
-            planned = sprint.get('planned', 0)
-            completed = sprint.get('completed', 0)
+            sprint_num = sprint.sprint if sprint.sprint is not None else i + 1
+            planned = sprint.planned
+            completed = sprint.completed
             rate = completion_rates[i] if i < len(completion_rates) else 0.0
             report.append(f"{sprint_num:<10} {planned:<10} {completed:<12} {rate:<10.1f}%")
     else:
@@ -193,7 +639,7 @@ def format_velocity_report(data: Dict) -> str:
         report.append(f"3-Sprint Rolling Average: {three_sprint_avg} points")
         report.append(f"Velocity Trend: {trend.upper().replace('_', ' ')}")
     elif len(velocity_history) >= 1:
-        report.append(f"Single Sprint Velocity: {velocity_history[-1].get('completed', 0)} points")
+        report.append(f"Single Sprint Velocity: {velocity_history[-1].completed} points")
         report.append(f"(Need 3 sprints for rolling average)")
     else:
         report.append("Insufficient data for velocity metrics.")
@@ -219,20 +665,236 @@ def format_velocity_report(data: Dict) -> str:
     else:
         report.append("No historical data. Using conservative default capacity.")
 
+    if show_series:
+        report.append("")
+        report.extend(format_analytics_section(summary['analytics'], windows))
+
+    if forecast is not None:
+        report.append("")
+        report.extend(format_forecast_section(summary['forecast']))
+
     report.append("")
     report.append("=" * 60)
 
     return "\n".join(report)
 
 
+def format_velocity_json(status: SprintStatus, windows: Iterable[int] = DEFAULT_WINDOWS,
+                         ewma_alpha: float = DEFAULT_EWMA_ALPHA, forecast: Optional[Dict] = None) -> str:
+    """Format velocity metrics and the full analytics as JSON."""
+    summary = velocity_summary(status, windows, ewma_alpha, forecast)
+    summary.pop('current_sprint_data')
+    return json.dumps(summary, indent=2, default=str)
+
+
+# Rollup table columns, in output order
+ROLLUP_FIELDS = ('path', 'project', 'current_sprint', 'sprints', 'current_velocity',
+                 'three_sprint_average', 'trend', 'recommended_capacity', 'error')
+
+
+def velocity_file(file_path: str, use_cache: bool = True) -> Dict:
+    """
+    Compute the headline velocity metrics for one team's sprint-status file.
+
+    Errors are reported in the result instead of exiting, so one bad file
+    does not stop a rollup.
+    """
+    result = {'path': file_path}
+    try:
+        status = SprintStatus.from_dict(load_status(file_path, sections=('velocity_history',),
+                                                    sprint=CURRENT_SPRINT, use_cache=use_cache))
+        summary = velocity_summary(status)
+    except FileNotFoundError:
+        result['error'] = f"File not found: {file_path}"
+        return result
+    except yaml_error() as e:
+        result['error'] = f"Invalid YAML format: {e}"
+        return result
+    except (OSError, AttributeError, TypeError, ValueError, ZeroDivisionError) as e:
+        result['error'] = f"Could not compute velocity: {e}"
+        return result
+
+    result.update({
+        'project': summary['project'],
+        'current_sprint': summary['current_sprint'],
+        'sprints': len(status.velocity_history),
+        'current_velocity': summary['current_velocity'],
+        'three_sprint_average': summary['three_sprint_average'],
+        'trend': summary['trend'],
+        'recommended_capacity': summary['recommended_capacity'],
+    })
+    return result
+
+
+def rollup_aggregate(results: List[Dict]) -> Dict:
+    """
+    Combine per-team rollup results.
+
+    Velocities and capacities are summed over the teams that loaded; trends
+    are counted per label since teams' sprints need not line up.
+    """
+    teams = [r for r in results if 'error' not in r]
+    trends = {}
+    for team in teams:
+        trends[team['trend']] = trends.get(team['trend'], 0) + 1
+
+    return {
+        'team_count': len(teams),
+        'error_count': len(results) - len(teams),
+        'current_velocity': sum(t['current_velocity'] for t in teams),
+        'three_sprint_average': round(sum(t['three_sprint_average'] for t in teams), 1),
+        'recommended_capacity': sum(t['recommended_capacity'] for t in teams),
+        'trends': trends,
+    }
+
+
+def run_rollup(paths: List[str], output_format: str = 'json', workers: Optional[int] = None,
+               use_cache: bool = True):
+    """
+    Compute velocity for many teams and print one table.
+
+    Args:
+        paths: Sprint-status files and/or directories to search
+        output_format: 'json' for one document, 'csv' for one row per team
+        workers: Process pool size (None uses the CPU count)
+        use_cache: Use the parsed-status cache
+    """
+    files = find_status_files(paths)
+    if not files:
+        print("Error: No sprint-status files found", file=sys.stderr)
+        sys.exit(1)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor  # imported only when a pool is used
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            results = list(pool.map(velocity_file, files, [use_cache] * len(files),
+                                    chunksize=max(1, len(files) // (workers * 4))))
+    else:
+        results = [velocity_file(f, use_cache) for f in files]
+
+    aggregate = rollup_aggregate(results)
+
+    if output_format == 'csv':
+        import csv  # imported only for CSV output
+
+        writer = csv.writer(sys.stdout, lineterminator='\n')
+        writer.writerow(ROLLUP_FIELDS)
+        for result in results:
+            writer.writerow([result.get(field, '') for field in ROLLUP_FIELDS])
+        writer.writerow(['TOTAL', '', '', sum(r.get('sprints', 0) for r in results),
+                         aggregate['current_velocity'], aggregate['three_sprint_average'], '',
+                         aggregate['recommended_capacity'],
+                         f"{aggregate['error_count']} errors" if aggregate['error_count'] else ''])
+    else:
+        print(json.dumps({'teams': results, 'aggregate': aggregate}, indent=2, default=str))
+
+
+def rollup_main(args: List[str]):
+    """Parse rollup-mode arguments and run the rollup."""
+    paths = []
+    output_format = 'json'
+    workers = None
+    use_cache = True
+
+    args = iter(args)
+    for arg in args:
+        if arg == '--csv':
+            output_format = 'csv'
+        elif arg == '--json':
+            output_format = 'json'
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg == '--workers':
+            value = next(args, '')
+            if not value.isdigit() or int(value) < 1:
+                print("Error: --workers needs a positive integer")
+                sys.exit(1)
+            workers = int(value)
+        else:
+            paths.append(arg)
+
+    if not paths:
+        print("Usage: python calculate-velocity.py --rollup <file-or-dir>... [--csv|--json] [--workers N] [--no-cache]")
+        sys.exit(1)
+
+    run_rollup(paths, output_format, workers, use_cache)
+
+
+def print_usage():
+    """Print command line usage."""
+    print("Usage: python calculate-velocity.py <sprint-status-file> [--series|--json] "
+          "[--windows N,N,...] [--ewma-alpha A] [--no-cache]")
+    print("       python calculate-velocity.py <sprint-status-file> --forecast [--backlog POINTS] "
+          "[--simulations N] [--seed S] [--workers N]")
+    print("       python calculate-velocity.py --rollup <file-or-dir>... [--csv|--json] [--workers N] [--no-cache]")
+    print("Example: python calculate-velocity.py .bmad/sprint-status.yaml")
+    print("Example: python calculate-velocity.py .bmad/sprint-status.yaml --series --windows 3,6,13")
+    print("Example: python calculate-velocity.py .bmad/sprint-status.yaml --forecast --backlog 240")
+    print("Example: python calculate-velocity.py --rollup teams/ --csv")
+
+
 def main():
     """Main execution function."""
-    if len(sys.argv) != 2:
-        print("Usage: python calculate-velocity.py <sprint-status-file>")
-        print("Example: python calculate-velocity.py .bmad/sprint-status.yaml")
+    if len(sys.argv) >= 2 and sys.argv[1] == '--rollup':
+        rollup_main(sys.argv[2:])
+        return
+
+    use_cache = True
+    show_series = False
+    output_json = False
+    windows = DEFAULT_WINDOWS
+    ewma_alpha = DEFAULT_EWMA_ALPHA
+    forecast = None
+    forecast_options = {}
+    positional = []
+
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg == '--no-cache':
+            use_cache = False
+        elif arg == '--series':
+            show_series = True
+        elif arg == '--json':
+            output_json = True
+        elif arg == '--windows':
+            try:
+                windows = tuple(int(w) for w in next(args, '').split(',') if w.strip())
+                if not windows or min(windows) < 1:
+                    raise ValueError
+            except ValueError:
+                print("Error: --windows needs positive integers, e.g. 3,6,13")
+                sys.exit(1)
+        elif arg == '--ewma-alpha':
+            try:
+                ewma_alpha = float(next(args, ''))
+                if not 0 < ewma_alpha <= 1:
+                    raise ValueError
+            except ValueError:
+                print("Error: --ewma-alpha needs a number in (0, 1]")
+                sys.exit(1)
+        elif arg == '--forecast':
+            forecast = forecast_options
+        elif arg in ('--backlog', '--simulations', '--seed', '--workers'):
+            value = next(args, '')
+            try:
+                number = float(value) if arg == '--backlog' else int(value)
+                if number < 0 or (arg in ('--simulations', '--workers') and number < 1):
+                    raise ValueError
+            except ValueError:
+                print(f"Error: {arg} needs a non-negative number")
+                sys.exit(1)
+            forecast_options[{'--backlog': 'backlog_points'}.get(arg, arg[2:])] = number
+            forecast = forecast_options
+        else:
+            positional.append(arg)
+
+    if len(positional) != 1:
+        print_usage()
         sys.exit(1)
 
-    file_path = sys.argv[1]
+    file_path = positional[0]
 
     # Validate file exists
     if not Path(file_path).exists():
@@ -240,11 +902,13 @@ def main():
         sys.exit(1)
 
     # Load sprint status data
-    data = load_sprint_status(file_path)
+    status = load_sprint_status(file_path, use_cache)
 
     # Generate and print report
-    report = format_velocity_report(data)
-    print(report)
+    if output_json:
+        print(format_velocity_json(status, windows, ewma_alpha, forecast))
+    else:
+        print(format_velocity_report(status, windows, ewma_alpha, show_series, forecast))
 
 
 if __name__ == '__main__':
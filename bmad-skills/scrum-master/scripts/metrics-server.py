@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Sprint Metrics Server for Scrum Master Scripts
+
+Keeps one Python process with PyYAML, the burndown and velocity scripts and
+recently parsed sprint-status files loaded, so hooks and agents that query
+metrics often do not pay interpreter startup, imports and YAML parsing on
+every call. Parsed files stay in memory and are revalidated against their
+mtime, size and inode on each request.
+
+Usage:
+    python metrics-server.py serve [--socket PATH]
+    python metrics-server.py stop
+    python metrics-server.py burndown <sprint-burndown.py arguments>
+    python metrics-server.py velocity <calculate-velocity.py arguments>
+    python metrics-server.py status <sprint-status-file> [sprint-number] [--no-cache]
+
+The burndown and velocity commands are thin clients: they print exactly
+what the scripts print and exit with the same code. Without a running
+server (and always for --watch) they run the script directly instead.
+The status command prints story counts and points per status for the
+current (or given) sprint as JSON.
+
+The server listens on a Unix socket: $BMAD_METRICS_SOCKET, or
+bmad-metrics-<uid>.sock in $XDG_RUNTIME_DIR (falling back to $TMPDIR or
+/tmp). Requests are handled one at a time. The protocol is one JSON line
+each way, so any tool that can write to a Unix socket can be a client:
+    {"command": "velocity", "args": [".bmad/sprint-status.yaml"], "cwd": "/repo"}
+    {"exit_code": 0, "stdout": "...", "stderr": ""}
+"""
+
+import json
+import os
+import socket
+import sys
+from typing import Callable, Dict, List, Optional
+
+# Only the modules above are imported up front so the client path starts
+# fast; the server and the status command import the rest when they run.
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Client command -> script the server runs in-process
+SCRIPTS = {
+    'burndown': 'sprint-burndown.py',
+    'velocity': 'calculate-velocity.py',
+}
+
+# Arguments that need a local process (output that never ends)
+LOCAL_ONLY_ARGS = ('--watch',)
+
+# Longest request line the server reads
+MAX_REQUEST_BYTES = 1 << 20
+
+# Seconds a client waits to connect before running the script locally
+CONNECT_TIMEOUT = 1.0
+
+
+def socket_path() -> str:
+    """Return the Unix socket path shared by the server and its clients."""
+    if os.environ.get('BMAD_METRICS_SOCKET'):
+        return os.environ['BMAD_METRICS_SOCKET']
+    base = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or '/tmp'
+    uid = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(base, f'bmad-metrics-{uid}.sock')
+
+
+def send_request(request: Dict, path: Optional[str] = None) -> Optional[Dict]:
+    """
+    Send one request to the server.
+
+    Returns:
+        The decoded response, or None if no server answered
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    chunks = []
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(path or socket_path())
+            sock.settimeout(None)
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+
+    try:
+        return json.loads(b''.join(chunks))
+    except ValueError:
+        return None
+
+
+def status_summary(file_path: str, sprint_number: Optional[int] = None, use_cache: bool = True) -> Optional[Dict]:
+    """
+    Summarize one sprint's stories by status.
+
+    Returns:
+        Dict with project, current_sprint, the sprint's fields, per-status
+        story counts and points, and blocked story IDs; None if the sprint
+        is not in the file
+    """
+    from sprint_model import SprintStatus
+    from sprint_status import CURRENT_SPRINT, load_status
+
+    status = SprintStatus.from_dict(load_status(
+        file_path, sections=(), sprint=CURRENT_SPRINT if sprint_number is None else sprint_number,
+        use_cache=use_cache))
+    sprint = status.current() if sprint_number is None else status.sprint(sprint_number)
+    if sprint is None:
+        return None
+
+    stories = {}
+    for story in sprint.stories:
+        totals = stories.setdefault(story.status, {'stories': 0, 'points': 0})
+        totals['stories'] += 1
+        totals['points'] += story.points or 0
+
+    return {
+        'project': status.project,
+        'current_sprint': status.current_sprint,
+        'sprint': {
+            'number': sprint.number,
+            'status': sprint.status,
+            'goal': sprint.sprint_goal,
+            'start_date': sprint.start_date,
+            'end_date': sprint.end_date,
+            'capacity': sprint.capacity
+        },
+        'stories': stories,
+        'blocked': [story.id for story in status.stories_by_status('blocked')]
+    }
+
+
+def status_main(args: List[str]):
+    """Parse status-command arguments and print the summary as JSON."""
+    import yaml
+
+    positional = [arg for arg in args if not arg.startswith('--')]
+    if len(positional) not in (1, 2) or (len(positional) == 2 and not positional[1].isdigit()):
+        print("Usage: python metrics-server.py status <sprint-status-file> [sprint-number] [--no-cache]")
+        sys.exit(1)
+
+    file_path = positional[0]
+    sprint_number = int(positional[1]) if len(positional) == 2 else None
+
+    try:
+        summary = status_summary(file_path, sprint_number, '--no-cache' not in args)
+    except FileNotFoundError:
+        print(f"Error: File not found: {file_path}")
+        sys.exit(1)
+    except yaml.YAMLError as e:
+        print(f"Error: Invalid YAML format: {e}")
+        sys.exit(1)
+
+    if summary is None:
+        print(f"Error: Sprint {sprint_number} not found" if sprint_number else "Error: No current sprint found")
+        sys.exit(1)
+
+    print(json.dumps(summary, indent=2, default=str))
+
+
+def _load_script(filename: str):
+    """Import a hyphenated script from this directory as a module."""
+    import importlib.util
+
+    name = filename[:-len('.py')].replace('-', '_')
+    spec = importlib.util.spec_from_file_location(name, os.path.join(SCRIPT_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    # Registered so process pools inside the script can pickle its functions
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_in_process(main: Callable, argv: List[str], cwd: str) -> Dict:
+    """
+    Run a script's main() as if it were invoked with argv from cwd.
+
+    Returns:
+        Dict with exit_code and the captured stdout and stderr
+    """
+    import contextlib
+    import io
+    import traceback
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    saved_argv = sys.argv
+    saved_cwd = os.getcwd()
+    exit_code = 0
+
+    try:
+        os.chdir(cwd)
+        sys.argv = argv
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                main()
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    exit_code = e.code
+                elif e.code is not None:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    except OSError as e:
+        return {'exit_code': 1, 'stdout': '', 'stderr': f"Error: Cannot use working directory {cwd}: {e}\n"}
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_cwd)
+
+    return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+def handle_request(line: bytes, mains: Dict[str, Callable]) -> Dict:
+    """Decode one request line and run it."""
+    try:
+        request = json.loads(line)
+        command = request['command']
+        args = [str(arg) for arg in request.get('args') or []]
+        cwd = request.get('cwd') or os.getcwd()
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return {'exit_code': 2, 'stdout': '', 'stderr': "Error: Malformed request\n"}
+
+    if command == 'ping':
+        return {'exit_code': 0, 'stdout': "pong\n", 'stderr': ''}
+    if command not in mains:
+        return {'exit_code': 2, 'stdout': '', 'stderr': f"Error: Unknown command: {command}\n"}
+    if any(arg in LOCAL_ONLY_ARGS for arg in args):
+        return {'exit_code': 2, 'stdout': '', 'stderr': "Error: --watch is not served; run the script directly\n"}
+
+    return run_in_process(mains[command], [SCRIPTS.get(command, 'metrics-server.py')] + args, cwd)
+
+
+def serve(path: Optional[str] = None):
+    """Run the metrics server until `stop` or Ctrl-C."""
+    import socketserver
+    import threading
+
+    from sprint_status import enable_memory_cache
+
+    if not hasattr(socket, 'AF_UNIX'):
+        print("Error: Unix sockets are not available on this platform")
+        sys.exit(1)
+
+    path = path or socket_path()
+    if os.path.exists(path):
+        if send_request({'command': 'ping'}, path) is not None:
+            print(f"Error: A metrics server is already listening on {path}")
+            sys.exit(1)
+        os.unlink(path)  # stale socket from a server that did not exit cleanly
+
+    enable_memory_cache()
+    mains = {command: _load_script(filename).main for command, filename in SCRIPTS.items()}
+    mains['status'] = lambda: status_main(sys.argv[1:])
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            try:
+                request = json.loads(line)
+            except ValueError:
+                request = None
+            if isinstance(request, dict) and request.get('command') == 'shutdown':
+                response = {'exit_code': 0, 'stdout': '', 'stderr': ''}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                response = handle_request(line, mains)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+    # Only the owner may connect
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    print(f"Metrics server listening on {path}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def run_client(command: str, args: List[str]) -> int:
+    """
+    Answer a command through the server, or locally if none is running.
+
+    Returns:
+        The exit code to use
+    """
+    if not any(arg in LOCAL_ONLY_ARGS for arg in args):
+        response = send_request({'command': command, 'args': args, 'cwd': os.getcwd()})
+        if response is not None and 'exit_code' in response:
+            sys.stdout.write(response['stdout'])
+            sys.stderr.write(response['stderr'])
+            return response['exit_code']
+
+    if command == 'status':
+        status_main(args)
+        return 0
+
+    script = os.path.join(SCRIPT_DIR, SCRIPTS[command])
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable, script] + args)
+
+
+def print_usage():
+    """Print command line usage."""
+    print("Usage: python metrics-server.py serve [--socket PATH]")
+    print("       python metrics-server.py stop")
+    print("       python metrics-server.py burndown|velocity <script arguments>")
+    print("       python metrics-server.py status <sprint-status-file> [sprint-number] [--no-cache]")
+    print("Example: python metrics-server.py serve &")
+    print("Example: python metrics-server.py velocity .bmad/sprint-status.yaml --json")
+
+
+def main():
+    """Main execution function."""
+    if len(sys.argv) < 2:
+        print_usage()
+        sys.exit(1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+
+    if command == 'serve':
+        path = None
+        if args[:1] == ['--socket'] and len(args) == 2:
+            path = args[1]
+        elif args:
+            print_usage()
+            sys.exit(1)
+        serve(path)
+    elif command == 'stop':
+        if send_request({'command': 'shutdown'}) is None:
+            print("Error: No metrics server is running")
+            sys.exit(1)
+    elif command in SCRIPTS or command == 'status':
+        sys.exit(run_client(command, args))
+    else:
+        print_usage()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,48 +9,108 @@ Usage:
     python sprint-burndown.py <sprint-status-file> [sprint-number]
     python sprint-burndown.py .bmad/sprint-status.yaml
     python sprint-burndown.py .bmad/sprint-status.yaml 2
+    python sprint-burndown.py --batch <file-or-dir>... [--ndjson] [--workers N]
+    python sprint-burndown.py .bmad/sprint-status.yaml --watch [--diff]
+    python sprint-burndown.py .bmad/sprint-status.yaml --from-stories
 
 Output formats:
     - Text table (default)
     - CSV (with --csv flag)
     - JSON (with --json flag)
+    - NDJSON, one object per day (with --ndjson flag)
+
+All formats stream rows from a single row generator and flush as they go.
+
+Series are computed with NumPy when it is installed (optional) and with
+plain Python otherwise; both backends produce identical output. Importing
+NumPy takes longer than a sprint-sized series does in plain Python, so it is
+only imported for batch runs, watch mode and sprints of NUMPY_MIN_DAYS days
+or more.
+
+Batch mode computes every sprint in every given sprint-status file (or
+every sprint-status.yaml found under a directory) and prints one merged JSON
+document, or one JSON line per sprint with --ndjson. Files are spread across
+a process pool (--workers, default: CPU count) and each file is parsed once.
+
+With --from-stories the burndown is derived from the sprint's stories
+(points, completed_date and an optional added_date for mid-sprint scope
+changes) instead of the hand-maintained burndown list. When both exist,
+days where the manual entries disagree are reported on stderr.
+
+Watch mode (--watch) blocks on inotify (Linux) or polls the file's mtime
+every --interval seconds elsewhere. On each change it re-parses the file,
+recomputes only the days at and after the earliest changed burndown entry
+and prints a fresh frame (JSON frames are one line each). With --diff it
+prints just the changed rows as one JSON line per update.
+
+Sprint status is read into the shared model in sprint_model.py. Parsed
+sprint status is cached between runs; pass --no-cache to bypass it.
 """
 
+import io
+import os
+import select
 import sys
-import yaml
+import time
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+
+from sprint_model import BurndownEntry, Sprint, SprintStatus
+from sprint_status import CURRENT_SPRINT, find_status_files, load_status, yaml_error
+
+# NumPy once _load_numpy() has imported it; None until then or if not installed
+np = None
+_numpy_tried = False
+NUMPY_MIN_DAYS = 2048
+
+# Status labels, in the order they are checked
+STATUS_COMPLETE = "COMPLETE"
+STATUS_AHEAD = "AHEAD"
+STATUS_BEHIND = "BEHIND"
+STATUS_ON_TRACK = "ON TRACK"
+
+
+def _load_numpy():
+    """Import NumPy on first use; returns None if it is not installed."""
+    global np, _numpy_tried
+    if not _numpy_tried:
+        _numpy_tried = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
 
+def load_sprint_status(file_path: str, sprint_number: Optional[int] = None, use_cache: bool = True) -> SprintStatus:
+    """
+    Load sprint status from YAML file.
 
-def load_sprint_status(file_path: str) -> Dict:
-    """Load sprint status from YAML file."""
+    Only the requested sprint (or the current sprint) is materialized;
+    the rest of the file is skipped while streaming. Parsed results are
+    cached between runs unless use_cache is False.
+    """
     try:
-        with open(file_path, 'r') as f:
-            return yaml.safe_load(f)
+        return SprintStatus.from_dict(load_status(
+            file_path, sections=(), sprint=CURRENT_SPRINT if sprint_number is None else sprint_number,
+            use_cache=use_cache))
     except FileNotFoundError:
         print(f"Error: File not found: {file_path}")
         sys.exit(1)
-    except yaml.YAMLError as e:
+    except yaml_error() as e:
         print(f"Error: Invalid YAML format: {e}")
         sys.exit(1)
 
 
-def get_sprint_data(data: Dict, sprint_number: Optional[int] = None) -> Optional[Dict]:
+def get_sprint_data(status: SprintStatus, sprint_number: Optional[int] = None) -> Optional[Sprint]:
     """Get data for specified sprint or current sprint."""
-    sprints = data.get('sprints', [])
-    if not sprints:
-        return None
-
     if sprint_number is None:
-        sprint_number = data.get('current_sprint', 0)
-
-    for sprint in sprints:
-        if sprint.get('number') == sprint_number:
-            return sprint
-
-    return None
+        return status.current()
+    return status.sprint(sprint_number)
 
 
 def calculate_ideal_burndown(total_points: int, sprint_days: int) -> List[float]:
@@ -67,9 +127,12 @@ def calculate_ideal_burndown(total_points: int, sprint_days: int) -> List[float]
     if sprint_days <= 0:
         return [total_points]
 
-    ideal_line = []
     points_per_day = total_points / sprint_days
 
+    if np is not None:
+        return round_like_python(total_points - points_per_day * np.arange(sprint_days + 1), 1)
+
+    ideal_line = []
     for day in range(sprint_days + 1):
         remaining = total_points - (points_per_day * day)
         ideal_line.append(round(remaining, 1))
@@ -77,6 +140,48 @@ def calculate_ideal_burndown(total_points: int, sprint_days: int) -> List[float]
     return ideal_line
 
 
+def round_like_python(values, ndigits: int) -> List[float]:
+    """
+    Round a NumPy array exactly like the built-in round().
+
+    np.round scales before rounding, so values sitting on a decimal tie
+    (e.g. 0.35) can round the other way. Those rare near-ties are redone
+    with round() so both backends agree bit for bit.
+    """
+    scale = 10 ** ndigits
+    scaled = values * scale
+    rounded = np.round(values, ndigits)
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded.tolist()
+
+
+def burndown_status(remaining_pts: float, ideal_pts: float) -> str:
+    """Classify one day of the burndown against the ideal line."""
+    if remaining_pts == 0:
+        return STATUS_COMPLETE
+    elif remaining_pts < ideal_pts:
+        return STATUS_AHEAD
+    elif remaining_pts > ideal_pts:
+        return STATUS_BEHIND
+    return STATUS_ON_TRACK
+
+
+def calculate_status(actual: List[float], ideal: List[float]) -> List[str]:
+    """Derive the per-day status column from the actual and ideal series."""
+    if np is not None and actual:
+        remaining = np.asarray(actual, dtype=float)
+        ideal_arr = np.asarray(ideal, dtype=float)
+        return np.select(
+            [remaining == 0, remaining < ideal_arr, remaining > ideal_arr],
+            [STATUS_COMPLETE, STATUS_AHEAD, STATUS_BEHIND],
+            STATUS_ON_TRACK
+        ).tolist()
+
+    return [burndown_status(r, i) for r, i in zip(actual, ideal)]
+
+
 def parse_date(date_str: str) -> Optional[datetime]:
     """Parse date string to datetime object."""
     if not date_str:
@@ -91,212 +196,559 @@ def parse_date(date_str: str) -> Optional[datetime]:
             return None
 
 
-def generate_burndown_data(sprint_data: Dict) -> Dict:
+def parse_entry_date(value) -> Optional[date]:
     """
-    Generate burndown chart data from sprint information.
+    Parse a burndown entry date to a calendar day.
 
-    Returns dict with:
-        - dates: List of dates
-        - actual: List of actual remaining points
-        - ideal: List of ideal remaining points
-        - completed: List of completed points
+    Takes a fast ISO path for the common "YYYY-MM-DD" and
+    "YYYY-MM-DD HH:MM:SS" shapes and falls back to parse_date otherwise.
+    Unquoted YAML dates arrive as date/datetime objects and are used as-is.
+    """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if not value or not isinstance(value, str):
+        return None
+
+    try:
+        if len(value) == 10:
+            return date.fromisoformat(value)
+        if len(value) == 19 and value[10] == ' ':
+            return datetime.fromisoformat(value).date()
+    except ValueError:
+        pass
+
+    parsed = parse_date(value)
+    return parsed.date() if parsed else None
+
+
+def index_burndown_entries(burndown_entries: List[BurndownEntry]) -> Tuple[Dict[date, BurndownEntry], List[str]]:
+    """
+    Parse burndown entries once into a date-keyed index.
+
+    When several entries fall on the same day the last one wins.
+
+    Args:
+        burndown_entries: The sprint's burndown entries
+
+    Returns:
+        Tuple of (entries keyed by day, sorted list of duplicated dates)
     """
+    index = {}
+    duplicates = set()
+
+    for entry in burndown_entries:
+        entry_date = parse_entry_date(entry.date)
+        if entry_date is None:
+            continue
+        if entry_date in index:
+            duplicates.add(entry_date)
+        index[entry_date] = entry
+
+    return index, [d.strftime("%Y-%m-%d") for d in sorted(duplicates)]
+
+
+def get_sprint_dates(sprint_data: Sprint) -> Optional[Tuple[datetime, datetime]]:
+    """Return the parsed (start, end) dates of a sprint, or None if missing."""
     if not sprint_data:
-        return {}
+        return None
 
-    # Get sprint dates
-    start_date_str = sprint_data.get('start_date')
-    end_date_str = sprint_data.get('end_date')
+    start_date_str = sprint_data.start_date
+    end_date_str = sprint_data.end_date
 
     if not start_date_str or not end_date_str:
-        return {}
+        return None
 
     start_date = parse_date(start_date_str)
     end_date = parse_date(end_date_str)
 
     if not start_date or not end_date:
+        return None
+
+    return start_date, end_date
+
+
+def sprint_total_points(sprint_data: Sprint):
+    """Total points of a sprint: its capacity, or metrics.total_points when that is 0."""
+    total_points = sprint_data.capacity or 0
+    if total_points == 0:
+        total_points = sprint_data.total_points
+    return total_points
+
+
+def generate_burndown_data(sprint_data: Sprint) -> Dict:
+    """
+    Generate burndown chart data from sprint information.
+
+    Returns dict with:
+        - dates: List of dates
+        - actual: List of actual remaining points
+        - ideal: List of ideal remaining points
+        - completed: List of completed points
+        - status: List of per-day status labels
+        - duplicate_dates: Dates with more than one burndown entry
+    """
+    sprint_dates = get_sprint_dates(sprint_data)
+    if not sprint_dates:
         return {}
+    start_date, end_date = sprint_dates
 
     # Calculate sprint duration
     sprint_duration = (end_date - start_date).days
+    if sprint_duration >= NUMPY_MIN_DAYS:
+        _load_numpy()
 
     # Get total points
-    total_points = sprint_data.get('capacity', 0)
-    if total_points == 0:
-        metrics = sprint_data.get('metrics', {})
-        total_points = metrics.get('total_points', 0)
+    total_points = sprint_total_points(sprint_data)
 
     # Calculate ideal burndown
     ideal_line = calculate_ideal_burndown(total_points, sprint_duration)
 
-    # Get actual burndown data
-    burndown_entries = sprint_data.get('burndown', [])
+    # Index actual burndown data by day (one pass over the entries)
+    entries_by_date, duplicate_dates = index_burndown_entries(sprint_data.burndown)
 
-    # Build complete dataset
-    dates = []
-    actual = []
-    completed = []
-    ideal = []
+    # Fill one value per calendar day, carrying the last entry forward
+    day_count = sprint_duration + 1 if end_date >= start_date else 0
+    if np is not None:
+        dates, actual, completed = _fill_series_numpy(start_date, day_count, (total_points, 0), entries_by_date)
+    else:
+        dates, actual, completed = _fill_series_python(start_date, day_count, (total_points, 0), entries_by_date)
 
-    # Start with day 0
-    current_date = start_date
-    day_index = 0
+    ideal = ideal_line[:day_count] + [0] * (day_count - len(ideal_line))
+
+    return {
+        'dates': dates,
+        'actual': actual,
+        'ideal': ideal,
+        'completed': completed,
+        'status': calculate_status(actual, ideal),
+        'total_points': total_points,
+        'sprint_duration': sprint_duration,
+        'duplicate_dates': duplicate_dates
+    }
 
-    while current_date <= end_date:
-        dates.append(current_date.strftime("%Y-%m-%d"))
 
-        # Find actual data for this date
-        actual_entry = None
-        for entry in burndown_entries:
-            entry_date = parse_date(entry.get('date', ''))
-            if entry_date and entry_date.date() == current_date.date():
-                actual_entry = entry
-                break
+def generate_burndown_rows(sprint_data: Sprint) -> Dict:
+    """
+    Lazy variant of generate_burndown_data for the table, CSV and NDJSON writers.
+
+    Returns total_points, sprint_duration and duplicate_dates, with a
+    one-shot 'rows' iterator in place of the per-day lists. Each row is
+    derived from the indexed entries as it is written, so memory does not
+    grow with the sprint length. The rows equal
+    iter_burndown_rows(generate_burndown_data(sprint_data)).
+    """
+    sprint_dates = get_sprint_dates(sprint_data)
+    if not sprint_dates:
+        return {}
+    start_date, end_date = sprint_dates
+
+    sprint_duration = (end_date - start_date).days
+    total_points = sprint_total_points(sprint_data)
+    entries_by_date, duplicate_dates = index_burndown_entries(sprint_data.burndown)
+    day_count = sprint_duration + 1 if end_date >= start_date else 0
+
+    return {
+        'rows': _iter_rows(start_date, day_count, total_points, sprint_duration, entries_by_date),
+        'total_points': total_points,
+        'sprint_duration': sprint_duration,
+        'duplicate_dates': duplicate_dates
+    }
 
-        if actual_entry:
-            actual.append(actual_entry.get('remaining_points', 0))
-            completed.append(actual_entry.get('completed_points', 0))
-        else:
-            # No data for this day, use last known value or None
-            if actual:
-                actual.append(actual[-1])  # Carry forward last value
-                completed.append(completed[-1])
-            else:
-                actual.append(total_points)  # Sprint not started
-                completed.append(0)
 
-        # Add ideal line value
-        if day_index < len(ideal_line):
-            ideal.append(ideal_line[day_index])
+def _iter_rows(start_date: datetime, day_count: int, total_points, sprint_duration: int,
+               entries_by_date: Dict[date, BurndownEntry]) -> Iterator[Tuple[str, int, float, float, float, str]]:
+    """Yield burndown rows one day at a time (see generate_burndown_rows)."""
+    points_per_day = total_points / sprint_duration if sprint_duration > 0 else 0
+    days = _iter_days(start_date, day_count, (total_points, 0), entries_by_date)
+
+    for day, (date_str, remaining_pts, completed_pts) in enumerate(days):
+        if sprint_duration > 0:
+            # Same expression as calculate_ideal_burndown
+            ideal_pts = round(total_points - (points_per_day * day), 1)
         else:
-            ideal.append(0)
+            ideal_pts = total_points if day == 0 else 0
+        yield date_str, day, completed_pts, remaining_pts, ideal_pts, burndown_status(remaining_pts, ideal_pts)
 
-        current_date += timedelta(days=1)
-        day_index += 1
+
+def _day_offsets(values, start: date, day_count: int) -> List[Optional[int]]:
+    """
+    Map dates onto sprint day offsets.
+
+    Dates before the sprint land on day 0, dates after it (and missing or
+    unparseable dates) map to None.
+    """
+    offsets = []
+    for value in values:
+        parsed = parse_entry_date(value)
+        if parsed is None:
+            offsets.append(None)
+            continue
+        offset = max((parsed - start).days, 0)
+        offsets.append(offset if offset < day_count else None)
+    return offsets
+
+
+def _daily_totals(offsets: List[Optional[int]], points: List, day_count: int) -> List:
+    """Sum points per day offset and return the running (prefix) totals."""
+    pairs = [(o, p) for o, p in zip(offsets, points) if o is not None]
+
+    if np is not None:
+        all_ints = all(isinstance(p, int) for _, p in pairs)
+        totals = np.zeros(day_count, dtype=np.int64 if all_ints else np.float64)
+        if pairs:
+            days, weights = zip(*pairs)
+            np.add.at(totals, np.asarray(days, dtype=np.int64), np.asarray(weights, dtype=totals.dtype))
+        return np.cumsum(totals).tolist()
+
+    totals = [0] * day_count
+    for day, value in pairs:
+        totals[day] += value
+    return list(accumulate(totals))
+
+
+def generate_story_burndown_data(sprint_data: Sprint) -> Dict:
+    """
+    Derive burndown chart data from story events instead of manual entries.
+
+    Each story contributes its points to the sprint scope on its
+    added_date (or day 0 when absent, i.e. planned at sprint start) and to
+    completed work on its completed_date. Points are bucketed per day and
+    turned into running totals, so the cost is O(stories + days).
+
+    Returns the same dict as generate_burndown_data, plus:
+        - scope: List of total committed points per day
+        - undated_completions: IDs of completed stories without completed_date
+    The ideal line starts from the scope planned at sprint start.
+    """
+    sprint_dates = get_sprint_dates(sprint_data)
+    if not sprint_dates:
+        return {}
+    start_date, end_date = sprint_dates
+
+    sprint_duration = (end_date - start_date).days
+    day_count = sprint_duration + 1 if end_date >= start_date else 0
+    if day_count == 0:
+        return {}
+    if day_count > NUMPY_MIN_DAYS:
+        _load_numpy()
+
+    stories = sprint_data.stories
+    points = [s.points or 0 for s in stories]
+    start = start_date.date()
+
+    added = _day_offsets([s.added_date or start for s in stories], start, day_count)
+    done = _day_offsets([s.completed_date for s in stories], start, day_count)
+
+    scope = _daily_totals(added, points, day_count)
+    completed = _daily_totals(done, points, day_count)
+    actual = [total - finished for total, finished in zip(scope, completed)]
+
+    ideal_line = calculate_ideal_burndown(scope[0], sprint_duration)
+    ideal = ideal_line[:day_count] + [0] * (day_count - len(ideal_line))
+
+    first_day = datetime.combine(start, datetime.min.time())
+    dates = [(first_day + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(day_count)]
+
+    undated = [s.id if s.id is not None else '?' for s in stories
+               if s.status == 'completed' and not s.completed_date]
 
     return {
         'dates': dates,
         'actual': actual,
         'ideal': ideal,
         'completed': completed,
-        'total_points': total_points,
-        'sprint_duration': sprint_duration
+        'status': calculate_status(actual, ideal),
+        'scope': scope,
+        'total_points': scope[-1],
+        'sprint_duration': sprint_duration,
+        'duplicate_dates': [],
+        'undated_completions': undated
     }
 
 
-def format_as_table(burndown_data: Dict, sprint_data: Dict) -> str:
-    """Format burndown data as ASCII table."""
-    if not burndown_data:
-        return "No burndown data available."
+def cross_check_burndown(story_burndown: Dict, sprint_data: Sprint) -> List[Dict]:
+    """
+    Compare a story-derived burndown with the manual burndown entries.
 
-    sprint_num = sprint_data.get('number', '?')
-    sprint_goal = sprint_data.get('sprint_goal', 'N/A')
-    total_points = burndown_data['total_points']
+    Returns:
+        List of {date, manual_remaining, derived_remaining} for each manual
+        entry inside the sprint whose remaining points disagree
+    """
+    entries_by_date, _ = index_burndown_entries(sprint_data.burndown)
+    position = {d: i for i, d in enumerate(story_burndown.get('dates', []))}
+
+    mismatches = []
+    for entry_date in sorted(entries_by_date):
+        i = position.get(entry_date.strftime("%Y-%m-%d"))
+        if i is None:
+            continue
+        manual = entries_by_date[entry_date].remaining_points
+        derived = story_burndown['actual'][i]
+        if manual != derived:
+            mismatches.append({
+                'date': story_burndown['dates'][i],
+                'manual_remaining': manual,
+                'derived_remaining': derived
+            })
+    return mismatches
+
+
+def _fill_series_python(start_date: datetime, day_count: int, carry: Tuple,
+                        entries_by_date: Dict[date, BurndownEntry]) -> Tuple[List[str], List, List]:
+    """
+    Build the dates, actual and completed series one day at a time.
+
+    `carry` is the (remaining, completed) pair used until the first entry:
+    (total_points, 0) for a fresh sprint, or the previous day's values when
+    only the tail of a sprint is recomputed.
+    """
+    dates = []
+    actual = []
+    completed = []
 
-    lines = []
-    lines.append("=" * 80)
-    lines.append(f"SPRINT {sprint_num} BURNDOWN CHART")
-    lines.append("=" * 80)
-    lines.append(f"Sprint Goal: {sprint_goal}")
-    lines.append(f"Total Points: {total_points}")
-    lines.append("")
+    for date_str, remaining_pts, completed_pts in _iter_days(start_date, day_count, carry, entries_by_date):
+        dates.append(date_str)
+        actual.append(remaining_pts)
+        completed.append(completed_pts)
 
-    # Table header
-    lines.append(f"{'Date':<12} {'Day':<6} {'Completed':<12} {'Remaining':<12} {'Ideal':<10} {'Status':<10}")
-    lines.append("-" * 80)
+    return dates, actual, completed
+
+
+def _iter_days(start_date: datetime, day_count: int, carry: Tuple,
+               entries_by_date: Dict[date, BurndownEntry]) -> Iterator[Tuple[str, float, float]]:
+    """Yield (date, remaining, completed) per day, carrying the last entry forward."""
+    remaining_pts, completed_pts = carry
+    current_date = start_date
+    for _ in range(day_count):
+        # Look up actual data for this date; days without one keep the last values
+        actual_entry = entries_by_date.get(current_date.date())
+        if actual_entry:
+            remaining_pts = actual_entry.remaining_points
+            completed_pts = actual_entry.completed_points
+
+        yield current_date.strftime("%Y-%m-%d"), remaining_pts, completed_pts
+        current_date += timedelta(days=1)
+
+
+def _fill_series_numpy(start_date: datetime, day_count: int, carry: Tuple,
+                       entries_by_date: Dict[date, BurndownEntry]) -> Tuple[List[str], List, List]:
+    """
+    Build the dates, actual and completed series as array operations.
+
+    Each day points at the latest entry on or before it (slot 0 holds
+    `carry`, as in _fill_series_python). Values are gathered from object arrays
+    so ints stay ints in the JSON output.
+    """
+    first_day = np.datetime64(start_date.date(), 'D')
+    dates = np.arange(first_day, first_day + day_count).astype(str).tolist()
+
+    remaining_values = [carry[0]]
+    completed_values = [carry[1]]
+    source = np.zeros(day_count, dtype=np.int64)
+    start = start_date.date()
+
+    for entry_date in sorted(entries_by_date):
+        offset = (entry_date - start).days
+        if 0 <= offset < day_count:
+            entry = entries_by_date[entry_date]
+            source[offset] = len(remaining_values)
+            remaining_values.append(entry.remaining_points)
+            completed_values.append(entry.completed_points)
+
+    # Forward-fill: slot numbers grow with the date, so a running max works
+    np.maximum.accumulate(source, out=source)
+
+    actual = np.array(remaining_values, dtype=object)[source].tolist()
+    completed = np.array(completed_values, dtype=object)[source].tolist()
+    return dates, actual, completed
+
+
+def iter_burndown_rows(burndown_data: Dict) -> Iterator[Tuple[str, int, float, float, float, str]]:
+    """
+    Yield one (date, day, completed, remaining, ideal, status) row per day.
+
+    Status comes from the precomputed column when present and is derived
+    once per row otherwise. This is the single row source for the table,
+    CSV and NDJSON writers; data from generate_burndown_rows is passed
+    through from its lazy 'rows' iterator.
+    """
+    if 'rows' in burndown_data:
+        yield from burndown_data['rows']
+        return
 
-    # Table rows
     dates = burndown_data['dates']
     actual = burndown_data['actual']
     ideal = burndown_data['ideal']
     completed = burndown_data['completed']
+    statuses = burndown_data.get('status')
 
-    for i, date in enumerate(dates):
-        day_num = i
+    for i, date_str in enumerate(dates):
         completed_pts = completed[i] if i < len(completed) else 0
         remaining_pts = actual[i] if i < len(actual) else 0
         ideal_pts = ideal[i] if i < len(ideal) else 0
+        status = statuses[i] if statuses else burndown_status(remaining_pts, ideal_pts)
+        yield date_str, i, completed_pts, remaining_pts, ideal_pts, status
+
+
+# Flush streamed output every this many rows so pipes see progress
+FLUSH_EVERY = 256
 
-        # Determine status
-        if remaining_pts == 0:
-            status = "COMPLETE"
-        elif remaining_pts < ideal_pts:
-            status = "AHEAD"
-        elif remaining_pts > ideal_pts:
-            status = "BEHIND"
-        else:
-            status = "ON TRACK"
 
-        lines.append(f"{date:<12} {day_num:<6} {completed_pts:<12.1f} {remaining_pts:<12.1f} {ideal_pts:<10.1f} {status:<10}")
+def _write_lines(lines: Iterable[str], out: TextIO):
+    """Write lines to out, flushing periodically."""
+    for count, line in enumerate(lines, start=1):
+        out.write(line)
+        out.write("\n")
+        if count % FLUSH_EVERY == 0:
+            out.flush()
+    out.flush()
 
-    lines.append("")
-    lines.append("=" * 80)
+
+def _table_lines(burndown_data: Dict, sprint_data: Sprint) -> Iterator[str]:
+    """Generate the ASCII table line by line."""
+    sprint_num = sprint_data.number if sprint_data.number is not None else '?'
+    sprint_goal = sprint_data.sprint_goal if sprint_data.sprint_goal is not None else 'N/A'
+    total_points = burndown_data['total_points']
+
+    yield "=" * 80
+    yield f"SPRINT {sprint_num} BURNDOWN CHART"
+    yield "=" * 80
+    yield f"Sprint Goal: {sprint_goal}"
+    yield f"Total Points: {total_points}"
+    yield ""
+
+    # Table header
+    yield f"{'Date':<12} {'Day':<6} {'Completed':<12} {'Remaining':<12} {'Ideal':<10} {'Status':<10}"
+    yield "-" * 80
+
+    # Table rows (remember the last one for the summary)
+    last_row = None
+    for row in iter_burndown_rows(burndown_data):
+        date_str, day_num, completed_pts, remaining_pts, ideal_pts, status = row
+        last_row = row
+        yield f"{date_str:<12} {day_num:<6} {completed_pts:<12.1f} {remaining_pts:<12.1f} {ideal_pts:<10.1f} {status:<10}"
+
+    yield ""
+    yield "=" * 80
 
     # Summary
-    if actual:
-        final_completed = completed[-1] if completed else 0
-        final_remaining = actual[-1] if actual else total_points
+    if last_row:
+        final_completed = last_row[2]
+        final_remaining = last_row[3]
         completion_pct = (final_completed / total_points * 100) if total_points > 0 else 0
 
-        lines.append(f"Final Status: {final_completed:.1f} / {total_points} points completed ({completion_pct:.1f}%)")
+        yield f"Final Status: {final_completed:.1f} / {total_points} points completed ({completion_pct:.1f}%)"
 
         if final_remaining == 0:
-            lines.append("Sprint completed successfully!")
+            yield "Sprint completed successfully!"
         elif final_remaining > 0:
-            lines.append(f"Sprint incomplete: {final_remaining:.1f} points remaining")
+            yield f"Sprint incomplete: {final_remaining:.1f} points remaining"
 
-    lines.append("=" * 80)
+    yield "=" * 80
 
-    return "\n".join(lines)
 
+def _csv_lines(burndown_data: Dict) -> Iterator[str]:
+    """Generate CSV lines (statuses use underscores, e.g. ON_TRACK)."""
+    yield "Date,Day,Completed,Remaining,Ideal,Status"
+    for date_str, day_num, completed_pts, remaining_pts, ideal_pts, status in iter_burndown_rows(burndown_data):
+        yield f"{date_str},{day_num},{completed_pts:.1f},{remaining_pts:.1f},{ideal_pts:.1f},{status.replace(' ', '_')}"
 
-def format_as_csv(burndown_data: Dict, sprint_data: Dict) -> str:
-    """Format burndown data as CSV."""
-    if not burndown_data:
-        return ""
 
-    lines = []
-    lines.append("Date,Day,Completed,Remaining,Ideal,Status")
+def _ndjson_lines(burndown_data: Dict, sprint_data: Sprint) -> Iterator[str]:
+    """Generate one JSON object per day."""
+    sprint_num = sprint_data.number
+    for date_str, day_num, completed_pts, remaining_pts, ideal_pts, status in iter_burndown_rows(burndown_data):
+        yield json.dumps({
+            'sprint': sprint_num,
+            'date': date_str,
+            'day': day_num,
+            'completed': completed_pts,
+            'remaining': remaining_pts,
+            'ideal': ideal_pts,
+            'status': status
+        })
 
-    dates = burndown_data['dates']
-    actual = burndown_data['actual']
-    ideal = burndown_data['ideal']
-    completed = burndown_data['completed']
 
-    for i, date in enumerate(dates):
-        day_num = i
-        completed_pts = completed[i] if i < len(completed) else 0
-        remaining_pts = actual[i] if i < len(actual) else 0
-        ideal_pts = ideal[i] if i < len(ideal) else 0
+def write_table(burndown_data: Dict, sprint_data: Sprint, out: TextIO):
+    """Stream the burndown as an ASCII table."""
+    if not burndown_data:
+        _write_lines(["No burndown data available."], out)
+        return
+    _write_lines(_table_lines(burndown_data, sprint_data), out)
 
-        # Determine status
-        if remaining_pts == 0:
-            status = "COMPLETE"
-        elif remaining_pts < ideal_pts:
-            status = "AHEAD"
-        elif remaining_pts > ideal_pts:
-            status = "BEHIND"
-        else:
-            status = "ON_TRACK"
 
-        lines.append(f"{date},{day_num},{completed_pts:.1f},{remaining_pts:.1f},{ideal_pts:.1f},{status}")
+def write_csv(burndown_data: Dict, sprint_data: Sprint, out: TextIO):
+    """Stream the burndown as CSV."""
+    if not burndown_data:
+        _write_lines([""], out)
+        return
+    _write_lines(_csv_lines(burndown_data), out)
+
 
-    return "\n".join(lines)
+def write_ndjson(burndown_data: Dict, sprint_data: Sprint, out: TextIO):
+    """Stream the burndown as newline-delimited JSON, one day per line."""
+    if burndown_data:
+        _write_lines(_ndjson_lines(burndown_data, sprint_data), out)
 
 
-def format_as_json(burndown_data: Dict, sprint_data: Dict) -> str:
-    """Format burndown data as JSON."""
+def write_json(burndown_data: Dict, sprint_data: Sprint, out: TextIO):
+    """
+    Stream the burndown as one indented JSON document.
+
+    The document is column-oriented, so it is encoded incrementally with
+    JSONEncoder.iterencode instead of rendering the whole string first.
+    """
     if not burndown_data:
-        return "{}"
+        _write_lines(["{}"], out)
+        return
+
+    encoder = json.JSONEncoder(indent=2)
+    for count, chunk in enumerate(encoder.iterencode(burndown_record(burndown_data, sprint_data)), start=1):
+        out.write(chunk)
+        if count % FLUSH_EVERY == 0:
+            out.flush()
+    out.write("\n")
+    out.flush()
 
-    output = {
+
+# Output format name -> streaming writer
+WRITERS = {
+    'table': write_table,
+    'csv': write_csv,
+    'json': write_json,
+    'ndjson': write_ndjson,
+}
+
+
+def _render(writer, burndown_data: Dict, sprint_data: Sprint) -> str:
+    """Run a streaming writer into a string (without the final newline)."""
+    buffer = io.StringIO()
+    writer(burndown_data, sprint_data, buffer)
+    return buffer.getvalue()[:-1]
+
+
+def format_as_table(burndown_data: Dict, sprint_data: Sprint) -> str:
+    """Format burndown data as ASCII table."""
+    return _render(write_table, burndown_data, sprint_data)
+
+
+def format_as_csv(burndown_data: Dict, sprint_data: Sprint) -> str:
+    """Format burndown data as CSV."""
+    return _render(write_csv, burndown_data, sprint_data)
+
+
+def burndown_record(burndown_data: Dict, sprint_data: Sprint) -> Dict:
+    """Build the JSON-ready record for one sprint's burndown."""
+    record = {
         'sprint': {
-            'number': sprint_data.get('number'),
-            'goal': sprint_data.get('sprint_goal'),
-            'start_date': sprint_data.get('start_date'),
-            'end_date': sprint_data.get('end_date'),
-            'capacity': sprint_data.get('capacity'),
-            'status': sprint_data.get('status')
+            'number': sprint_data.number,
+            'goal': sprint_data.sprint_goal,
+            'start_date': sprint_data.start_date,
+            'end_date': sprint_data.end_date,
+            'capacity': sprint_data.capacity,
+            'status': sprint_data.status
         },
         'burndown': {
             'dates': burndown_data['dates'],
@@ -308,16 +760,364 @@ def format_as_json(burndown_data: Dict, sprint_data: Dict) -> str:
         }
     }
 
-    return json.dumps(output, indent=2)
+    if 'scope' in burndown_data:
+        record['burndown']['scope'] = burndown_data['scope']
+
+    return record
+
+
+def format_as_json(burndown_data: Dict, sprint_data: Sprint) -> str:
+    """Format burndown data as JSON."""
+    return _render(write_json, burndown_data, sprint_data)
+
+
+def _burndown_key(sprint_data: Sprint) -> Tuple:
+    """Fields that shape the whole burndown; a change forces a full rebuild."""
+    return (sprint_data.start_date, sprint_data.end_date, sprint_data.capacity, sprint_data.total_points)
+
+
+def refresh_burndown(state: Optional[Dict], sprint_data: Sprint) -> Tuple[Dict, Optional[int]]:
+    """
+    Bring a burndown up to date with freshly loaded sprint data.
+
+    Only the days at and after the earliest added, removed or changed
+    burndown entry are recomputed; earlier days are reused. A change to
+    the sprint dates or total points rebuilds everything.
+
+    Args:
+        state: Previous state from this function (None on the first call)
+        sprint_data: Current sprint data
+
+    Returns:
+        Tuple of (new state, first changed day or None if nothing changed).
+        The burndown itself is state['burndown'].
+    """
+    key = _burndown_key(sprint_data)
+    entries_by_date, duplicate_dates = index_burndown_entries(sprint_data.burndown)
+    values = {d: (e.remaining_points, e.completed_points)
+              for d, e in entries_by_date.items()}
+
+    if not state or state['key'] != key or not state['burndown']:
+        burndown_data = generate_burndown_data(sprint_data)
+        return {'key': key, 'values': values, 'burndown': burndown_data}, 0
+
+    burndown_data = state['burndown']
+    changed = [d for d in values.keys() | state['values'].keys()
+               if values.get(d) != state['values'].get(d)]
+    start_date = parse_date(sprint_data.start_date)
+    day_count = len(burndown_data['dates'])
+    first_day = max(0, (min(changed) - start_date.date()).days) if changed else day_count
+
+    burndown_data = dict(burndown_data, duplicate_dates=duplicate_dates)
+    new_state = {'key': key, 'values': values, 'burndown': burndown_data}
+    if first_day >= day_count:
+        return new_state, None
+
+    actual = burndown_data['actual'][:first_day]
+    completed = burndown_data['completed'][:first_day]
+    carry = (actual[-1], completed[-1]) if first_day else (burndown_data['total_points'], 0)
+
+    fill = _fill_series_numpy if np is not None else _fill_series_python
+    _, actual_tail, completed_tail = fill(start_date + timedelta(days=first_day), day_count - first_day,
+                                          carry, entries_by_date)
+
+    burndown_data['actual'] = actual + actual_tail
+    burndown_data['completed'] = completed + completed_tail
+    burndown_data['status'] = (burndown_data['status'][:first_day] +
+                               calculate_status(actual_tail, burndown_data['ideal'][first_day:]))
+    return new_state, first_day
+
+
+def _first_changed_day(previous: Dict, current: Dict) -> Optional[int]:
+    """Index of the first day whose values differ between two burndowns."""
+    if not previous or previous.get('dates') != current.get('dates'):
+        return 0
+    for i, row in enumerate(zip(previous['actual'], previous['completed'],
+                                current['actual'], current['completed'])):
+        if row[:2] != row[2:]:
+            return i
+    return None
+
+
+def burndown_diff(burndown_data: Dict, sprint_data: Sprint, first_day: int) -> Dict:
+    """Build a diff record holding the rows from first_day onwards."""
+    rows = []
+    for i in range(first_day, len(burndown_data['dates'])):
+        rows.append({
+            'date': burndown_data['dates'][i],
+            'day': i,
+            'completed': burndown_data['completed'][i],
+            'remaining': burndown_data['actual'][i],
+            'ideal': burndown_data['ideal'][i],
+            'status': burndown_data['status'][i]
+        })
+    return {'sprint': sprint_data.number, 'from_day': first_day, 'rows': rows}
+
+
+# inotify flags: IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+_INOTIFY_MASK = 0x002 | 0x008 | 0x080 | 0x100 | 0x200
+
+
+def _inotify_watch(directory: str) -> Optional[int]:
+    """Return an inotify descriptor watching directory, or None if unavailable."""
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(directory), _INOTIFY_MASK) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def _file_signature(file_path: str) -> Optional[Tuple]:
+    """Cheap change signature for a file (None while it does not exist)."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def watch_file_changes(file_path: str, poll_interval: float = 0.5):
+    """
+    Yield once at start and then whenever the file changes.
+
+    Blocks on inotify for the file's directory (so atomic saves via rename
+    are seen) and falls back to polling the file's mtime/size/inode.
+    """
+    fd = _inotify_watch(os.path.dirname(os.path.abspath(file_path)))
+    last = None
+    try:
+        while True:
+            signature = _file_signature(file_path)
+            if signature != last:
+                last = signature
+                if signature is not None:
+                    yield
+
+            if fd is None:
+                time.sleep(poll_interval)
+                continue
+
+            select.select([fd], [], [])
+            # Let an editor finish its burst of writes, then drain the queue
+            time.sleep(0.05)
+            try:
+                while os.read(fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+def watch(file_path: str, sprint_number: Optional[int], output_format: str = 'table',
+          use_cache: bool = True, diff_only: bool = False, poll_interval: float = 0.5,
+          from_stories: bool = False):
+    """
+    Re-emit the burndown whenever the sprint-status file changes.
+
+    Invalid intermediate saves are reported on stderr and skipped; the
+    last good burndown is kept until the file parses again.
+    """
+    _load_numpy()
+    state = None
+    last_output = None
+    clear_screen = output_format == 'table' and sys.stdout.isatty()
+
+    for _ in watch_file_changes(file_path, poll_interval):
+        try:
+            status = SprintStatus.from_dict(load_status(
+                file_path, sections=(), sprint=CURRENT_SPRINT if sprint_number is None else sprint_number,
+                use_cache=use_cache))
+        except (FileNotFoundError, yaml_error()) as e:
+            print(f"Warning: Could not read {file_path}: {e}", file=sys.stderr)
+            continue
+
+        sprint_data = get_sprint_data(status, sprint_number)
+        if not sprint_data:
+            print("Warning: Sprint not found", file=sys.stderr)
+            continue
+
+        if from_stories:
+            # Story burndowns are O(stories + days); rebuild and locate the first change
+            previous = state['burndown'] if state else {}
+            burndown_data = generate_story_burndown_data(sprint_data)
+            state = {'burndown': burndown_data}
+            first_day = _first_changed_day(previous, burndown_data)
+        else:
+            state, first_day = refresh_burndown(state, sprint_data)
+            burndown_data = state['burndown']
+        if not burndown_data:
+            print("Warning: Could not generate burndown data (missing dates or points)", file=sys.stderr)
+            continue
+
+        if diff_only:
+            if first_day is None:
+                continue
+            output = json.dumps(burndown_diff(burndown_data, sprint_data, first_day))
+        elif output_format == 'json':
+            # One line per frame so consumers can read frames line by line
+            output = json.dumps(burndown_record(burndown_data, sprint_data))
+        else:
+            output = _render(WRITERS[output_format], burndown_data, sprint_data)
+
+        if output == last_output:
+            continue
+        last_output = output
+
+        if clear_screen:
+            sys.stdout.write("\033[2J\033[H")
+        print(output, flush=True)
+
+
+def burndown_file(file_path: str, use_cache: bool = True, from_stories: bool = False) -> Dict:
+    """
+    Compute burndowns for every sprint in one sprint-status file.
+
+    Errors are reported in the result instead of exiting, so one bad file
+    or sprint does not stop a batch run.
+    """
+    _load_numpy()
+    result = {'path': file_path}
+    try:
+        status = SprintStatus.from_dict(load_status(file_path, sections=('sprints',), use_cache=use_cache))
+    except FileNotFoundError:
+        result['error'] = f"File not found: {file_path}"
+        return result
+    except yaml_error() as e:
+        result['error'] = f"Invalid YAML format: {e}"
+        return result
+
+    result['project'] = status.project
+    result['current_sprint'] = status.current_sprint
+    result['sprints'] = []
+
+    for sprint_data in status.sprints:
+        try:
+            if from_stories:
+                burndown_data = generate_story_burndown_data(sprint_data)
+            else:
+                burndown_data = generate_burndown_data(sprint_data)
+        except (TypeError, ValueError) as e:
+            burndown_data = {}
+            error = str(e)
+        else:
+            error = "Could not generate burndown data (missing dates or points)"
+
+        if burndown_data:
+            record = burndown_record(burndown_data, sprint_data)
+            if burndown_data['duplicate_dates']:
+                record['duplicate_dates'] = burndown_data['duplicate_dates']
+            if from_stories and sprint_data.burndown:
+                record['cross_check'] = cross_check_burndown(burndown_data, sprint_data)
+        else:
+            record = {'sprint': {'number': sprint_data.number}, 'error': error}
+        result['sprints'].append(record)
+
+    return result
+
+
+def run_batch(paths: List[str], output_format: str = 'json', workers: Optional[int] = None,
+              use_cache: bool = True, from_stories: bool = False):
+    """
+    Compute burndowns for many files and print one merged result.
+
+    Args:
+        paths: Sprint-status files and/or directories to search
+        output_format: 'json' for one document, 'ndjson' for one line per sprint
+        workers: Process pool size (None uses the CPU count)
+        use_cache: Use the parsed-status cache
+        from_stories: Derive burndowns from story events
+    """
+    files = find_status_files(paths)
+    if not files:
+        print("Error: No sprint-status files found", file=sys.stderr)
+        sys.exit(1)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(files) > 1:
+        from concurrent.futures import ProcessPoolExecutor  # imported only when a pool is used
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+            results = pool.map(burndown_file, files, [use_cache] * len(files), [from_stories] * len(files),
+                               chunksize=max(1, len(files) // (workers * 4)))
+            results = list(results)
+    else:
+        results = [burndown_file(f, use_cache, from_stories) for f in files]
+
+    if output_format == 'ndjson':
+        for result in results:
+            if 'error' in result:
+                print(json.dumps({'path': result['path'], 'error': result['error']}))
+                continue
+            for record in result['sprints']:
+                line = {'path': result['path'], 'project': result['project']}
+                line.update(record)
+                print(json.dumps(line, default=str))
+    else:
+        print(json.dumps({'files': results}, indent=2, default=str))
+
+
+def batch_main(args: List[str]):
+    """Parse batch-mode arguments and run the batch."""
+    paths = []
+    output_format = 'json'
+    workers = None
+    use_cache = True
+    from_stories = False
+
+    args = iter(args)
+    for arg in args:
+        if arg == '--ndjson':
+            output_format = 'ndjson'
+        elif arg == '--json':
+            output_format = 'json'
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg == '--from-stories':
+            from_stories = True
+        elif arg == '--workers':
+            value = next(args, '')
+            if not value.isdigit() or int(value) < 1:
+                print("Error: --workers needs a positive integer")
+                sys.exit(1)
+            workers = int(value)
+        else:
+            paths.append(arg)
+
+    if not paths:
+        print("Usage: python sprint-burndown.py --batch <file-or-dir>... [--ndjson] [--workers N] [--from-stories] [--no-cache]")
+        sys.exit(1)
+
+    run_batch(paths, output_format, workers, use_cache, from_stories)
 
 
 def main():
     """Main execution function."""
+    if len(sys.argv) >= 2 and sys.argv[1] == '--batch':
+        batch_main(sys.argv[2:])
+        return
+
     if len(sys.argv) < 2:
-        print("Usage: python sprint-burndown.py <sprint-status-file> [sprint-number] [--csv|--json]")
+        print("Usage: python sprint-burndown.py <sprint-status-file> [sprint-number] [--csv|--json|--ndjson] [--from-stories] [--no-cache]")
+        print("       python sprint-burndown.py --batch <file-or-dir>... [--ndjson] [--workers N] [--from-stories] [--no-cache]")
+        print("       python sprint-burndown.py <sprint-status-file> [sprint-number] --watch [--diff] [--interval SECONDS]")
         print("Example: python sprint-burndown.py .bmad/sprint-status.yaml")
         print("Example: python sprint-burndown.py .bmad/sprint-status.yaml 2")
         print("Example: python sprint-burndown.py .bmad/sprint-status.yaml --csv")
+        print("Example: python sprint-burndown.py --batch projects/ --ndjson")
+        print("Example: python sprint-burndown.py .bmad/sprint-status.yaml --watch")
         sys.exit(1)
 
     file_path = sys.argv[1]
@@ -325,12 +1125,34 @@ def main():
     # Parse optional sprint number and format
     sprint_number = None
     output_format = 'table'
-
-    for arg in sys.argv[2:]:
+    use_cache = True
+    from_stories = False
+    watch_mode = False
+    diff_only = False
+    poll_interval = 0.5
+
+    args = iter(sys.argv[2:])
+    for arg in args:
         if arg == '--csv':
             output_format = 'csv'
         elif arg == '--json':
             output_format = 'json'
+        elif arg == '--ndjson':
+            output_format = 'ndjson'
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg == '--from-stories':
+            from_stories = True
+        elif arg == '--watch':
+            watch_mode = True
+        elif arg == '--diff':
+            diff_only = True
+        elif arg == '--interval':
+            try:
+                poll_interval = float(next(args, ''))
+            except ValueError:
+                print("Error: --interval needs a number of seconds")
+                sys.exit(1)
         elif arg.isdigit():
             sprint_number = int(arg)
 
@@ -339,11 +1161,18 @@ def main():
         print(f"Error: File not found: {file_path}")
         sys.exit(1)
 
+    if watch_mode:
+        try:
+            watch(file_path, sprint_number, output_format, use_cache, diff_only, poll_interval, from_stories)
+        except KeyboardInterrupt:
+            pass
+        return
+
     # Load sprint status data
-    data = load_sprint_status(file_path)
+    status = load_sprint_status(file_path, sprint_number, use_cache)
 
     # Get sprint data
-    sprint_data = get_sprint_data(data, sprint_number)
+    sprint_data = get_sprint_data(status, sprint_number)
     if not sprint_data:
         if sprint_number:
             print(f"Error: Sprint {sprint_number} not found")
@@ -351,20 +1180,33 @@ def main():
             print("Error: No current sprint found")
         sys.exit(1)
 
-    # Generate burndown data
-    burndown_data = generate_burndown_data(sprint_data)
+    # Generate burndown data (rows are produced while writing, except for
+    # the column-oriented JSON document)
+    if from_stories:
+        burndown_data = generate_story_burndown_data(sprint_data)
+    elif output_format == 'json':
+        burndown_data = generate_burndown_data(sprint_data)
+    else:
+        burndown_data = generate_burndown_rows(sprint_data)
 
     if not burndown_data:
         print("Error: Could not generate burndown data (missing dates or points)")
         sys.exit(1)
 
-    # Format and output
-    if output_format == 'csv':
-        print(format_as_csv(burndown_data, sprint_data))
-    elif output_format == 'json':
-        print(format_as_json(burndown_data, sprint_data))
-    else:
-        print(format_as_table(burndown_data, sprint_data))
+    if burndown_data['duplicate_dates']:
+        print(f"Warning: Multiple burndown entries for {', '.join(burndown_data['duplicate_dates'])}; "
+              f"using the last entry for each day", file=sys.stderr)
+
+    if from_stories:
+        if burndown_data['undated_completions']:
+            print(f"Warning: Completed stories without completed_date are not in the burndown: "
+                  f"{', '.join(map(str, burndown_data['undated_completions']))}", file=sys.stderr)
+        for mismatch in cross_check_burndown(burndown_data, sprint_data):
+            print(f"Warning: {mismatch['date']} manual burndown says {mismatch['manual_remaining']} "
+                  f"points remaining, stories say {mismatch['derived_remaining']}", file=sys.stderr)
+
+    # Format and stream output
+    WRITERS[output_format](burndown_data, sprint_data, sys.stdout)
 
 
 if __name__ == '__main__':
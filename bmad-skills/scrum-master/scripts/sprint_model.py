@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Shared Sprint Status Data Model for Scrum Master Scripts
+
+Turns the dict returned by sprint_status.load_status into compact records
+for sprint-burndown.py and calculate-velocity.py:
+
+- Sprint, Story, BurndownEntry and VelocityEntry hold only the fields the
+  scripts use, in __slots__ instead of per-object dicts
+- SprintStatus indexes the sprints by number and the stories by ID, epic
+  and status, so lookups do not scan the sprint list
+
+Missing keys become None, except numbers that the scripts add up
+(points on burndown and velocity entries, sprint metrics), which default
+to 0. Entries that are not mappings are skipped. When sprint numbers or
+story IDs repeat, lookups return the first one, as a top-down scan would.
+
+Usage (from a script in this directory):
+    from sprint_model import SprintStatus
+    from sprint_status import CURRENT_SPRINT, load_status
+
+    status = SprintStatus.from_dict(load_status(path, sprint=CURRENT_SPRINT))
+    sprint = status.current()
+    story = status.story('STORY-001')
+    blocked = status.stories_by_status('blocked')
+"""
+
+from typing import Dict, List, Optional
+
+
+def _mappings(items) -> List[Dict]:
+    """Return the dict entries of a YAML list (None and scalars are skipped)."""
+    return [item for item in items or [] if isinstance(item, dict)]
+
+
+def _hashable(value) -> bool:
+    """True if value can be an index key (YAML can put lists or maps anywhere)."""
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class Story:
+    """One story in a sprint."""
+
+    __slots__ = ('id', 'title', 'epic', 'priority', 'points', 'status',
+                 'started_date', 'completed_date', 'added_date', 'sprint')
+
+    def __init__(self, id=None, title=None, epic=None, priority=None, points=None, status=None,
+                 started_date=None, completed_date=None, added_date=None, sprint=None):
+        self.id = id
+        self.title = title
+        self.epic = epic
+        self.priority = priority
+        self.points = points
+        self.status = status
+        self.started_date = started_date
+        self.completed_date = completed_date
+        self.added_date = added_date
+        self.sprint = sprint
+
+    @classmethod
+    def from_dict(cls, data: Dict, sprint=None) -> 'Story':
+        return cls(data.get('id'), data.get('title'), data.get('epic'), data.get('priority'),
+                   data.get('points'), data.get('status'), data.get('started_date'),
+                   data.get('completed_date'), data.get('added_date'), sprint)
+
+    def __repr__(self):
+        return f"Story(id={self.id!r}, points={self.points!r}, status={self.status!r})"
+
+
+class BurndownEntry:
+    """One manual burndown data point."""
+
+    __slots__ = ('date', 'completed_points', 'remaining_points')
+
+    def __init__(self, date=None, completed_points=0, remaining_points=0):
+        self.date = date
+        self.completed_points = completed_points
+        self.remaining_points = remaining_points
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BurndownEntry':
+        return cls(data.get('date'), data.get('completed_points', 0), data.get('remaining_points', 0))
+
+    def __repr__(self):
+        return f"BurndownEntry(date={self.date!r}, remaining_points={self.remaining_points!r})"
+
+
+class Sprint:
+    """One sprint with its stories and burndown entries."""
+
+    __slots__ = ('number', 'status', 'sprint_goal', 'start_date', 'end_date', 'capacity',
+                 'total_points', 'completed_points', 'stories', 'burndown')
+
+    def __init__(self, number=None, status=None, sprint_goal=None, start_date=None, end_date=None,
+                 capacity=None, total_points=0, completed_points=0, stories=(), burndown=()):
+        self.number = number
+        self.status = status
+        self.sprint_goal = sprint_goal
+        self.start_date = start_date
+        self.end_date = end_date
+        self.capacity = capacity
+        self.total_points = total_points
+        self.completed_points = completed_points
+        self.stories = list(stories)
+        self.burndown = list(burndown)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Sprint':
+        number = data.get('number')
+        metrics = data.get('metrics')
+        if not isinstance(metrics, dict):
+            metrics = {}
+        return cls(number, data.get('status'), data.get('sprint_goal'), data.get('start_date'),
+                   data.get('end_date'), data.get('capacity'), metrics.get('total_points', 0),
+                   metrics.get('completed_points', 0),
+                   [Story.from_dict(s, number) for s in _mappings(data.get('stories'))],
+                   [BurndownEntry.from_dict(e) for e in _mappings(data.get('burndown'))])
+
+    def __repr__(self):
+        return f"Sprint(number={self.number!r}, stories={len(self.stories)}, burndown={len(self.burndown)})"
+
+
+class VelocityEntry:
+    """
+    One velocity_history record.
+
+    has_completed is False when the record has no `completed` key, so
+    callers can tell "no data" (completed defaults to 0) from a sprint
+    that finished nothing.
+    """
+
+    __slots__ = ('sprint', 'planned', 'completed', 'completion_rate', 'has_completed')
+
+    def __init__(self, sprint=None, planned=0, completed=0, completion_rate=None, has_completed=True):
+        self.sprint = sprint
+        self.planned = planned
+        self.completed = completed
+        self.completion_rate = completion_rate
+        self.has_completed = has_completed
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'VelocityEntry':
+        return cls(data.get('sprint'), data.get('planned', 0), data.get('completed', 0),
+                   data.get('completion_rate'), 'completed' in data)
+
+    def __repr__(self):
+        return f"VelocityEntry(sprint={self.sprint!r}, planned={self.planned!r}, completed={self.completed!r})"
+
+
+class SprintStatus:
+    """
+    A loaded sprint-status file with lookup indexes.
+
+    Attributes:
+        project: Project name (None if missing)
+        current_sprint: Number of the current sprint (0 if missing)
+        sprints: Sprints in file order
+        velocity_history: Velocity entries in file order
+    """
+
+    __slots__ = ('project', 'current_sprint', 'sprints', 'velocity_history',
+                 '_sprints_by_number', '_stories_by_id', '_stories_by_epic', '_stories_by_status')
+
+    def __init__(self, project=None, current_sprint=0, sprints=(), velocity_history=()):
+        self.project = project
+        self.current_sprint = current_sprint
+        self.sprints = list(sprints)
+        self.velocity_history = list(velocity_history)
+
+        self._sprints_by_number = {}
+        self._stories_by_id = {}
+        self._stories_by_epic = {}
+        self._stories_by_status = {}
+        for sprint in self.sprints:
+            if _hashable(sprint.number):
+                self._sprints_by_number.setdefault(sprint.number, sprint)
+            for story in sprint.stories:
+                if _hashable(story.id):
+                    self._stories_by_id.setdefault(story.id, story)
+                if _hashable(story.epic):
+                    self._stories_by_epic.setdefault(story.epic, []).append(story)
+                if _hashable(story.status):
+                    self._stories_by_status.setdefault(story.status, []).append(story)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SprintStatus':
+        """Build the model from a dict shaped like the YAML document."""
+        return cls(data.get('project'), data.get('current_sprint', 0),
+                   [Sprint.from_dict(s) for s in _mappings(data.get('sprints'))],
+                   [VelocityEntry.from_dict(v) for v in _mappings(data.get('velocity_history'))])
+
+    def sprint(self, number) -> Optional[Sprint]:
+        """Return the sprint with this number, or None."""
+        return self._sprints_by_number.get(number) if _hashable(number) else None
+
+    def current(self) -> Optional[Sprint]:
+        """Return the sprint named by current_sprint, or None."""
+        return self.sprint(self.current_sprint)
+
+    def story(self, story_id) -> Optional[Story]:
+        """Return the story with this ID, or None."""
+        return self._stories_by_id.get(story_id) if _hashable(story_id) else None
+
+    def stories_by_epic(self, epic) -> List[Story]:
+        """Return the stories in an epic, in file order."""
+        return list(self._stories_by_epic.get(epic, ())) if _hashable(epic) else []
+
+    def stories_by_status(self, status) -> List[Story]:
+        """Return the stories with a status (e.g. 'blocked'), in file order."""
+        return list(self._stories_by_status.get(status, ())) if _hashable(status) else []
+
+    def epics(self) -> List:
+        """Return the epics that have stories, in first-seen order."""
+        return list(self._stories_by_epic)
+
+    def __repr__(self):
+        return (f"SprintStatus(project={self.project!r}, sprints={len(self.sprints)}, "
+                f"velocity_history={len(self.velocity_history)})")
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+"""
+Shared Sprint Status Loader for Scrum Master Scripts
+
+Loads .bmad/sprint-status.yaml for sprint-burndown.py and calculate-velocity.py.
+Uses the libyaml C loader when PyYAML was built with it, and can walk the
+event stream to materialize only the parts of the file a script needs:
+
+- Top-level scalars (project, current_sprint, ...) are always loaded
+- `sections` lists the top-level collections to load in full
+- `sprint` reduces `sprints` to the single requested sprint
+
+Everything else is skipped at the event level, so no node tree or Python
+objects are built for it. Peak memory scales with the requested slice.
+
+Parsed results are cached as pickles in a per-user cache directory
+($BMAD_CACHE_DIR, or $XDG_CACHE_HOME/bmad/sprint-status, or
+~/.cache/bmad/sprint-status). Entries are keyed by the file's absolute
+path and the load request, and validated against its mtime, size and
+content hash, so warm runs skip YAML parsing entirely (PyYAML is only
+imported when a file is actually parsed). The directory is shared by all
+projects and trimmed least-recently-used first once it grows past
+$BMAD_CACHE_MAX_BYTES (default 64 MB). Long-running processes can also
+keep results in memory with enable_memory_cache().
+
+Usage (from a script in this directory):
+    from sprint_status import CURRENT_SPRINT, load_status
+
+    data = load_status(path, sections=('velocity_history',), sprint=CURRENT_SPRINT)
+    data = load_status(path, use_cache=False)  # --no-cache
+    paths = find_status_files(['teams/'])     # every sprint-status.yaml below teams/
+
+    enable_memory_cache()  # long-running processes: also memoize in memory
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# PyYAML and its loader class, set by _import_yaml() before the first parse.
+# hashlib, pickle and tempfile are imported by the cache functions that use
+# them, so importing this module stays cheap.
+yaml = None
+Loader = None
+
+# Sentinel for `sprint`: select the sprint named by `current_sprint`
+CURRENT_SPRINT = 'current'
+
+# Bump when the cached data layout changes
+CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# In-process memo of parsed results, off unless enable_memory_cache() is called
+_memory: Optional[OrderedDict] = None
+_memory_max_entries = 0
+
+_COLLECTION_START = ()
+_COLLECTION_END = ()
+
+
+class _FallbackToFullLoad(Exception):
+    """Raised when the document shape needs a regular full load."""
+
+
+def load_status(file_path: str, sections: Optional[Iterable[str]] = None,
+                sprint: Optional[Union[int, str]] = None, use_cache: bool = True) -> Dict:
+    """
+    Load sprint status data, optionally restricted to a slice of the file.
+
+    Args:
+        file_path: Path to the sprint status YAML file
+        sections: Top-level keys to load in full (None loads the whole file)
+        sprint: Sprint number, or CURRENT_SPRINT, to keep from `sprints`
+        use_cache: Read and write the parsed-status cache
+
+    Returns:
+        Dict shaped like the YAML document. When `sprint` is given, `sprints`
+        holds at most the one matching sprint.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        yaml.YAMLError: If the file is not valid YAML
+    """
+    if not use_cache:
+        return _parse(file_path, sections, sprint)
+
+    request = (None if sections is None else tuple(sorted(sections)), sprint)
+    stat = os.stat(file_path)
+
+    if _memory is not None:
+        memo_key = (os.path.abspath(file_path), request)
+        signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        hit = _memory.get(memo_key)
+        if hit is not None and hit[0] == signature:
+            _memory.move_to_end(memo_key)
+            return hit[1]
+
+    entry_path = _cache_entry_path(file_path, request)
+    data = _read_cache_entry(entry_path, file_path, stat)
+    if data is None:
+        data = _parse(file_path, sections, sprint)
+        _write_cache_entry(entry_path, (stat.st_mtime_ns, stat.st_size, _content_hash(file_path)), data)
+
+    if _memory is not None:
+        _memory[memo_key] = (signature, data)
+        _memory.move_to_end(memo_key)
+        while len(_memory) > _memory_max_entries:
+            _memory.popitem(last=False)
+    return data
+
+
+def enable_memory_cache(max_entries: int = 256):
+    """
+    Keep parsed results in memory for the life of the process.
+
+    Meant for long-running processes such as the metrics server. Entries
+    are revalidated against the file's mtime, size and inode on every call,
+    and the least recently used entry is dropped beyond max_entries.
+    Returned data is shared between calls and must not be modified.
+    """
+    global _memory, _memory_max_entries
+    if _memory is None:
+        _memory = OrderedDict()
+    _memory_max_entries = max_entries
+
+
+def _import_yaml():
+    """Import PyYAML on first use, so cache hits and --help never load it."""
+    global yaml, Loader, _COLLECTION_START, _COLLECTION_END
+    if yaml is None:
+        import yaml as module
+
+        # libyaml-backed loader when available, pure Python otherwise
+        Loader = getattr(module, 'CSafeLoader', module.SafeLoader)
+        _COLLECTION_START = (module.SequenceStartEvent, module.MappingStartEvent)
+        _COLLECTION_END = (module.SequenceEndEvent, module.MappingEndEvent)
+        yaml = module
+    return yaml
+
+
+def yaml_error() -> type:
+    """
+    Return yaml.YAMLError, the error load_status raises for invalid YAML.
+
+    Meant for except clauses (`except yaml_error() as e:`), which only
+    evaluate it when an exception is raised, so PyYAML is not imported
+    for runs served from the cache.
+    """
+    return _import_yaml().YAMLError
+
+
+def _parse(file_path: str, sections: Optional[Iterable[str]], sprint: Optional[Union[int, str]]) -> Dict:
+    """Parse the YAML file, streaming when only a slice is requested."""
+    _import_yaml()
+    if sections is None and sprint is None:
+        return _full_load(file_path)
+
+    wanted = set(sections or ())
+    try:
+        with open(file_path, 'rb') as f:
+            return _selective_load(f, wanted, sprint, file_path)
+    except _FallbackToFullLoad:
+        return _slice(_full_load(file_path), wanted, sprint)
+
+
+def find_status_files(paths: List[str]) -> List[str]:
+    """
+    Expand command-line paths into sprint-status files.
+
+    Files are used as given; directories are searched recursively for
+    sprint-status.yaml. The result is de-duplicated and sorted per argument.
+    """
+    found = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = sorted(str(p) for p in Path(path).rglob('sprint-status.yaml'))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                found.append(candidate)
+    return found
+
+
+def cache_dir() -> Path:
+    """Return the directory holding parsed-status cache entries."""
+    if os.environ.get('BMAD_CACHE_DIR'):
+        return Path(os.environ['BMAD_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'bmad' / 'sprint-status'
+
+
+def _cache_entry_path(file_path: str, request: Tuple) -> Path:
+    """Name the cache entry after the source path and load request."""
+    import hashlib
+
+    key = repr((CACHE_VERSION, os.path.abspath(file_path), request)).encode('utf-8')
+    return cache_dir() / (hashlib.blake2b(key, digest_size=16).hexdigest() + '.pickle')
+
+
+def _content_hash(file_path: str) -> str:
+    """Hash the file content for cache validation."""
+    import hashlib
+
+    with open(file_path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+
+
+def _read_cache_entry(entry_path: Path, file_path: str, stat: os.stat_result) -> Optional[Dict]:
+    """
+    Return cached data if the entry still matches the source file.
+
+    Matching mtime and size are trusted as-is. If only the mtime moved
+    (e.g. `touch` or a fresh checkout) the content hash decides, and a
+    matching entry is rewritten with the new mtime so later runs skip the
+    hash again. Unreadable or stale entries are treated as a miss.
+    """
+    import pickle
+
+    try:
+        with open(entry_path, 'rb') as f:
+            header = pickle.load(f)
+            if header.get('version') != CACHE_VERSION or header.get('size') != stat.st_size:
+                return None
+            moved = header.get('mtime_ns') != stat.st_mtime_ns
+            if moved and header.get('hash') != _content_hash(file_path):
+                return None
+            data = pickle.load(f)
+    except Exception:
+        return None
+
+    if moved:
+        _write_cache_entry(entry_path, (stat.st_mtime_ns, stat.st_size, header['hash']), data)
+    else:
+        # Refresh the entry's position in the LRU order
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+    return data
+
+
+def _write_cache_entry(entry_path: Path, fingerprint: Tuple, data: Dict):
+    """Atomically store an entry, then trim the cache. Failures are ignored."""
+    import pickle
+    import tempfile
+
+    mtime_ns, size, content_hash = fingerprint
+    header = {'version': CACHE_VERSION, 'mtime_ns': mtime_ns, 'size': size, 'hash': content_hash}
+    try:
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=entry_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _evict(entry_path.parent)
+    except Exception:
+        pass
+
+
+def _evict(directory: Path):
+    """Delete least-recently-used entries until the cache fits its size cap."""
+    try:
+        max_bytes = int(os.environ.get('BMAD_CACHE_MAX_BYTES', DEFAULT_CACHE_MAX_BYTES))
+    except ValueError:
+        max_bytes = DEFAULT_CACHE_MAX_BYTES
+
+    entries = []
+    total = 0
+    for entry in os.scandir(directory):
+        if entry.name.endswith('.pickle'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            total += stat.st_size
+
+    entries.sort()
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def _full_load(file_path: str) -> Dict:
+    """Load the whole document with the fastest available loader."""
+    with open(file_path, 'rb') as f:
+        return yaml.load(f, Loader=Loader) or {}
+
+
+def _slice(data: Dict, wanted: set, sprint: Optional[Union[int, str]]) -> Dict:
+    """Apply a selective-load request to an already loaded document."""
+    if not isinstance(data, dict):
+        return data
+
+    result = {}
+    for key, value in data.items():
+        if key == 'sprints' and sprint is not None:
+            number = data.get('current_sprint', 0) if sprint == CURRENT_SPRINT else sprint
+            match = next((s for s in value or [] if isinstance(s, dict) and s.get('number') == number), None)
+            result[key] = [match] if match is not None else []
+        elif key in wanted or not isinstance(value, (dict, list)):
+            result[key] = value
+    return result
+
+
+def _selective_load(stream, wanted: set, sprint: Optional[Union[int, str]], file_path: str) -> Dict:
+    """Walk the top-level mapping, composing only the requested values."""
+    loader = Loader(stream)
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            return {}
+        loader.get_event()  # DocumentStart
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise _FallbackToFullLoad()
+        loader.get_event()
+
+        anchors = {}
+        result = {}
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _compose_key(loader, anchors)
+
+            if key == 'sprints' and sprint is not None:
+                number = sprint
+                if sprint == CURRENT_SPRINT:
+                    if 'current_sprint' in result:
+                        number = result['current_sprint']
+                    else:
+                        # current_sprint comes after sprints: look it up first
+                        number = _find_top_level_scalar(file_path, 'current_sprint')
+                result[key] = _select_sprint(loader, anchors, number)
+            elif key in wanted or loader.check_event(yaml.ScalarEvent, yaml.AliasEvent):
+                result[key] = _construct(loader, _compose(loader, anchors))
+            else:
+                _skip(loader, anchors)
+
+        return result
+    finally:
+        loader.dispose()
+
+
+def _select_sprint(loader, anchors: Dict, number) -> list:
+    """Compose sprints one at a time and keep only the first match."""
+    if not loader.check_event(yaml.SequenceStartEvent):
+        _skip(loader, anchors)
+        return []
+    loader.get_event()
+
+    selected = []
+    while not loader.check_event(yaml.SequenceEndEvent):
+        node = _compose(loader, anchors)
+        if not selected and _sprint_number(loader, node) == number:
+            selected.append(_construct(loader, node))
+    loader.get_event()
+    return selected
+
+
+def _sprint_number(loader, node):
+    """Read the `number` field of a composed sprint node."""
+    if not isinstance(node, yaml.MappingNode):
+        return None
+    for key_node, value_node in node.value:
+        if isinstance(key_node, yaml.ScalarNode) and key_node.value == 'number':
+            return _construct(loader, value_node)
+    return None
+
+
+def _find_top_level_scalar(file_path: str, name: str, default=0):
+    """Find a top-level scalar by skipping every other value in the file."""
+    with open(file_path, 'rb') as f:
+        loader = Loader(f)
+        try:
+            loader.get_event()
+            if loader.check_event(yaml.StreamEndEvent):
+                return default
+            loader.get_event()
+            loader.get_event()
+
+            anchors = {}
+            found = default
+            while not loader.check_event(yaml.MappingEndEvent):
+                if _compose_key(loader, anchors) == name:
+                    found = _construct(loader, _compose(loader, anchors))
+                else:
+                    _skip(loader, anchors)
+            return found
+        finally:
+            loader.dispose()
+
+
+def _compose_key(loader, anchors: Dict):
+    """Compose and construct a top-level mapping key."""
+    node = _compose(loader, anchors)
+    if node.tag == 'tag:yaml.org,2002:merge':
+        # Merge keys need the full mapping to resolve
+        raise _FallbackToFullLoad()
+    return _construct(loader, node)
+
+
+def _compose(loader, anchors: Dict):
+    """Build a yaml node for the next value from the event stream."""
+    event = loader.get_event()
+
+    if isinstance(event, yaml.AliasEvent):
+        node = anchors.get(event.anchor)
+        if node is None:
+            # Alias to an anchor inside a skipped section
+            raise _FallbackToFullLoad()
+        return node
+
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node = yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, style=event.style)
+        if event.anchor:
+            anchors[event.anchor] = node
+        return node
+
+    if isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == '!':
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+        if event.anchor:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.SequenceEndEvent):
+            node.value.append(_compose(loader, anchors))
+        node.end_mark = loader.get_event().end_mark
+        return node
+
+    tag = event.tag
+    if tag is None or tag == '!':
+        tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+    node = yaml.MappingNode(tag, [], event.start_mark, None, flow_style=event.flow_style)
+    if event.anchor:
+        anchors[event.anchor] = node
+    while not loader.check_event(yaml.MappingEndEvent):
+        key_node = _compose(loader, anchors)
+        value_node = _compose(loader, anchors)
+        node.value.append((key_node, value_node))
+    node.end_mark = loader.get_event().end_mark
+    return node
+
+
+def _construct(loader, node):
+    """Construct Python objects for a composed node."""
+    return loader.construct_document(node)
+
+
+def _skip(loader, anchors: Dict):
+    """Consume the next value's events without building anything."""
+    depth = 0
+    while True:
+        event = loader.get_event()
+        if getattr(event, 'anchor', None) and not isinstance(event, yaml.AliasEvent):
+            anchors.pop(event.anchor, None)
+        if isinstance(event, _COLLECTION_START):
+            depth += 1
+        elif isinstance(event, _COLLECTION_END):
+            depth -= 1
+        if depth == 0:
+            return
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+BMAD Metrics - one entry point for the BMAD Python tools
+
+Usage:
+    python bmad-metrics.py <command> [arguments...]
+    python bmad-metrics.py burndown .bmad/sprint-status.yaml --json
+    python bmad-metrics.py velocity .bmad/sprint-status.yaml --forecast --backlog 240
+    python bmad-metrics.py prioritize --batch features.csv
+    python bmad-metrics.py contrast "#333" "#fff"
+    python bmad-metrics.py check-startup [--budget-ms N] [--command-budget-ms N]
+
+Commands run the skill scripts unchanged (same arguments, output and exit
+codes); the scripts also still work when called directly. This file only
+imports os and sys up front: a command's script, and with it PyYAML,
+NumPy, csv or argparse, is loaded only when that command runs, so --help
+and usage errors return quickly.
+
+check-startup measures the cold start of `--help`, and of every
+command's `--help` and usage error, against a bare interpreter. It fails
+if a run exceeds its budget or imports a module it must not.
+"""
+
+import os
+import sys
+
+# Skills root (this file lives in <skills>/shared/scripts)
+SKILLS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Command -> (script relative to the skills root, one-line summary)
+COMMANDS = {
+    'burndown': ('scrum-master/scripts/sprint-burndown.py', "Sprint burndown chart data"),
+    'velocity': ('scrum-master/scripts/calculate-velocity.py', "Velocity report, analytics, forecast and rollup"),
+    'prioritize': ('product-manager/scripts/prioritize.py', "RICE feature prioritization"),
+    'contrast': ('ux-designer/scripts/contrast-check.py', "WCAG color contrast check"),
+}
+
+# Commands whose script has no --help of its own (their docstring is shown instead)
+DOCSTRING_HELP = ('burndown', 'velocity', 'contrast')
+
+# Arguments that make each command fail with a usage error
+BAD_ARGS = {
+    'burndown': [],
+    'velocity': [],
+    'prioritize': ['--bogus'],
+    'contrast': [],
+}
+
+# Cold-start budget for `--help`, in milliseconds above a bare interpreter
+DEFAULT_STARTUP_BUDGET_MS = 25
+
+# Modules the dispatcher itself must never import
+HEAVY_MODULES = ('yaml', 'numpy', 'json', 'csv', 'argparse', 'datetime', 'typing',
+                 'concurrent.futures', 'multiprocessing')
+
+# Cold-start budget for a command's --help and usage errors. The scripts
+# load their own standard-library modules, but none of these.
+DEFAULT_COMMAND_BUDGET_MS = 60
+COMMAND_HEAVY_MODULES = ('yaml', 'numpy', 'csv', 'sqlite3', 'concurrent.futures', 'multiprocessing')
+
+
+def script_path(command: str) -> str:
+    """Return the absolute path of a command's script."""
+    return os.path.join(SKILLS_DIR, *COMMANDS[command][0].split('/'))
+
+
+def print_usage():
+    """Print command line usage."""
+    print("Usage: python bmad-metrics.py <command> [arguments...]")
+    print("")
+    print("Commands:")
+    for command, (_, summary) in COMMANDS.items():
+        print(f"  {command:<14}{summary}")
+    print(f"  {'check-startup':<14}Check the cold-start time budgets [--budget-ms N] [--command-budget-ms N]")
+    print("")
+    print("Run 'python bmad-metrics.py <command> --help' for a command's options.")
+
+
+def script_code(command: str):
+    """
+    Return the compiled code of a command's script.
+
+    Scripts run directly as __main__ are recompiled on every run, which
+    for the larger ones costs more than all of their imports. The loader
+    used for imports reuses (and writes) the bytecode cached in the
+    script's __pycache__ directory instead.
+    """
+    from importlib.machinery import SourceFileLoader
+
+    path = script_path(command)
+    if not os.path.exists(path):
+        print(f"Error: {command} is not installed ({path} not found)")
+        sys.exit(1)
+    return SourceFileLoader('__main__', path).get_code('__main__')
+
+
+def print_script_help(command: str):
+    """Print a script's module docstring without running it."""
+    code = script_code(command)
+    # A module's docstring is the first constant of its code
+    docstring = code.co_consts[0] if code.co_consts and isinstance(code.co_consts[0], str) else None
+    print(docstring.strip() if docstring else COMMANDS[command][1])
+
+
+def run_command(command: str, args: list):
+    """
+    Run a command's script as __main__ with the given arguments.
+
+    This is equivalent to `python <script> <args>`: sys.argv[0] and
+    sys.path[0] point at the script and the script runs in a fresh
+    __main__ module with __file__ set, so its sibling modules import and
+    process pools can re-import it.
+    """
+    code = script_code(command)
+    path = code.co_filename
+
+    module = type(sys)('__main__')
+    module.__file__ = path
+    sys.modules['__main__'] = module
+    sys.argv = [path] + args
+    sys.path.insert(0, os.path.dirname(path))
+    exec(code, module.__dict__)
+
+
+def _time_command(argv: list, runs: int) -> float:
+    """Return the fastest of several wall-clock runs of argv, in milliseconds."""
+    import subprocess
+    import time
+
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _imported_modules(argv: list) -> set:
+    """Return the modules argv imports, from `python -X importtime`."""
+    import subprocess
+
+    result = subprocess.run([argv[0], '-X', 'importtime'] + argv[1:], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and line.count('|') == 2:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def startup_probes(budget_ms: float = DEFAULT_STARTUP_BUDGET_MS,
+                   command_budget_ms: float = DEFAULT_COMMAND_BUDGET_MS) -> list:
+    """Return (arguments, budget in ms, forbidden modules) for every run check-startup measures."""
+    probes = [(['--help'], budget_ms, HEAVY_MODULES)]
+    for command in COMMANDS:
+        probes.append(([command, '--help'], command_budget_ms, COMMAND_HEAVY_MODULES))
+        probes.append(([command] + BAD_ARGS[command], command_budget_ms, COMMAND_HEAVY_MODULES))
+    return probes
+
+
+def heavy_imports(args: list, forbidden: tuple) -> list:
+    """Return the forbidden modules `bmad-metrics.py <args>` imports beyond a bare interpreter."""
+    cli = [sys.executable, os.path.abspath(__file__)] + args
+    bare = [sys.executable, '-c', 'pass']
+    return sorted(m for m in _imported_modules(cli) - _imported_modules(bare)
+                  if m.split('.')[0] in forbidden or m in forbidden)
+
+
+def startup_overhead(args: list, runs: int = 7) -> float:
+    """Return the cold-start time of `bmad-metrics.py <args>` above a bare interpreter, in ms."""
+    cli = [sys.executable, os.path.abspath(__file__)] + args
+    return _time_command(cli, runs) - _time_command([sys.executable, '-c', 'pass'], runs)
+
+
+def check_startup(args: list):
+    """
+    Fail (exit 1) if a probed run is slower than its budget or imports heavy modules.
+
+    Each budget is compared to the fastest of several runs minus the fastest
+    bare-interpreter run, which keeps the check stable on noisy machines.
+    """
+    budgets = {'--budget-ms': DEFAULT_STARTUP_BUDGET_MS, '--command-budget-ms': DEFAULT_COMMAND_BUDGET_MS}
+    try:
+        if len(args) % 2:
+            raise ValueError
+        for flag, value in zip(args[::2], args[1::2]):
+            if flag not in budgets:
+                raise ValueError
+            budgets[flag] = float(value)
+    except ValueError:
+        print("Usage: python bmad-metrics.py check-startup [--budget-ms N] [--command-budget-ms N]")
+        sys.exit(1)
+
+    ok = True
+    for probe_args, budget_ms, forbidden in startup_probes(budgets['--budget-ms'], budgets['--command-budget-ms']):
+        label = ' '.join(probe_args)
+        overhead = startup_overhead(probe_args)
+        heavy = heavy_imports(probe_args, forbidden)
+        print(f"{label:<22} {overhead:6.1f} ms (budget {budget_ms:g} ms)")
+        if overhead > budget_ms:
+            ok = False
+        if heavy:
+            print(f"  imports {', '.join(heavy)}")
+            ok = False
+    print("OK" if ok else "FAILED")
+    if not ok:
+        sys.exit(1)
+
+
+def main():
+    """Main execution function."""
+    if len(sys.argv) < 2:
+        print_usage()
+        sys.exit(1)
+
+    command, args = sys.argv[1], sys.argv[2:]
+
+    if command in ('-h', '--help', 'help'):
+        print_usage()
+    elif command == 'check-startup':
+        check_startup(args)
+    elif command in COMMANDS:
+        if args in (['-h'], ['--help']) and command in DOCSTRING_HELP:
+            print_script_help(command)
+        else:
+            run_command(command, args)
+    else:
+        print(f"Error: Unknown command: {command}\n")
+        print_usage()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,19 +7,205 @@ Usage:
     python contrast-check.py #000000 #ffffff
     python contrast-check.py 000000 ffffff
     python contrast-check.py "#333" "#fff"
+    python contrast-check.py 0066cc 3366ff --target aaa
+    python contrast-check.py "#ffffffb3" 0008 0066cc
+    python contrast-check.py --palette colors.txt [--json | --csv] [-o FILE]
+    python contrast-check.py --palette colors.txt --suggest [--target aa|aaa|ui]
+    python contrast-check.py --palette colors.txt --apca [--over COLOR] --json
+    python contrast-check.py --scan src/styles tokens/ [--json | --csv] [--workers N]
+    python contrast-check.py --screenshot page.png [--tile 64] [--json | --csv]
+
+4- and 8-digit hex codes (and rgba() in --scan) carry alpha. A
+translucent color is composited, in sRGB as browsers do, over the colors
+listed after it and finally over white (or --over COLOR in palette and
+scan mode), and the rendered colors are what is checked. Every check also
+reports the APCA lightness contrast (Lc), which unlike the WCAG ratio is
+signed by polarity: positive for dark text on light, negative for light
+text on dark.
+
+Palette mode reads N colors from a file (or stdin with "-"), one per
+line as "[name] color", or a JSON object of name -> color. Each color is
+parsed and its luminance computed once (through a 256-entry sRGB lookup
+table), then the full N x N contrast matrix and the WCAG levels of every
+pair are computed as array operations (with NumPy when it is installed).
+The JSON and CSV exports truncate ratios to two decimals, so a ratio is
+at least a threshold exactly when the pair passes it.
+
+Suggestions (single pairs below the target, or --suggest for a palette)
+name the nearest color of the same hue that reaches the target (AA 4.5,
+AAA 7.0 or UI 3.0): the color is moved along its OKLab lightness, and
+since luminance rises with lightness the step is found by bisection.
+
+--scan walks directories for .css, .scss, .less and .json token files
+and checks every declared pair in one process: rules that set both color
+and background, and tokens named as pairs (on-X / X, X-fg / X-bg,
+X-foreground / X-background). Hex, rgb() and named colors are read, and
+var(), $, @ and {token.path} references are resolved across files;
+ratios and Lc values of all pairs are computed in one batch.
+Files are extracted in a process pool, and extractions are cached by
+content hash ($BMAD_CACHE_DIR or ~/.cache/bmad/contrast-scan), so
+re-runs only re-read changed files. It exits 1 if any pair is below the
+target.
+
+--screenshot audits rendered contrast in a PNG or binary PPM/PGM image.
+The file is memory-mapped: PPM/PGM pixels are used in place, and PNG
+data is inflated with zlib into one buffer whose scanline filters are
+undone in place. The image is cut into tiles, each tile's pixels are
+counted in luma bins, and the most common bin is taken as background
+and the most common distinct bin as foreground; their mean colors give
+the tile's ratio. Failing tiles are merged into regions, and a heatmap
+of tile grades is printed (or the grid exported with --json). It exits
+1 if any tile is below the target.
 """
 
+import os
 import sys
 import re
+import json
+import hashlib
+import pickle
 
+# NumPy once _load_numpy() has imported it; None until then or if not installed.
+# Only --palette, --scan and --screenshot load it; a single pair does not need it.
+np = None
+_numpy_tried = False
 
-def hex_to_rgb(hex_color):
-    """Convert hex color to RGB tuple."""
+
+def _load_numpy():
+    """Import NumPy on first use; returns None if it is not installed."""
+    global np, _numpy_tried
+    if not _numpy_tried:
+        _numpy_tried = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        np = numpy
+    return np
+
+
+# WCAG 2.1 thresholds, lowest first; a pair's grade is how many it meets
+GRADE_THRESHOLDS = (3.0, 4.5, 7.0)
+GRADE_NAMES = ('fail', 'large text / UI', 'AA', 'AAA')
+
+# Print the matrix itself for palettes up to this size
+MAX_PRINTED_MATRIX = 8
+
+# Opaque color translucent colors are composited over when nothing else is stated
+WHITE = (255, 255, 255)
+
+# APCA-W3 0.0.98G-4g constants (https://github.com/Myndex/apca-w3)
+APCA_COEFFICIENTS = (0.2126729, 0.7151522, 0.0721750)
+APCA_BLACK_THRESHOLD = 0.022
+APCA_BLACK_CLAMP = 1.414
+APCA_DELTA_Y_MIN = 0.0005
+APCA_SCALE = 1.14
+APCA_OFFSET = 0.027
+APCA_LOW_CLIP = 0.1
+
+# Minimum |Lc| per use (APCA readability guidance), highest first
+APCA_LEVELS = ((90, 'preferred for body text'), (75, 'body text'), (60, 'content text'),
+               (45, 'large text and headlines'), (30, 'spot text and UI'), (15, 'non-text only'))
+
+# Contrast targets for suggestions (--target)
+TARGETS = {'aa': 4.5, 'aaa': 7.0, 'ui': 3.0}
+
+# OKLab lightness steps per color searched for a compliant variant
+RAMP_STEPS = 512
+
+# Halvings of chroma when a lightness step is outside the sRGB gamut
+GAMUT_ITERATIONS = 12
+
+# Failing pairs listed in the text output of --suggest
+MAX_PRINTED_SUGGESTIONS = 50
+
+# CSS named colors (CSS Color Module Level 4)
+NAMED_COLORS = {
+    'aliceblue': 'F0F8FF', 'antiquewhite': 'FAEBD7', 'aqua': '00FFFF', 'aquamarine': '7FFFD4',
+    'azure': 'F0FFFF', 'beige': 'F5F5DC', 'bisque': 'FFE4C4', 'black': '000000',
+    'blanchedalmond': 'FFEBCD', 'blue': '0000FF', 'blueviolet': '8A2BE2', 'brown': 'A52A2A',
+    'burlywood': 'DEB887', 'cadetblue': '5F9EA0', 'chartreuse': '7FFF00', 'chocolate': 'D2691E',
+    'coral': 'FF7F50', 'cornflowerblue': '6495ED', 'cornsilk': 'FFF8DC', 'crimson': 'DC143C',
+    'cyan': '00FFFF', 'darkblue': '00008B', 'darkcyan': '008B8B', 'darkgoldenrod': 'B8860B',
+    'darkgray': 'A9A9A9', 'darkgreen': '006400', 'darkgrey': 'A9A9A9', 'darkkhaki': 'BDB76B',
+    'darkmagenta': '8B008B', 'darkolivegreen': '556B2F', 'darkorange': 'FF8C00',
+    'darkorchid': '9932CC', 'darkred': '8B0000', 'darksalmon': 'E9967A', 'darkseagreen': '8FBC8F',
+    'darkslateblue': '483D8B', 'darkslategray': '2F4F4F', 'darkslategrey': '2F4F4F',
+    'darkturquoise': '00CED1', 'darkviolet': '9400D3', 'deeppink': 'FF1493',
+    'deepskyblue': '00BFFF', 'dimgray': '696969', 'dimgrey': '696969', 'dodgerblue': '1E90FF',
+    'firebrick': 'B22222', 'floralwhite': 'FFFAF0', 'forestgreen': '228B22', 'fuchsia': 'FF00FF',
+    'gainsboro': 'DCDCDC', 'ghostwhite': 'F8F8FF', 'gold': 'FFD700', 'goldenrod': 'DAA520',
+    'gray': '808080', 'green': '008000', 'greenyellow': 'ADFF2F', 'grey': '808080',
+    'honeydew': 'F0FFF0', 'hotpink': 'FF69B4', 'indianred': 'CD5C5C', 'indigo': '4B0082',
+    'ivory': 'FFFFF0', 'khaki': 'F0E68C', 'lavender': 'E6E6FA', 'lavenderblush': 'FFF0F5',
+    'lawngreen': '7CFC00', 'lemonchiffon': 'FFFACD', 'lightblue': 'ADD8E6', 'lightcoral': 'F08080',
+    'lightcyan': 'E0FFFF', 'lightgoldenrodyellow': 'FAFAD2', 'lightgray': 'D3D3D3',
+    'lightgreen': '90EE90', 'lightgrey': 'D3D3D3', 'lightpink': 'FFB6C1', 'lightsalmon': 'FFA07A',
+    'lightseagreen': '20B2AA', 'lightskyblue': '87CEFA', 'lightslategray': '778899',
+    'lightslategrey': '778899', 'lightsteelblue': 'B0C4DE', 'lightyellow': 'FFFFE0',
+    'lime': '00FF00', 'limegreen': '32CD32', 'linen': 'FAF0E6', 'magenta': 'FF00FF',
+    'maroon': '800000', 'mediumaquamarine': '66CDAA', 'mediumblue': '0000CD',
+    'mediumorchid': 'BA55D3', 'mediumpurple': '9370DB', 'mediumseagreen': '3CB371',
+    'mediumslateblue': '7B68EE', 'mediumspringgreen': '00FA9A', 'mediumturquoise': '48D1CC',
+    'mediumvioletred': 'C71585', 'midnightblue': '191970', 'mintcream': 'F5FFFA',
+    'mistyrose': 'FFE4E1', 'moccasin': 'FFE4B5', 'navajowhite': 'FFDEAD', 'navy': '000080',
+    'oldlace': 'FDF5E6', 'olive': '808000', 'olivedrab': '6B8E23', 'orange': 'FFA500',
+    'orangered': 'FF4500', 'orchid': 'DA70D6', 'palegoldenrod': 'EEE8AA', 'palegreen': '98FB98',
+    'paleturquoise': 'AFEEEE', 'palevioletred': 'DB7093', 'papayawhip': 'FFEFD5',
+    'peachpuff': 'FFDAB9', 'peru': 'CD853F', 'pink': 'FFC0CB', 'plum': 'DDA0DD',
+    'powderblue': 'B0E0E6', 'purple': '800080', 'rebeccapurple': '663399', 'red': 'FF0000',
+    'rosybrown': 'BC8F8F', 'royalblue': '4169E1', 'saddlebrown': '8B4513', 'salmon': 'FA8072',
+    'sandybrown': 'F4A460', 'seagreen': '2E8B57', 'seashell': 'FFF5EE', 'sienna': 'A0522D',
+    'silver': 'C0C0C0', 'skyblue': '87CEEB', 'slateblue': '6A5ACD', 'slategray': '708090',
+    'slategrey': '708090', 'snow': 'FFFAFA', 'springgreen': '00FF7F', 'steelblue': '4682B4',
+    'tan': 'D2B48C', 'teal': '008080', 'thistle': 'D8BFD8', 'tomato': 'FF6347',
+    'turquoise': '40E0D0', 'violet': 'EE82EE', 'wheat': 'F5DEB3', 'white': 'FFFFFF',
+    'whitesmoke': 'F5F5F5', 'yellow': 'FFFF00', 'yellowgreen': '9ACD32',
+}
+
+# Files the scanner reads, and directories it never enters
+SCAN_EXTENSIONS = ('.css', '.scss', '.less', '.json')
+SCAN_SKIP_DIRS = ('node_modules',)
+
+# Token name endings the scanner pairs up: (foreground, background)
+TOKEN_PAIR_SUFFIXES = (('fg', 'bg'), ('foreground', 'background'))
+
+# References followed before a token is reported as circular
+MAX_REFERENCE_DEPTH = 32
+
+# Bump when the cached extraction layout or value parsing changes
+SCAN_CACHE_VERSION = 4
+
+# Failing pairs and unresolved values listed in the text output of --scan
+MAX_PRINTED_FINDINGS = 50
+
+# --screenshot: default tile size in pixels, and the luma bins (of the
+# gamma-encoded 0-255 luma) each tile's pixels are counted in
+SCREENSHOT_TILE = 64
+LUMA_BINS = 64
+
+# A tile's foreground is its most common luma bin at least this many bins
+# from the background's, covering at least this share of the tile
+MIN_LUMA_GAP = 6
+MIN_FOREGROUND_SHARE = 0.02
+
+# Heatmap character of each grade (GRADE_NAMES); tiles without a pair are blank
+HEATMAP_CHARS = '#+:.'
+MAX_HEATMAP_COLUMNS = 100
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Samples per pixel of each PNG color type (gray, RGB, palette, gray + alpha, RGBA)
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def hex_to_rgba(hex_color):
+    """Convert hex color to an (r, g, b, alpha) tuple; 4- and 8-digit codes carry alpha (0-1)."""
     # Remove # if present
     hex_color = hex_color.lstrip('#')
 
-    # Handle 3-character hex codes
-    if len(hex_color) == 3:
+    # Handle 3- and 4-character hex codes
+    if len(hex_color) in (3, 4):
         hex_color = ''.join([c*2 for c in hex_color])
 
     # Convert to RGB
@@ -27,11 +213,46 @@ def hex_to_rgb(hex_color):
         r = int(hex_color[0:2], 16)
         g = int(hex_color[2:4], 16)
         b = int(hex_color[4:6], 16)
-        return (r, g, b)
+        alpha = int(hex_color[6:8], 16) / 255 if len(hex_color) == 8 else 1.0
+        return (r, g, b, alpha)
     except (ValueError, IndexError):
         raise ValueError(f"Invalid hex color: #{hex_color}")
 
 
+def hex_to_rgb(hex_color):
+    """Convert hex color to RGB tuple (alpha is dropped; see hex_to_rgba)."""
+    return hex_to_rgba(hex_color)[:3]
+
+
+def composite(color, background):
+    """Composite an (r, g, b, alpha) color over an opaque (r, g, b) background, in sRGB as browsers do."""
+    r, g, b, alpha = color
+    if alpha >= 1:
+        return (r, g, b)
+    return tuple(int(round(alpha * c + (1 - alpha) * under)) for c, under in zip((r, g, b), background))
+
+
+def flatten_layers(colors, base=WHITE):
+    """Composite a stack of hex colors, top layer first, over an opaque base."""
+    rgb = base
+    for color in reversed(colors):
+        rgb = composite(hex_to_rgba(color), rgb)
+    return rgb
+
+
+def linearize(channel):
+    """Gamma-expand one 0-255 sRGB channel to linear light (0-1)."""
+    # Convert to 0-1 range
+    c = channel / 255.0
+
+    # Apply gamma correction
+    return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+# linearize() for every 8-bit channel value
+SRGB_TO_LINEAR = tuple(linearize(channel) for channel in range(256))
+
+
 def relative_luminance(rgb):
     """
     Calculate relative luminance according to WCAG formula.
@@ -39,28 +260,17 @@ def relative_luminance(rgb):
     """
     r, g, b = rgb
 
-    # Convert to 0-1 range
-    r = r / 255.0
-    g = g / 255.0
-    b = b / 255.0
-
-    # Apply gamma correction
-    r = r / 12.92 if r <= 0.03928 else ((r + 0.055) / 1.055) ** 2.4
-    g = g / 12.92 if g <= 0.03928 else ((g + 0.055) / 1.055) ** 2.4
-    b = b / 12.92 if b <= 0.03928 else ((b + 0.055) / 1.055) ** 2.4
+    # Gamma correction by table lookup
+    r = SRGB_TO_LINEAR[r]
+    g = SRGB_TO_LINEAR[g]
+    b = SRGB_TO_LINEAR[b]
 
     # Calculate luminance
     return 0.2126 * r + 0.7152 * g + 0.0722 * b
 
 
-def contrast_ratio(color1, color2):
-    """
-    Calculate contrast ratio between two colors.
-    https://www.w3.org/TR/WCAG21/#dfn-contrast-ratio
-    """
-    lum1 = relative_luminance(hex_to_rgb(color1))
-    lum2 = relative_luminance(hex_to_rgb(color2))
-
+def luminance_contrast(lum1, lum2):
+    """Contrast ratio between two relative luminances."""
     # Ensure lighter color is in numerator
     lighter = max(lum1, lum2)
     darker = min(lum1, lum2)
@@ -68,6 +278,121 @@ def contrast_ratio(color1, color2):
     return (lighter + 0.05) / (darker + 0.05)
 
 
+# Screen gamma (2.4) of every 8-bit channel value, for APCA
+APCA_TRC = tuple((channel / 255.0) ** 2.4 for channel in range(256))
+
+
+def apca_luminance(rgb):
+    """APCA screen luminance (Y) of an opaque 8-bit RGB color."""
+    r, g, b = rgb
+    kr, kg, kb = APCA_COEFFICIENTS
+    return kr * APCA_TRC[r] + kg * APCA_TRC[g] + kb * APCA_TRC[b]
+
+
+def apca_contrast(text_y, background_y):
+    """
+    APCA lightness contrast (Lc) of text on a background, from apca_luminance() values.
+
+    Unlike the WCAG ratio it depends on polarity: positive for dark text
+    on a light background, negative for light text on a dark one.
+    https://github.com/Myndex/apca-w3
+    """
+    # Soft clamp near black
+    if text_y < APCA_BLACK_THRESHOLD:
+        text_y += (APCA_BLACK_THRESHOLD - text_y) ** APCA_BLACK_CLAMP
+    if background_y < APCA_BLACK_THRESHOLD:
+        background_y += (APCA_BLACK_THRESHOLD - background_y) ** APCA_BLACK_CLAMP
+
+    if abs(background_y - text_y) < APCA_DELTA_Y_MIN:
+        return 0.0
+    if background_y > text_y:
+        sapc = (background_y ** 0.56 - text_y ** 0.57) * APCA_SCALE
+        return 0.0 if sapc < APCA_LOW_CLIP else (sapc - APCA_OFFSET) * 100
+    sapc = (background_y ** 0.65 - text_y ** 0.62) * APCA_SCALE
+    return 0.0 if sapc > -APCA_LOW_CLIP else (sapc + APCA_OFFSET) * 100
+
+
+def _apca_contrast_numpy(text_y, background_y):
+    """apca_contrast() on broadcastable NumPy arrays."""
+    text_y = np.where(text_y < APCA_BLACK_THRESHOLD,
+                      text_y + np.abs(APCA_BLACK_THRESHOLD - text_y) ** APCA_BLACK_CLAMP, text_y)
+    background_y = np.where(background_y < APCA_BLACK_THRESHOLD,
+                            background_y + np.abs(APCA_BLACK_THRESHOLD - background_y) ** APCA_BLACK_CLAMP,
+                            background_y)
+    normal = background_y > text_y
+    sapc = np.where(normal, background_y ** 0.56 - text_y ** 0.57, background_y ** 0.65 - text_y ** 0.62)
+    sapc = sapc * APCA_SCALE
+    lc = np.where(normal, np.where(sapc < APCA_LOW_CLIP, 0.0, sapc - APCA_OFFSET),
+                  np.where(sapc > -APCA_LOW_CLIP, 0.0, sapc + APCA_OFFSET)) * 100
+    return np.where(np.abs(background_y - text_y) < APCA_DELTA_Y_MIN, 0.0, lc)
+
+
+def apca_level(lc):
+    """The highest APCA use (APCA_LEVELS) an Lc value is enough for, or None."""
+    for minimum, use in APCA_LEVELS:
+        if abs(lc) >= minimum:
+            return use
+    return None
+
+
+def pair_contrast(foregrounds, backgrounds, base=WHITE):
+    """
+    WCAG ratio and APCA Lc of many text/background pairs in one pass.
+
+    Translucent backgrounds are composited over base, then translucent
+    text over the result; both metrics are computed from the same
+    composited channels (with NumPy when it is installed).
+
+    Args:
+        foregrounds: (r, g, b, alpha) text colors
+        backgrounds: (r, g, b, alpha) background colors, one per text color
+        base: Opaque (r, g, b) color beneath translucent backgrounds
+
+    Returns:
+        (list of contrast ratios, list of APCA Lc values)
+    """
+    if np is None:
+        ratios, lcs = [], []
+        for foreground, background in zip(foregrounds, backgrounds):
+            under = composite(background, base)
+            text = composite(foreground, under)
+            ratios.append(luminance_contrast(relative_luminance(text), relative_luminance(under)))
+            lcs.append(apca_contrast(apca_luminance(text), apca_luminance(under)))
+        return ratios, lcs
+
+    foregrounds = np.asarray(foregrounds, dtype=float).reshape(-1, 4)
+    backgrounds = np.asarray(backgrounds, dtype=float).reshape(-1, 4)
+    under = _composite_numpy(backgrounds, np.asarray(base, dtype=float))
+    text = _composite_numpy(foregrounds, under)
+
+    wcag = np.array(SRGB_TO_LINEAR)
+    apca = np.array(APCA_TRC)
+    kr, kg, kb = APCA_COEFFICIENTS
+    text_lum = 0.2126 * wcag[text[:, 0]] + 0.7152 * wcag[text[:, 1]] + 0.0722 * wcag[text[:, 2]]
+    under_lum = 0.2126 * wcag[under[:, 0]] + 0.7152 * wcag[under[:, 1]] + 0.0722 * wcag[under[:, 2]]
+    text_y = kr * apca[text[:, 0]] + kg * apca[text[:, 1]] + kb * apca[text[:, 2]]
+    under_y = kr * apca[under[:, 0]] + kg * apca[under[:, 1]] + kb * apca[under[:, 2]]
+
+    ratios = (np.maximum(text_lum, under_lum) + 0.05) / (np.minimum(text_lum, under_lum) + 0.05)
+    return ratios.tolist(), _apca_contrast_numpy(text_y, under_y).tolist()
+
+
+def _composite_numpy(colors, background):
+    """composite() for an (N, 4) array over (N, 3) or (3,) backgrounds; returns (N, 3) integers."""
+    alpha = colors[:, 3:4]
+    mixed = np.where(alpha >= 1, colors[:, :3], alpha * colors[:, :3] + (1 - alpha) * background)
+    return np.rint(mixed).astype(np.intp)
+
+
+def contrast_ratio(color1, color2):
+    """
+    Calculate contrast ratio between two colors.
+    https://www.w3.org/TR/WCAG21/#dfn-contrast-ratio
+    """
+    return luminance_contrast(relative_luminance(hex_to_rgb(color1)),
+                              relative_luminance(hex_to_rgb(color2)))
+
+
 def check_wcag_compliance(ratio):
     """Check WCAG 2.1 compliance levels."""
     results = {
@@ -90,6 +415,10 @@ def print_results(color1, color2, results):
     print("="*70)
     print(f"\nForeground: {color1.upper()}")
     print(f"Background: {color2.upper()}")
+    if results.get('layers'):
+        print(f"Over:       {' over '.join(layer.upper() for layer in results['layers'])}")
+    if 'rendered' in results:
+        print(f"Rendered:   {results['rendered'][0]} on {results['rendered'][1]} (after alpha compositing)")
     print(f"\nContrast Ratio: {ratio:.2f}:1")
     print("\n" + "-"*70)
     print("WCAG 2.1 COMPLIANCE:")
@@ -106,6 +435,15 @@ def print_results(color1, color2, results):
     print(f"  Normal text (< 18px):      {'✓ PASS' if results['aaa_normal'] else '✗ FAIL'} (requires 7.0:1)")
     print(f"  Large text (≥ 18px):       {'✓ PASS' if results['aaa_large'] else '✗ FAIL'} (requires 4.5:1)")
 
+    if 'apca' in results:
+        lc = results['apca']
+        use = apca_level(lc)
+        print("\n" + "-"*70)
+        print("APCA (WCAG 3 draft):")
+        print("-"*70)
+        print(f"\n  Lightness contrast:        Lc {lc:.1f}")
+        print(f"  Enough for:                {use if use else 'nothing (below Lc 15)'}")
+
     print("\n" + "-"*70)
     print("RECOMMENDATIONS:")
     print("-"*70)
@@ -133,28 +471,233 @@ def print_results(color1, color2, results):
     print("\n" + "="*70 + "\n")
 
 
-def suggest_improvements(color1, color2, results):
-    """Suggest color adjustments if contrast is insufficient."""
-    if results['aa_normal']:
-        return  # Already compliant
+def srgb_to_oklab(rgb):
+    """Convert an 8-bit sRGB tuple to OKLab (L, a, b)."""
+    r, g, b = (SRGB_TO_LINEAR[c] for c in rgb)
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+    return (0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+            1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+            0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s)
+
+
+def oklab_to_linear(lightness, a, b):
+    """Convert OKLab to linear sRGB (floats or NumPy arrays; may leave the gamut)."""
+    l = (lightness + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (lightness - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (lightness - 0.0894841775 * a - 1.2914855480 * b) ** 3
+    return (4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s,
+            -1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s,
+            -0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s)
+
+
+def _encode(linear):
+    """Gamma-encode a linear channel (0-1) to 0-255."""
+    linear = min(max(linear, 0.0), 1.0)
+    c = linear * 12.92 if linear <= 0.0031308 else 1.055 * linear ** (1 / 2.4) - 0.055
+    return int(round(c * 255))
+
+
+def _in_gamut(rgb):
+    return all(-1e-7 <= c <= 1 + 1e-7 for c in rgb)
+
+
+def _lightness_ramp(color):
+    """
+    Variants of a color at RAMP_STEPS OKLab lightnesses from black to white.
+
+    Hue is kept; where a lightness cannot hold the color's chroma in sRGB
+    the chroma is reduced (by bisection) until it fits.
 
+    Returns:
+        (lightness of the color, list of (r, g, b), list of luminances)
+    """
+    lightness, a, b = srgb_to_oklab(hex_to_rgb(color))
+    colors, luminances = [], []
+    for step in range(RAMP_STEPS):
+        level = step / (RAMP_STEPS - 1)
+        rgb = oklab_to_linear(level, a, b)
+        if not _in_gamut(rgb):
+            low, high = 0.0, 1.0
+            for _ in range(GAMUT_ITERATIONS):
+                middle = (low + high) / 2
+                if _in_gamut(oklab_to_linear(level, a * middle, b * middle)):
+                    low = middle
+                else:
+                    high = middle
+            rgb = oklab_to_linear(level, a * low, b * low)
+        rgb = tuple(_encode(c) for c in rgb)
+        colors.append(rgb)
+        luminances.append(relative_luminance(rgb))
+    return lightness, colors, luminances
+
+
+def _lightness_ramps_numpy(colors):
+    """_lightness_ramp() for many colors at once: arrays of shape (N,), (N, K, 3), (N, K)."""
+    lab = np.array([srgb_to_oklab(hex_to_rgb(color)) for color in colors]).reshape(-1, 3)
+    levels = np.broadcast_to(np.arange(RAMP_STEPS) / (RAMP_STEPS - 1), (len(lab), RAMP_STEPS))
+    a = np.broadcast_to(lab[:, 1:2], levels.shape)
+    b = np.broadcast_to(lab[:, 2:3], levels.shape)
+
+    linear = np.stack(oklab_to_linear(levels, a, b), axis=-1)
+    outside = ((linear < -1e-7) | (linear > 1 + 1e-7)).any(axis=-1)
+    if outside.any():
+        # Bisect the chroma of out-of-gamut steps only
+        levels, a, b = levels[outside], a[outside], b[outside]
+        low = np.zeros(len(levels))
+        high = np.ones(len(levels))
+        for _ in range(GAMUT_ITERATIONS):
+            middle = (low + high) / 2
+            trial = np.stack(oklab_to_linear(levels, a * middle, b * middle), axis=-1)
+            fits = ((trial >= -1e-7) & (trial <= 1 + 1e-7)).all(axis=-1)
+            low = np.where(fits, middle, low)
+            high = np.where(fits, high, middle)
+        linear[outside] = np.stack(oklab_to_linear(levels, a * low, b * low), axis=-1)
+
+    linear = np.clip(linear, 0.0, 1.0)
+    encoded = np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+    rgb = np.rint(encoded * 255).astype(np.intp)
+    channel = np.array(SRGB_TO_LINEAR)[rgb]
+    luminances = 0.2126 * channel[..., 0] + 0.7152 * channel[..., 1] + 0.0722 * channel[..., 2]
+    return lab[:, 0], rgb, luminances
+
+
+def _luminance_limits(partner_luminance, target):
+    """Highest luminance darker than, and lowest lighter than, a partner that reach target."""
+    # Nudged inward so float rounding can never land just short of the target
+    darkest = (partner_luminance + 0.05) / target - 0.05 - 1e-12
+    lightest = target * (partner_luminance + 0.05) - 0.05 + 1e-12
+    return darkest, lightest
+
+
+def nearest_compliant(colors, partner_luminances, target):
+    """
+    Find, for each color, the closest color of the same hue that reaches a target contrast.
+
+    Each color is moved along its OKLab lightness ramp (see
+    _lightness_ramp()), darker or lighter, whichever needs the smaller
+    lightness change. Ramp luminance rises with lightness, so the step is
+    found by binary search, for every query at once with NumPy.
+
+    Args:
+        colors: Hex colors to adjust (repeats share one ramp)
+        partner_luminances: Luminance each color must contrast with
+        target: Contrast ratio to reach, e.g. 4.5
+
+    Returns:
+        List with (hex color, contrast ratio) per query, or None where no
+        lightness of that hue reaches the target
+    """
+    unique = list(dict.fromkeys(colors))
+    row = {color: i for i, color in enumerate(unique)}
+
+    if np is None:
+        import bisect
+
+        ramps = [_lightness_ramp(color) for color in unique]
+        # Running maximum, so bisection is valid even where gamut mapping dips
+        rising = []
+        for _, _, luminances in ramps:
+            running, peak = [], 0.0
+            for luminance in luminances:
+                peak = max(peak, luminance)
+                running.append(peak)
+            rising.append(running)
+
+        found = []
+        for color, partner in zip(colors, partner_luminances):
+            lightness, ramp, luminances = ramps[row[color]]
+            darkest, lightest = _luminance_limits(partner, target)
+            darker = bisect.bisect_right(rising[row[color]], darkest) - 1
+            lighter = bisect.bisect_left(rising[row[color]], lightest)
+            options = [(abs(step / (RAMP_STEPS - 1) - lightness), step)
+                       for step in (darker, lighter) if 0 <= step < RAMP_STEPS]
+            if not options:
+                found.append(None)
+                continue
+            step = min(options)[1]
+            found.append(('#%02X%02X%02X' % ramp[step], luminance_contrast(luminances[step], partner)))
+        return found
+
+    lightness, ramps, luminances = _lightness_ramps_numpy(unique)
+    rows = np.array([row[color] for color in colors], dtype=np.intp)
+    step, ratios, found = _nearest_steps(lightness, luminances, rows, np.asarray(partner_luminances, dtype=float),
+                                         target)
+    return _format_found(ramps, rows, step, ratios, found)
+
+
+def _nearest_steps(lightness, luminances, rows, partners, target):
+    """
+    nearest_compliant() on arrays: ramp rows[k] against partners[k].
+
+    Returns:
+        (chosen ramp step, its contrast ratio, whether any step reaches the target)
+    """
+    darkest, lightest = _luminance_limits(partners, target)
+
+    # One sorted array of all ramps: ramp i is offset by 2 * i (luminance is in [0, 1])
+    offsets = 2.0 * np.arange(len(luminances))
+    rising = (np.maximum.accumulate(luminances, axis=1) + offsets[:, None]).ravel()
+    base = rows * RAMP_STEPS
+    darker = np.searchsorted(rising, darkest + offsets[rows], side='right') - 1 - base
+    lighter = np.searchsorted(rising, lightest + offsets[rows], side='left') - base
+
+    steps = np.arange(RAMP_STEPS) / (RAMP_STEPS - 1)
+    valid_darker = darker >= 0
+    valid_lighter = lighter < RAMP_STEPS
+    darker = np.clip(darker, 0, RAMP_STEPS - 1)
+    lighter = np.clip(lighter, 0, RAMP_STEPS - 1)
+    move_darker = np.where(valid_darker, np.abs(steps[darker] - lightness[rows]), np.inf)
+    move_lighter = np.where(valid_lighter, np.abs(steps[lighter] - lightness[rows]), np.inf)
+    step = np.where(move_darker <= move_lighter, darker, lighter)
+
+    luminance = luminances[rows, step]
+    ratios = (np.maximum(luminance, partners) + 0.05) / (np.minimum(luminance, partners) + 0.05)
+    return step, ratios, valid_darker | valid_lighter
+
+
+def _found_hexes(ramps, rows, step):
+    """Hex color (object array) of the ramp step each _nearest_steps() query stopped at."""
+    # Format each distinct ramp color once; queries often land on the same one
+    flat, inverse = np.unique(rows * RAMP_STEPS + step, return_inverse=True)
+    names = np.array(['#%02X%02X%02X' % tuple(rgb) for rgb in ramps.reshape(-1, 3)[flat].tolist()],
+                     dtype=object)
+    return names[inverse.ravel()]
+
+
+def _format_found(ramps, rows, step, ratios, found):
+    """Turn _nearest_steps() arrays into nearest_compliant() results."""
+    hexes = _found_hexes(ramps, rows, step).tolist()
+    return [(h, r) if ok else None for h, r, ok in zip(hexes, ratios.tolist(), found.tolist())]
+
+
+def suggest_improvements(color1, color2, results, target=4.5):
+    """Suggest the nearest colors that reach the target if contrast is insufficient."""
     ratio = results['ratio']
-    target = 4.5  # AA normal text requirement
+    if ratio >= target:
+        return  # Already compliant
 
     print("SUGGESTIONS FOR IMPROVEMENT:")
     print("-"*70)
 
+    lum1 = relative_luminance(hex_to_rgb(color1))
+    lum2 = relative_luminance(hex_to_rgb(color2))
+    foreground, background = nearest_compliant([color1, color2], [lum2, lum1], target)
+
+    print(f"Nearest colors of the same hue that reach {target}:1:")
+    if foreground:
+        print(f"  Foreground: {foreground[0]} on {color2.upper()}  ({foreground[1]:.2f}:1)")
+    else:
+        print(f"  Foreground: no lightness of this hue reaches {target}:1 on {color2.upper()}")
+    if background:
+        print(f"  Background: {color1.upper()} on {background[0]}  ({background[1]:.2f}:1)")
+    else:
+        print(f"  Background: no lightness of this hue reaches {target}:1 behind {color1.upper()}")
+
     if ratio < 3.0:
-        print("⚠ Contrast is very low. Consider these approaches:")
-        print("  1. Use a much darker foreground with this background")
-        print("  2. Use a much lighter background with this foreground")
-        print("  3. Add a contrasting border or outline")
-        print("  4. Use a completely different color palette")
-    elif ratio < 4.5:
-        print("⚠ Close to compliance. Small adjustments may help:")
-        print("  1. Darken the foreground color slightly")
-        print("  2. Lighten the background color slightly")
-        print("  3. Or adjust both for better contrast")
+        print("\n⚠ Contrast is very low; also consider a contrasting border or outline,")
+        print("  or a different color palette.")
 
     print("\nCommon approaches:")
     print("  • Dark text on light background (e.g., #333 on #fff)")
@@ -164,37 +707,1620 @@ def suggest_improvements(color1, color2, results):
     print()
 
 
+def parse_palette(text):
+    """
+    Parse a palette: one "[name] color" per line, or a JSON object of name -> color.
+
+    Blank lines and lines starting with // are skipped; the name may be
+    followed by a colon or comma and defaults to the color itself.
+
+    Returns:
+        List of (name, color) tuples
+
+    Raises:
+        ValueError: If a line has no valid hex color
+    """
+    if text.lstrip().startswith('{'):
+        try:
+            entries = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON palette: {e}")
+        lines = [(str(name), str(color)) for name, color in entries.items()]
+    else:
+        lines = []
+        for number, line in enumerate(text.splitlines(), 1):
+            line = line.strip()
+            if not line or line.startswith('//'):
+                continue
+            name, _, color = line.rpartition(' ')
+            name = name.strip().rstrip(':,').strip()
+            if not name and (',' in color or ':' in color):
+                name, color = re.split(r'[,:]', color, 1)
+            lines.append((name or color, color.strip() or f"line {number}"))
+
+    palette = []
+    for name, color in lines:
+        if not re.fullmatch(r'#?([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})', color):
+            raise ValueError(f"Invalid hex color for {name}: {color}")
+        palette.append((name, color))
+    return palette
+
+
+def read_palette(path):
+    """Read a palette file ("-" for stdin); see parse_palette()."""
+    if path == '-':
+        return parse_palette(sys.stdin.read())
+    try:
+        with open(path, encoding='utf-8') as f:
+            return parse_palette(f.read())
+    except OSError as e:
+        raise ValueError(f"Cannot read palette {path}: {e.strerror}")
+
+
+def flatten_palette(colors, base=WHITE):
+    """Opaque hex (#RRGGBB) of each color once translucent ones are composited over base."""
+    return ['#%02X%02X%02X' % composite(hex_to_rgba(color), base) for color in colors]
+
+
+def palette_luminances(colors):
+    """Relative luminance of each opaque color, parsing every color exactly once."""
+    if np is None:
+        return [relative_luminance(hex_to_rgb(color)) for color in colors]
+
+    rgb = np.array([hex_to_rgb(color) for color in colors], dtype=np.uint8).reshape(-1, 3)
+    linear = np.array(SRGB_TO_LINEAR)[rgb]
+    # Same operation order as relative_luminance(), so the results are identical
+    return 0.2126 * linear[:, 0] + 0.7152 * linear[:, 1] + 0.0722 * linear[:, 2]
+
+
+def contrast_matrix(luminances):
+    """
+    Contrast ratio of every pair of luminances.
+
+    Returns:
+        N x N array (list of lists without NumPy); the diagonal is 1.0
+    """
+    if np is None:
+        return [[luminance_contrast(a, b) for b in luminances] for a in luminances]
+
+    luminances = np.asarray(luminances, dtype=float)
+    lighter = np.maximum.outer(luminances, luminances)
+    darker = np.minimum.outer(luminances, luminances)
+    return (lighter + 0.05) / (darker + 0.05)
+
+
+def apca_matrix(colors):
+    """
+    APCA Lc of every pair of opaque colors: row i is color i as text on
+    color j as background, so unlike the WCAG matrix it is not symmetric.
+    """
+    ys = [apca_luminance(hex_to_rgb(color)) for color in colors]
+    if np is None:
+        return [[apca_contrast(text, background) for background in ys] for text in ys]
+
+    ys = np.asarray(ys, dtype=float)
+    return _apca_contrast_numpy(ys[:, None], ys[None, :])
+
+
+def contrast_grades(ratios):
+    """
+    WCAG grade of every pair: an index into GRADE_NAMES.
+
+    0 fails everything, 1 passes large text and UI components (3:1),
+    2 passes AA normal and AAA large text (4.5:1), 3 passes AAA (7:1).
+    """
+    if np is None:
+        return [[sum(ratio >= threshold for threshold in GRADE_THRESHOLDS) for ratio in row]
+                for row in ratios]
+
+    grades = np.zeros(ratios.shape, dtype=np.int8)
+    for threshold in GRADE_THRESHOLDS:
+        grades += ratios >= threshold
+    return grades
+
+
+def _ratio_cells(ratios):
+    """Ratios as strings truncated to two decimals, one list per row."""
+    # Every ratio lies in [1, 21], so 2101 preformatted strings (0.00-21.00) cover them all
+    text = [f"{hundredths / 100:.2f}" for hundredths in range(2101)]
+    # A ratio a hair under a threshold can round up to it when scaled;
+    # keep it below so the printed ratio never passes what the pair fails
+    limits = [round(threshold * 100) for threshold in GRADE_THRESHOLDS]
+
+    if np is None:
+        cells = []
+        for row in ratios:
+            codes = [int(ratio * 100) for ratio in row]
+            for limit, threshold in zip(limits, GRADE_THRESHOLDS):
+                codes = [code - (code == limit and ratio < threshold) for code, ratio in zip(codes, row)]
+            cells.append([text[code] for code in codes])
+        return cells
+
+    codes = (ratios * 100).astype(np.intp)
+    for limit, threshold in zip(limits, GRADE_THRESHOLDS):
+        codes -= (codes == limit) & (ratios < threshold)
+    return np.array(text, dtype=object)[codes].tolist()
+
+
+def _lc_rows(lcs):
+    """APCA Lc values rounded to one decimal, one list per row."""
+    if np is None:
+        return [[round(lc, 1) for lc in row] for row in lcs]
+    return np.round(lcs, 1).tolist()
+
+
+def write_palette_json(palette, rendered, luminances, ratios, grades, out, lcs=None):
+    """
+    Write the palette, contrast matrix and grade matrix as JSON.
+
+    Translucent colors also carry their "rendered" (composited) hex;
+    with lcs the APCA matrix is added as "apca" (rows are text colors).
+    """
+    colors = []
+    for (name, color), flat, lum in zip(palette, rendered, luminances):
+        entry = {'name': name, 'hex': '#' + color.lstrip('#').upper(), 'luminance': round(float(lum), 6)}
+        if hex_to_rgba(color)[3] < 1:
+            entry['rendered'] = flat
+        colors.append(entry)
+    grades = grades.tolist() if np is not None else grades
+
+    out.write('{\n  "thresholds": ' + json.dumps(dict(zip(GRADE_NAMES[1:], GRADE_THRESHOLDS))))
+    out.write(',\n  "grades": ' + json.dumps(list(GRADE_NAMES)))
+    out.write(',\n  "colors": ' + json.dumps(colors))
+    out.write(',\n  "ratios": [\n')
+    out.write(',\n'.join('    [' + ','.join(row) + ']' for row in _ratio_cells(ratios)))
+    out.write('\n  ],\n  "grade_matrix": [\n')
+    out.write(',\n'.join('    ' + json.dumps(row, separators=(',', ':')) for row in grades))
+    if lcs is not None:
+        out.write('\n  ],\n  "apca": [\n')
+        out.write(',\n'.join('    ' + json.dumps(row, separators=(',', ':')) for row in _lc_rows(lcs)))
+    out.write('\n  ]\n}\n')
+
+
+def write_palette_csv(palette, ratios, out, lcs=None):
+    """
+    Write the contrast matrix as CSV: a header of colors, then one row per
+    color. With lcs the APCA matrix is written instead (rows are text colors).
+    """
+    import csv
+
+    names = [name for name, _ in palette]
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(['color'] + names)
+    rows = _ratio_cells(ratios) if lcs is None else [[f"{lc:.1f}" for lc in row] for row in _lc_rows(lcs)]
+    for name, row in zip(names, rows):
+        writer.writerow([name] + row)
+
+
+def print_palette(palette, luminances, ratios, grades, lcs=None):
+    """Print a summary of every color's contrast against the rest of the palette."""
+    n = len(palette)
+    if np is not None:
+        ratios = ratios.copy()
+        np.fill_diagonal(ratios, 0.0)
+        best = ratios.argmax(axis=1).tolist()
+        best_ratio = ratios.max(axis=1).tolist()
+        passing = (grades >= 2).sum(axis=1).tolist()
+        counts = np.bincount(grades[np.triu_indices(n, 1)], minlength=len(GRADE_NAMES)).tolist()
+    else:
+        best, best_ratio, passing = [], [], []
+        counts = [0] * len(GRADE_NAMES)
+        for i, row in enumerate(ratios):
+            others = [(ratio, j) for j, ratio in enumerate(row) if j != i]
+            ratio, j = max(others, key=lambda other: (other[0], -other[1]))
+            best.append(j)
+            best_ratio.append(ratio)
+            passing.append(sum(grade >= 2 for j, grade in enumerate(grades[i]) if j != i))
+            for grade in grades[i][i + 1:]:
+                counts[grade] += 1
+
+    print("\n" + "="*70)
+    print("                    PALETTE CONTRAST MATRIX")
+    print("="*70)
+    print(f"\nColors: {n}    Pairs: {n * (n - 1) // 2}")
+    for grade in range(len(GRADE_NAMES) - 1, -1, -1):
+        label = GRADE_NAMES[grade] + (f" ({GRADE_THRESHOLDS[grade - 1]}:1)" if grade else "")
+        print(f"  {label:<24}{counts[grade]:>10} pairs")
+
+    print("\n" + "-"*70)
+    print(f"{'Color':<24} {'Hex':<9} {'Luminance':<10} {'AA pairs':<9} Best contrast")
+    print("-"*70)
+    for i, (name, color) in enumerate(palette):
+        print(f"{name[:24]:<24} {'#' + color.lstrip('#').upper():<9} {float(luminances[i]):<10.4f} "
+              f"{passing[i]:<9} {best_ratio[i]:.2f}:1 with {palette[best[i]][0]}")
+
+    if n <= MAX_PRINTED_MATRIX:
+        print("\n" + "-"*70)
+        print(" " * 12 + "".join(f"{name[:9]:>10}" for name, _ in palette))
+        for i, ((name, _), row) in enumerate(zip(palette, ratios)):
+            print(f"{name[:11]:<12}" + "".join(f"{ratio:>10.2f}" if i != j else f"{'-':>10}"
+                                               for j, ratio in enumerate(row)))
+
+    if lcs is not None:
+        print("\n" + "-"*70)
+        if n <= MAX_PRINTED_MATRIX:
+            print("APCA Lc (row = text, column = background)")
+            print(" " * 12 + "".join(f"{name[:9]:>10}" for name, _ in palette))
+            for i, ((name, _), row) in enumerate(zip(palette, _lc_rows(lcs))):
+                print(f"{name[:11]:<12}" + "".join(f"{lc:>10.1f}" if i != j else f"{'-':>10}"
+                                                   for j, lc in enumerate(row)))
+        else:
+            print("APCA Lc matrix: use --json or --csv for palettes over "
+                  f"{MAX_PRINTED_MATRIX} colors")
+
+    print("\n" + "="*70 + "\n")
+
+
+def _palette_fixes_numpy(colors, luminances, ratios, target):
+    """
+    Search both sides of every failing pair (i < j) of a palette.
+
+    Returns:
+        (first, second, ramps, rows, step, ratios, found): the pair
+        indices, then _lightness_ramps_numpy() ramps and the
+        _nearest_steps() results of the queries for every color i, then
+        for every color j
+    """
+    first, second = np.nonzero(np.triu(ratios < target, 1))
+    lightness, ramps, ramp_luminances = _lightness_ramps_numpy(colors)
+    # Adjust each side of a pair against the other one's luminance
+    rows = np.concatenate([first, second])
+    partners = np.concatenate([luminances[second], luminances[first]])
+    step, fix_ratios, found = _nearest_steps(lightness, ramp_luminances, rows, partners, target)
+    return first, second, ramps, rows, step, fix_ratios, found
+
+
+def palette_suggestions(palette, luminances, ratios, target, limit=None):
+    """
+    Nearest compliant colors for every pair of a palette below the target.
+
+    Args:
+        limit: Only build the first limit suggestions (all are still searched)
+
+    Returns:
+        (number of failing pairs, list of (i, j, ratio, fix for color i,
+        fix for color j) with i < j); each fix is a (hex color, ratio)
+        tuple or None (see nearest_compliant())
+    """
+    colors = [color for _, color in palette]
+    if np is None:
+        pairs = [(i, j) for i, row in enumerate(ratios) for j in range(i + 1, len(row)) if row[j] < target]
+        shown = pairs[:limit]
+        # Adjust each side of a pair against the other one's luminance
+        fixes = nearest_compliant([colors[i] for i, _ in shown] + [colors[j] for _, j in shown],
+                                  [luminances[j] for _, j in shown] + [luminances[i] for i, _ in shown], target)
+        n = len(shown)
+        return len(pairs), [(i, j, ratios[i][j], fixes[k], fixes[n + k]) for k, (i, j) in enumerate(shown)]
+
+    first, second, ramps, rows, step, fix_ratios, found = _palette_fixes_numpy(colors, luminances, ratios, target)
+    n = len(first)
+    shown = np.arange(n if limit is None else min(n, limit))
+    both = np.concatenate([shown, shown + n])
+    fixes = _format_found(ramps, rows[both], step[both], fix_ratios[both], found[both])
+    m = len(shown)
+    pair_ratios = ratios[first[shown], second[shown]].tolist()
+    return n, [(i, j, r, fixes[k], fixes[m + k])
+               for k, (i, j, r) in enumerate(zip(first[shown].tolist(), second[shown].tolist(), pair_ratios))]
+
+
+def suggestion_columns(palette, luminances, ratios, target):
+    """
+    Every palette suggestion as columns, for export.
+
+    Ratios are preformatted strings truncated to two decimals (see
+    _ratio_cells()), so a pair's ratio never prints as the target it
+    misses; a fix that was not found has '' as its color and ratio.
+
+    Returns:
+        (color i indices, color j indices, ratios, color i fixes, their
+        ratios, color j fixes, their ratios), each a list with one entry
+        per failing pair
+    """
+    if np is None:
+        _, suggestions = palette_suggestions(palette, luminances, ratios, target)
+        first = [i for i, _, _, _, _ in suggestions]
+        second = [j for _, j, _, _, _ in suggestions]
+        fixes = [fix for _, _, _, fix1, fix2 in suggestions for fix in (fix1, fix2)]
+        pair_ratios, fix_ratios = _ratio_cells([[ratio for _, _, ratio, _, _ in suggestions],
+                                                [fix[1] if fix else 1.0 for fix in fixes]])
+        hexes = [fix[0] if fix else '' for fix in fixes]
+        fix_ratios = [text if fix else '' for text, fix in zip(fix_ratios, fixes)]
+        return first, second, pair_ratios, hexes[0::2], fix_ratios[0::2], hexes[1::2], fix_ratios[1::2]
+
+    colors = [color for _, color in palette]
+    first, second, ramps, rows, step, fix_ratios, found = _palette_fixes_numpy(colors, luminances, ratios, target)
+    n = len(first)
+    if not n:
+        return [], [], [], [], [], [], []
+    pair_ratios, fix_ratios = _ratio_cells(np.stack([np.concatenate([ratios[first, second], np.ones(n)]),
+                                                     np.where(found, fix_ratios, 1.0)]))
+    hexes = np.where(found, _found_hexes(ramps, rows, step), '').tolist()
+    fix_ratios = np.where(found, np.array(fix_ratios, dtype=object), '').tolist()
+    return (first.tolist(), second.tolist(), pair_ratios[:n],
+            hexes[:n], fix_ratios[:n], hexes[n:], fix_ratios[n:])
+
+
+def write_suggestions_json(palette, columns, target, out):
+    """Write palette suggestions (suggestion_columns()) as JSON, one preformatted line per pair."""
+    names = [json.dumps(name) for name, _ in palette]
+
+    def fix(color, ratio):
+        return f'{{"hex": "{color}", "ratio": {ratio}}}' if color else 'null'
+
+    rows = (f'\n    {{"color1": {names[i]}, "color2": {names[j]}, "ratio": {ratio}, '
+            f'"color1_fix": {fix(hex1, ratio1)}, "color2_fix": {fix(hex2, ratio2)}}}'
+            for i, j, ratio, hex1, ratio1, hex2, ratio2 in zip(*columns))
+
+    out.write('{\n  "target": ' + json.dumps(target) + ',\n  "suggestions": [')
+    out.write(next(rows, ''))
+    out.writelines(',' + row for row in rows)
+    out.write('\n  ]\n}\n')
+
+
+def _csv_field(text):
+    """Quote a CSV field the way csv.writer does by default (only when needed)."""
+    if any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def write_suggestions_csv(palette, columns, out):
+    """Write palette suggestions (suggestion_columns()) as CSV, one row per failing pair."""
+    names = [_csv_field(name) for name, _ in palette]
+    out.write('color1,color2,ratio,color1_fix,color1_fix_ratio,color2_fix,color2_fix_ratio\n')
+    out.writelines(f"{names[i]},{names[j]},{ratio},{hex1},{ratio1},{hex2},{ratio2}\n"
+                   for i, j, ratio, hex1, ratio1, hex2, ratio2 in zip(*columns))
+
+
+def print_suggestions(palette, count, suggestions, target):
+    """Print the failing pairs of a palette with the nearest compliant colors."""
+    print("-"*70)
+    print(f"SUGGESTIONS: {count} pairs below {target}:1 (nearest colors of the same hue)")
+    print("-"*70)
+    if not suggestions:
+        print("✓ Every pair reaches the target.\n")
+        return
+
+    print(f"{'Color 1':<16} {'Color 2':<16} {'Ratio':<7} {'Fix color 1':<19} Fix color 2")
+    for i, j, ratio, fix1, fix2 in suggestions:
+        fixes = [f"{found[0]} ({found[1]:.2f})" if found else "none" for found in (fix1, fix2)]
+        print(f"{palette[i][0][:16]:<16} {palette[j][0][:16]:<16} {ratio:<7.2f} {fixes[0]:<19} {fixes[1]}")
+    if count > len(suggestions):
+        print(f"... and {count - len(suggestions)} more (use --json or --csv for all)")
+    print()
+
+
+def palette_main(args):
+    """
+    Check every pair of a palette:
+    --palette FILE [--suggest] [--apca] [--over COLOR] [--target LEVEL] [--json | --csv] [-o FILE].
+    """
+    path, output_format, output_file = None, None, None
+    suggest, apca, target, over = False, False, TARGETS['aa'], None
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--palette' and i + 1 < len(args):
+            path = args[i + 1]
+            i += 1
+        elif arg in ('-o', '--output') and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 1
+        elif arg == '--target' and i + 1 < len(args) and args[i + 1].lower() in TARGETS:
+            target = TARGETS[args[i + 1].lower()]
+            i += 1
+        elif arg == '--over' and i + 1 < len(args):
+            over = args[i + 1]
+            i += 1
+        elif arg == '--suggest':
+            suggest = True
+        elif arg == '--apca':
+            apca = True
+        elif arg in ('--json', '--csv') and output_format is None:
+            output_format = arg[2:]
+        else:
+            path = None
+            break
+        i += 1
+    if path is None:
+        print("Usage: python contrast-check.py --palette <file|-> [--suggest] [--apca] [--over COLOR] "
+              "[--target aa|aaa|ui] [--json | --csv] [-o FILE]", file=sys.stderr)
+        sys.exit(2)
+    _load_numpy()
+
+    try:
+        palette = read_palette(path)
+        if len(palette) < 2:
+            raise ValueError("A palette needs at least two colors")
+        base = flatten_layers([over]) if over else WHITE
+    except ValueError as e:
+        print(f"\nError: {e}", file=sys.stderr)
+        print("Please provide valid hex colors (e.g., #000000 or 000 or #fff)\n", file=sys.stderr)
+        sys.exit(2)
+
+    # Translucent colors are checked as they render over the base
+    rendered = flatten_palette([color for _, color in palette], base)
+    luminances = palette_luminances(rendered)
+    ratios = contrast_matrix(luminances)
+    grades = contrast_grades(ratios)
+    lcs = apca_matrix(rendered) if apca else None
+    flat = [(name, color) for (name, _), color in zip(palette, rendered)]
+
+    if output_format is None:
+        print_palette(palette, luminances, ratios, grades, lcs)
+        if suggest:
+            count, suggestions = palette_suggestions(flat, luminances, ratios, target, MAX_PRINTED_SUGGESTIONS)
+            print_suggestions(palette, count, suggestions, target)
+        return
+
+    if suggest:
+        columns = suggestion_columns(flat, luminances, ratios, target)
+
+    out = open(output_file, 'w', encoding='utf-8', newline='') if output_file else sys.stdout
+    try:
+        if suggest and output_format == 'json':
+            write_suggestions_json(palette, columns, target, out)
+        elif suggest:
+            write_suggestions_csv(palette, columns, out)
+        elif output_format == 'json':
+            write_palette_json(palette, rendered, luminances, ratios, grades, out, lcs)
+        else:
+            write_palette_csv(palette, ratios, out, lcs)
+    finally:
+        if output_file:
+            out.close()
+    if output_file:
+        what = "Suggestions" if suggest else "Contrast matrix"
+        print(f"✓ {what} for {len(palette)} colors exported to: {output_file}", file=sys.stderr)
+
+
+# A var() fallback, which may hold parentheses two levels deep: var(--a, var(--b, rgb(0 0 0)))
+_FALLBACK = r'(?:[^()]|\((?:[^()]|\([^()]*\))*\))*'
+# One color in a CSS value: hex, rgb()/rgba(), a token reference or a bare word
+_COLOR_TOKEN = re.compile(r'#[0-9a-fA-F]+\b|rgba?\([^)]*\)|var\(\s*--[\w-]+\s*(?:,' + _FALLBACK + r')?\)'
+                          r'|\$[\w-]+|@[\w-]+|\{[\w.-]+\}|[a-zA-Z][\w-]*\(|\b[a-zA-Z]+\b')
+_URL = re.compile(r'url\([^)]*\)', re.I)
+# Quoted strings, url() and comments, matched left to right so that a // or
+# /* inside a string or URL (url(//cdn.example.com/x.png)) is not a comment
+_BLANKED = r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\'|url\([^)]*\)|/\*.*?\*/'
+_CSS_BLANKED = re.compile(_BLANKED, re.S | re.I)
+# SCSS and LESS also have // line comments; plain CSS does not
+_SCSS_BLANKED = re.compile(_BLANKED + r'|//[^\n]*', re.S | re.I)
+_CSS_PART = re.compile(r'([^{};]*)([{};])')
+_PROPERTY = re.compile(r'(--[\w-]+|\$[\w-]+|@[\w-]+|[a-zA-Z-]+)$')
+
+# Values that are valid colors but cannot be checked as one
+_UNCHECKABLE = ('transparent', 'currentcolor', 'inherit', 'initial', 'unset', 'revert')
+
+
+def _parse_rgb(function):
+    """Parse rgb()/rgba() to 'RRGGBB', or 'RRGGBBAA' if alpha < 1; None if malformed."""
+    parts = [part for part in re.split(r'[\s,/]+', function[function.index('(') + 1:-1]) if part]
+    if len(parts) not in (3, 4):
+        return None
+    try:
+        channels = [float(part[:-1]) * 2.55 if part.endswith('%') else float(part) for part in parts[:3]]
+        if len(parts) == 4:
+            alpha = float(parts[3][:-1]) / 100 if parts[3].endswith('%') else float(parts[3])
+            if alpha < 1:
+                channels.append(max(0.0, alpha) * 255)
+    except ValueError:
+        return None
+    return ''.join('%02X' % min(255, max(0, int(round(c)))) for c in channels)
+
+
+def hex_to_rgb_string(hex_color):
+    """Normalize a 3-, 4-, 6- or 8-digit hex color to 'RRGGBB', or 'RRGGBBAA' if translucent."""
+    r, g, b, alpha = hex_to_rgba(hex_color)
+    if alpha < 1:
+        return '%02X%02X%02X%02X' % (r, g, b, int(round(alpha * 255)))
+    return '%02X%02X%02X' % (r, g, b)
+
+
+def color_reference(value):
+    """
+    Find the color in a CSS, SCSS, LESS or token value.
+
+    Returns:
+        ('hex', 'RRGGBB' or 'RRGGBBAA'), ('ref', token name, color_reference() of the
+        fallback or None), ('unsupported', reason), or None if the value
+        names no color
+    """
+    value = _URL.sub(' ', value)
+    for match in _COLOR_TOKEN.finditer(value):
+        token = match.group(0)
+        lower = token.lower()
+        if token[0] == '#':
+            if len(token) in (4, 5, 7, 9):
+                return ('hex', hex_to_rgb_string(token))
+            return ('unsupported', f"hex color {token}")
+        if lower.startswith(('rgb(', 'rgba(')):
+            rgb = _parse_rgb(token)
+            return ('hex', rgb) if rgb else ('unsupported', f"malformed {token}")
+        if lower.startswith('var('):
+            name, _, fallback = token[4:-1].partition(',')
+            return ('ref', name.strip(), color_reference(fallback) if fallback.strip() else None)
+        if token[0] in '$@':
+            return ('ref', token, None)
+        if token[0] == '{':
+            name = token[1:-1]
+            return ('ref', name[:-len('.value')] if name.endswith('.value') else name, None)
+        if token.endswith('('):
+            return ('unsupported', f"{token}...)")
+        if lower in NAMED_COLORS:
+            return ('hex', NAMED_COLORS[lower])
+        if lower in _UNCHECKABLE:
+            return ('unsupported', lower)
+    return None
+
+
+def _blank(match):
+    """Replacement for a _BLANKED match: an empty string literal or a space, plus its newlines."""
+    token = match.group(0)
+    return ('""' if token[0] in '"\'' else ' ') + '\n' * token.count('\n')
+
+
+def _extract_stylesheet(text, line_comments=False):
+    """
+    Token definitions and color/background rule pairs of a CSS, SCSS or
+    LESS file; line_comments strips // comments (SCSS and LESS).
+    """
+    # Blank out strings, url() and comments, keeping line numbers
+    text = (_SCSS_BLANKED if line_comments else _CSS_BLANKED).sub(_blank, text)
+
+    definitions, rules = [], []
+    blocks = []
+    line = 1
+    for match in _CSS_PART.finditer(text):
+        chunk, delimiter = match.groups()
+        start = line + chunk[:len(chunk) - len(chunk.lstrip())].count('\n')
+        line += chunk.count('\n')
+        chunk = chunk.strip()
+
+        if delimiter == '{':
+            blocks.append({'selector': ' '.join(chunk.split()), 'line': start})
+            continue
+
+        name, colon, value = chunk.partition(':')
+        name = name.strip()
+        if colon and _PROPERTY.match(name):
+            value = value.strip()
+            if name[0] in '-$@':
+                definitions.append((name, value, start, color_reference(value)))
+            elif blocks and name.lower() == 'color':
+                blocks[-1]['color'] = value
+            elif blocks and name.lower() in ('background', 'background-color'):
+                blocks[-1]['background'] = value
+
+        if delimiter == '}' and blocks:
+            block = blocks.pop()
+            if 'color' in block and 'background' in block:
+                rules.append((block['line'], block['selector'], block['color'], block['background'],
+                              color_reference(block['color']), color_reference(block['background'])))
+    return {'definitions': definitions, 'rules': rules, 'aliases': []}
+
+
+def _extract_tokens(text):
+    """Token definitions of a JSON design-token file (nested groups, "value"/"$value" leaves)."""
+    definitions, aliases = [], []
+
+    def walk(node, path):
+        if isinstance(node, dict):
+            leaf = node.get('$value', node.get('value'))
+            if isinstance(leaf, str) and path:
+                walk(leaf, path)
+                return
+            for key, child in node.items():
+                if not key.startswith('$'):
+                    walk(child, path + [str(key)])
+        elif isinstance(node, str) and path:
+            name = '.'.join(path)
+            definitions.append((name, node, None, color_reference(node)))
+            # The CSS and SCSS variables a token build would generate
+            dashed = '-'.join(path)
+            aliases.append(('--' + dashed, name))
+            aliases.append(('$' + dashed, name))
+
+    walk(json.loads(text), [])
+    return {'definitions': definitions, 'rules': [], 'aliases': aliases}
+
+
+def scan_file(path):
+    """
+    Extract the colors a stylesheet or token file declares.
+
+    Values are parsed with color_reference() here, so cached extractions
+    only need their references resolved.
+
+    Returns:
+        (content hash, extraction dict with definitions (name, value, line,
+        parsed value), rules (line, selector, color, background and both
+        parsed), aliases and possibly error); the hash is None if the file
+        could not be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return None, {'definitions': [], 'rules': [], 'aliases': [], 'error': e.strerror}
+
+    digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+    text = data.decode('utf-8', errors='replace')
+    try:
+        if path.lower().endswith('.json'):
+            return digest, _extract_tokens(text)
+        return digest, _extract_stylesheet(text, path.lower().endswith(('.scss', '.less')))
+    except (ValueError, RecursionError) as e:
+        return digest, {'definitions': [], 'rules': [], 'aliases': [], 'error': f"not a token file ({e})"}
+
+
+def find_style_files(paths):
+    """
+    Expand command-line paths into stylesheet and token files.
+
+    Files are used as given; directories are searched recursively for
+    SCAN_EXTENSIONS, skipping hidden directories and SCAN_SKIP_DIRS.
+    """
+    found, seen = [], set()
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = []
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in SCAN_SKIP_DIRS)
+                candidates.extend(os.path.join(root, name) for name in sorted(files)
+                                  if name.lower().endswith(SCAN_EXTENSIONS))
+        else:
+            candidates = [path]
+        for candidate in candidates:
+            if candidate not in seen:
+                seen.add(candidate)
+                found.append(candidate)
+    return found
+
+
+def scan_cache_path(paths):
+    """Cache file for a scan of these paths ($BMAD_CACHE_DIR or ~/.cache/bmad/contrast-scan)."""
+    if os.environ.get('BMAD_CACHE_DIR'):
+        directory = os.environ['BMAD_CACHE_DIR']
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        directory = os.path.join(base, 'bmad', 'contrast-scan')
+    key = repr(sorted(os.path.abspath(path) for path in paths)).encode('utf-8')
+    return os.path.join(directory, 'scan-' + hashlib.blake2b(key, digest_size=16).hexdigest() + '.pickle')
+
+
+def _load_scan_cache(cache_path):
+    """Return {content hash: extraction}; unreadable or outdated caches are empty."""
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+        return cache['entries'] if cache.get('version') == SCAN_CACHE_VERSION else {}
+    except Exception:
+        return {}
+
+
+def _save_scan_cache(cache_path, entries):
+    """Atomically replace the cache with the given entries. Failures are ignored."""
+    import tempfile
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump({'version': SCAN_CACHE_VERSION, 'entries': entries}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception:
+        pass
+
+
+def extract_files(files, workers=None, cache_path=None):
+    """
+    Extract every file, reusing cached extractions of unchanged content.
+
+    Files whose content hash is not in the cache are extracted in a
+    process pool. The cache is rewritten to hold exactly these files
+    (only when that changes it).
+
+    Returns:
+        (list of extraction dicts in file order, number served from the cache)
+    """
+    cached = _load_scan_cache(cache_path) if cache_path else {}
+    results = [None] * len(files)
+    digests = [None] * len(files)
+    misses = []
+    for i, path in enumerate(files):
+        if cached:
+            try:
+                with open(path, 'rb') as f:
+                    digests[i] = hashlib.blake2b(f.read(), digest_size=20).hexdigest()
+            except OSError:
+                pass
+        if digests[i] in cached:
+            results[i] = cached[digests[i]]
+        else:
+            misses.append(i)
+
+    workers = workers or os.cpu_count() or 1
+    paths = [files[i] for i in misses]
+    if workers > 1 and len(paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor  # imported only when a pool is used
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+            extracted = list(pool.map(scan_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    else:
+        extracted = [scan_file(path) for path in paths]
+    for i, (digest, extraction) in zip(misses, extracted):
+        digests[i], results[i] = digest, extraction
+
+    if cache_path:
+        entries = {digest: result for digest, result in zip(digests, results) if digest is not None}
+        if entries.keys() != cached.keys():
+            _save_scan_cache(cache_path, entries)
+    return results, len(files) - len(misses)
+
+
+def _token_pairs(names):
+    """(foreground token, background token) pairs declared by naming convention."""
+    defined = set(names)
+    pairs = []
+    for name in names:
+        # on-X is drawn on X (Material style): --color-on-primary / --color-primary
+        at = name.find('on-')
+        if at >= 0 and (at == 0 or name[at - 1] in '-.$@'):
+            background = name[:at] + name[at + len('on-'):]
+            if background in defined:
+                pairs.append((name, background))
+        # X-fg on X-bg, X.foreground on X.background, ...
+        for foreground, background in TOKEN_PAIR_SUFFIXES:
+            if name.endswith(('-' + foreground, '.' + foreground)):
+                background = name[:-len(foreground)] + background
+                if background in defined:
+                    pairs.append((name, background))
+    return pairs
+
+
+class TokenResolver:
+    """Resolve token references across all scanned files (later definitions win)."""
+
+    def __init__(self, extractions, files):
+        self.definitions = {}
+        self.aliases = {}
+        for path, extraction in zip(files, extractions):
+            for name, value, line, parsed in extraction['definitions']:
+                self.definitions[name] = (value, path, line, parsed)
+            for alias, name in extraction['aliases']:
+                self.aliases[alias] = name
+        self._memo = {}
+
+    def resolve_value(self, value, parsed, depth=0):
+        """
+        Resolve a value, already parsed by color_reference(), to a color.
+
+        Returns:
+            ('RRGGBB' or 'RRGGBBAA', None) or (None, reason)
+        """
+        if parsed is None:
+            return None, f"no color in '{value}'"
+        if parsed[0] == 'hex':
+            return parsed[1], None
+        if parsed[0] == 'unsupported':
+            return None, parsed[1]
+
+        _, name, fallback = parsed
+        color, reason = self.resolve(name, depth + 1)
+        if color is None and fallback:
+            return self.resolve_value(value, fallback, depth + 1)
+        return color, reason
+
+    def resolve(self, name, depth=0):
+        """Resolve a token name; see resolve_value()."""
+        if name in self._memo:
+            return self._memo[name]
+        if depth > MAX_REFERENCE_DEPTH:
+            return None, f"circular reference through {name}"
+        target = name if name in self.definitions else self.aliases.get(name)
+        if target is None:
+            result = (None, f"undefined {name}")
+        else:
+            value, _, _, parsed = self.definitions[target]
+            result = self.resolve_value(value, parsed, depth)
+        if depth == 0 or result[0] is not None:
+            self._memo[name] = result
+        return result
+
+
+def scan_contrast(paths, target=4.5, workers=None, use_cache=True, base=WHITE):
+    """
+    Check every declared foreground/background pair under the given paths.
+
+    Pairs come from CSS/SCSS/LESS rules that set both color and a
+    background, and from tokens named as pairs (on-X on X, X-fg on X-bg,
+    X-foreground on X-background) in stylesheets and JSON token files.
+    Token references (var(), $, @ and {a.b}) are resolved across files.
+    Translucent backgrounds are composited over base, and translucent
+    text over the result, before the ratio and APCA Lc are computed.
+
+    Returns:
+        Dict with files, cached (files served from the cache), errors,
+        pairs (each with path, line, kind, subject, foreground, background,
+        hex colors, ratio, apca and passes) and unresolved (path, line,
+        subject, reason)
+    """
+    files = find_style_files(paths)
+    extractions, cached = extract_files(files, workers, scan_cache_path(paths) if use_cache else None)
+    resolver = TokenResolver(extractions, files)
+
+    checks, unresolved = [], []
+
+    def check(path, line, kind, subject, foreground, background, fg_parsed, bg_parsed):
+        fg, fg_reason = resolver.resolve_value(foreground, fg_parsed)
+        bg, bg_reason = resolver.resolve_value(background, bg_parsed)
+        if fg is None or bg is None:
+            reason = f"foreground: {fg_reason}" if fg is None else f"background: {bg_reason}"
+            unresolved.append({'path': path, 'line': line, 'subject': subject, 'reason': reason})
+        else:
+            checks.append({'path': path, 'line': line, 'kind': kind, 'subject': subject,
+                           'foreground': foreground, 'background': background,
+                           'foreground_hex': '#' + fg, 'background_hex': '#' + bg})
+
+    errors = []
+    for path, extraction in zip(files, extractions):
+        if 'error' in extraction:
+            errors.append({'path': path, 'error': extraction['error']})
+        for line, selector, color, background, color_parsed, background_parsed in extraction['rules']:
+            check(path, line, 'rule', selector, color, background, color_parsed, background_parsed)
+        names = [definition[0] for definition in extraction['definitions']]
+        for fg_name, bg_name in _token_pairs(names):
+            if resolver.definitions[fg_name][1] != path:
+                continue  # redefined in a later file, checked there
+            line = resolver.definitions[fg_name][2]
+            check(path, line, 'tokens', f"{fg_name} on {bg_name}", fg_name, bg_name,
+                  ('ref', fg_name, None), ('ref', bg_name, None))
+
+    if checks:
+        rgba = {color: hex_to_rgba(color) for color in
+                {c['foreground_hex'] for c in checks} | {c['background_hex'] for c in checks}}
+        ratios, lcs = pair_contrast([rgba[c['foreground_hex']] for c in checks],
+                                    [rgba[c['background_hex']] for c in checks], base)
+        for c, ratio, lc in zip(checks, ratios, lcs):
+            c['ratio'] = ratio
+            c['apca'] = round(lc, 1)
+            c['passes'] = ratio >= target
+
+    return {'target': target, 'files': len(files), 'cached': cached, 'errors': errors,
+            'pairs': checks, 'unresolved': unresolved}
+
+
+def _location(item):
+    return f"{item['path']}:{item['line']}" if item['line'] else item['path']
+
+
+def print_scan(result):
+    """Print a scan summary with the failing and unresolved pairs."""
+    failing = [c for c in result['pairs'] if not c['passes']]
+    print("\n" + "="*70)
+    print("                    STYLESHEET CONTRAST SCAN")
+    print("="*70)
+    print(f"\nFiles: {result['files']} ({result['cached']} unchanged, from cache)")
+    print(f"Pairs checked: {len(result['pairs'])}    Below {result['target']}:1: {len(failing)}    "
+          f"Unresolved: {len(result['unresolved'])}")
+
+    if failing:
+        print("\n" + "-"*70)
+        print("FAILING PAIRS:")
+        print("-"*70)
+        for c in failing[:MAX_PRINTED_FINDINGS]:
+            print(f"✗ {_location(c)}  {c['subject']}")
+            print(f"    {c['foreground_hex']} on {c['background_hex']}  {c['ratio']:.2f}:1  Lc {c['apca']:.1f}")
+        if len(failing) > MAX_PRINTED_FINDINGS:
+            print(f"... and {len(failing) - MAX_PRINTED_FINDINGS} more (use --json or --csv for all)")
+
+    if result['unresolved']:
+        print("\n" + "-"*70)
+        print("UNRESOLVED (not checked):")
+        print("-"*70)
+        for item in result['unresolved'][:MAX_PRINTED_FINDINGS]:
+            print(f"? {_location(item)}  {item['subject']}: {item['reason']}")
+        if len(result['unresolved']) > MAX_PRINTED_FINDINGS:
+            print(f"... and {len(result['unresolved']) - MAX_PRINTED_FINDINGS} more")
+
+    for error in result['errors']:
+        print(f"⚠ {error['path']}: {error['error']}")
+
+    if not failing:
+        print(f"\n✓ Every checked pair reaches {result['target']}:1.")
+    print("\n" + "="*70 + "\n")
+
+
+def write_scan_csv(result, out):
+    """Write every checked pair as CSV."""
+    import csv
+
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(['path', 'line', 'kind', 'subject', 'foreground', 'background',
+                     'foreground_hex', 'background_hex', 'ratio', 'apca', 'passes'])
+    for c in result['pairs']:
+        writer.writerow([c['path'], c['line'] or '', c['kind'], c['subject'], c['foreground'], c['background'],
+                         c['foreground_hex'], c['background_hex'], f"{c['ratio']:.2f}", f"{c['apca']:.1f}",
+                         c['passes']])
+
+
+def scan_main(args):
+    """
+    Scan stylesheets and tokens:
+    --scan PATH... [--target LEVEL] [--over COLOR] [--json | --csv] [-o FILE] [-w N] [--no-cache].
+    """
+    paths, output_format, output_file = [], None, None
+    target, workers, use_cache, over = TARGETS['aa'], None, True, None
+    i = 0
+    usage = False
+    while i < len(args):
+        arg = args[i]
+        if arg == '--scan':
+            pass
+        elif arg in ('-o', '--output') and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 1
+        elif arg == '--target' and i + 1 < len(args) and args[i + 1].lower() in TARGETS:
+            target = TARGETS[args[i + 1].lower()]
+            i += 1
+        elif arg in ('-w', '--workers') and i + 1 < len(args) and args[i + 1].isdigit() and int(args[i + 1]) > 0:
+            workers = int(args[i + 1])
+            i += 1
+        elif arg == '--over' and i + 1 < len(args):
+            over = args[i + 1]
+            i += 1
+        elif arg == '--no-cache':
+            use_cache = False
+        elif arg in ('--json', '--csv') and output_format is None:
+            output_format = arg[2:]
+        elif not arg.startswith('-'):
+            paths.append(arg)
+        else:
+            usage = True
+            break
+        i += 1
+    if usage or not paths:
+        print("Usage: python contrast-check.py --scan <path>... [--target aa|aaa|ui] [--over COLOR] "
+              "[--json | --csv] [-o FILE] [--workers N] [--no-cache]", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        base = flatten_layers([over]) if over else WHITE
+    except ValueError as e:
+        print(f"\nError: {e}\n", file=sys.stderr)
+        sys.exit(2)
+
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        print(f"\nError: Path not found: {', '.join(missing)}\n", file=sys.stderr)
+        sys.exit(2)
+
+    _load_numpy()
+    result = scan_contrast(paths, target, workers, use_cache, base)
+
+    if output_format is None:
+        print_scan(result)
+    else:
+        out = open(output_file, 'w', encoding='utf-8', newline='') if output_file else sys.stdout
+        try:
+            if output_format == 'json':
+                json.dump(result, out, indent=2)
+                out.write('\n')
+            else:
+                write_scan_csv(result, out)
+        finally:
+            if output_file:
+                out.close()
+        if output_file:
+            print(f"✓ Scan of {result['files']} files exported to: {output_file}", file=sys.stderr)
+
+    # Exit code: 0 if every checked pair reaches the target, 1 if not
+    sys.exit(0 if all(c['passes'] for c in result['pairs']) else 1)
+
+
+class Raster:
+    """
+    Decoded pixel rows, left in the buffer that holds them (the mmap of a
+    PPM/PGM file, or the inflated data of a PNG): row y starts at
+    offset + y * stride and holds width pixels of channels samples.
+    16-bit samples are big-endian, so their first byte is the 8-bit value.
+    """
+
+    def __init__(self, buffer, width, height, channels, offset, stride, sample_bytes=1, palette=None):
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.offset = offset
+        self.stride = stride
+        self.sample_bytes = sample_bytes
+        # Opaque (r, g, b) of each palette index, for PNG color type 3
+        self.palette = palette
+
+    def array(self):
+        """The pixels as a (height, width, channels) uint8 NumPy view of the buffer (no copy)."""
+        return np.ndarray((self.height, self.width, self.channels), dtype=np.uint8, buffer=self.buffer,
+                          offset=self.offset,
+                          strides=(self.stride, self.channels * self.sample_bytes, self.sample_bytes))
+
+
+# One header field of a binary PNM file, after whitespace and comments
+_PNM_FIELD = re.compile(rb'(?:\s|#[^\n]*\n)*(\d+)')
+
+
+def read_pnm(data):
+    """Read a binary PPM (P6) or PGM (P5) image in place; see Raster."""
+    channels = 3 if data[:2] == b'P6' else 1
+    fields, pos = [], 2
+    for _ in range(3):
+        match = _PNM_FIELD.match(data, pos)
+        if not match:
+            raise ValueError("Malformed PPM/PGM header")
+        fields.append(int(match.group(1)))
+        pos = match.end()
+    width, height, maxval = fields
+    if maxval not in (255, 65535):
+        raise ValueError(f"PPM/PGM maximum value {maxval} is not supported (255 or 65535 only)")
+
+    # A single whitespace character separates the header from the pixels
+    sample_bytes = 1 if maxval == 255 else 2
+    offset = pos + 1
+    stride = width * channels * sample_bytes
+    if width == 0 or height == 0 or offset + stride * height > len(data):
+        raise ValueError("PPM/PGM pixel data is truncated")
+    return Raster(data, width, height, channels, offset, stride, sample_bytes)
+
+
+def read_png(data):
+    """
+    Decode a non-interlaced 8- or 16-bit PNG with zlib; see Raster.
+
+    IDAT chunks are inflated straight from the mapped file into one
+    buffer, and the scanline filters are undone in place.
+    """
+    import struct
+    import zlib
+
+    header, palette, alpha, inflate = None, None, None, zlib.decompressobj()
+    raw, filled = None, 0
+    view = memoryview(data)
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack('>I4s', view[pos:pos + 8])
+        body = view[pos + 8:pos + 8 + length]
+        pos += length + 12
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+            width, height, depth, color_type, _, _, interlace = header
+            if color_type not in PNG_CHANNELS:
+                raise ValueError(f"Unknown PNG color type {color_type}")
+            if depth not in (8, 16) or (color_type == 3 and depth != 8):
+                raise ValueError(f"PNG bit depth {depth} is not supported (8 or 16 only)")
+            if interlace:
+                raise ValueError("Interlaced PNG is not supported")
+            channels = PNG_CHANNELS[color_type]
+            bpp = channels * depth // 8
+            raw = bytearray(height * (width * bpp + 1))
+        elif kind == b'PLTE':
+            palette = [tuple(body[i:i + 3]) for i in range(0, len(body) - 2, 3)]
+        elif kind == b'tRNS':
+            alpha = bytes(body)
+        elif kind == b'IDAT':
+            if raw is None:
+                raise ValueError("PNG image data before its header")
+            chunk = inflate.decompress(body, len(raw) - filled)
+            raw[filled:filled + len(chunk)] = chunk
+            filled += len(chunk)
+        elif kind == b'IEND':
+            break
+    if raw is None or filled != len(raw):
+        raise ValueError("PNG image data is missing or truncated")
+
+    if color_type == 3:
+        if palette is None:
+            raise ValueError("PNG palette is missing")
+        # Composite translucent palette entries once, instead of every pixel
+        alpha = alpha or b''
+        palette = [composite(rgb + ((alpha[i] if i < len(alpha) else 255) / 255,), WHITE)
+                   for i, rgb in enumerate(palette)]
+        palette += [(0, 0, 0)] * (256 - len(palette))
+
+    row_bytes = width * bpp
+    (_unfilter_numpy if np is not None else _unfilter)(raw, height, row_bytes, bpp)
+    return Raster(raw, width, height, channels, 1, row_bytes + 1, depth // 8, palette if color_type == 3 else None)
+
+
+def _paeth(a, b, c):
+    """PNG Paeth predictor of one byte from its left, upper and upper-left neighbors."""
+    pa, pb, pc = abs(b - c), abs(a - c), abs(a + b - 2 * c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def _unfilter(raw, height, row_bytes, bpp):
+    """Undo PNG scanline filters in place, one byte at a time."""
+    stride = row_bytes + 1
+    prior = bytearray(row_bytes)
+    for y in range(height):
+        start = y * stride + 1
+        kind, row = raw[start - 1], raw[start:start + row_bytes]
+        if kind == 1:
+            for i in range(bpp, row_bytes):
+                row[i] = (row[i] + row[i - bpp]) & 255
+        elif kind == 2:
+            row = bytearray((x + up) & 255 for x, up in zip(row, prior))
+        elif kind == 3:
+            for i in range(row_bytes):
+                row[i] = (row[i] + (((row[i - bpp] if i >= bpp else 0) + prior[i]) >> 1)) & 255
+        elif kind == 4:
+            for i in range(row_bytes):
+                if i >= bpp:
+                    row[i] = (row[i] + _paeth(row[i - bpp], prior[i], prior[i - bpp])) & 255
+                else:
+                    row[i] = (row[i] + prior[i]) & 255
+        elif kind:
+            raise ValueError(f"Unknown PNG filter type {kind}")
+        raw[start:start + row_bytes] = row
+        prior = row
+
+
+def _unfilter_numpy(raw, height, row_bytes, bpp):
+    """
+    _unfilter() with NumPy, in place.
+
+    None, Sub and Up rows are undone a row at a time (Sub as a wrapping
+    cumulative sum). Average and Paeth depend on the left pixel as well,
+    so images using them are undone one anti-diagonal of pixels at a
+    time: every pixel on it only needs pixels of earlier diagonals.
+    """
+    stride = row_bytes + 1
+    flat = np.frombuffer(raw, dtype=np.uint8)
+    kinds = flat[::stride].copy()
+    if kinds.max() > 4:
+        raise ValueError(f"Unknown PNG filter type {kinds.max()}")
+    width = row_bytes // bpp
+
+    if kinds.max() < 3:
+        pixels = flat.reshape(height, stride)[:, 1:].reshape(height, width, bpp)
+        for y, kind in enumerate(kinds.tolist()):
+            if kind == 1:
+                np.cumsum(pixels[y], axis=0, dtype=np.uint8, out=pixels[y])
+            elif kind == 2 and y:
+                pixels[y] += pixels[y - 1]
+        return
+
+    # The first row and column lack neighbors on one side; undo them byte
+    # by byte, so the diagonals below only cover pixels with all three
+    _unfilter(raw, 1, row_bytes, bpp)
+    for y in range(1, height):
+        kind = raw[y * stride]
+        for i in range(y * stride + 1, y * stride + 1 + bpp):
+            up = raw[i - stride]
+            raw[i] = (raw[i] + (up >> 1 if kind == 3 else up if kind in (2, 4) else 0)) & 255
+
+    used = set(kinds[1:].tolist())
+    row_starts = np.arange(height) * (stride - bpp) + 1
+    # Offsets of a byte and of its left, upper and upper-left neighbors
+    neighbors = np.array([0, bpp, stride, stride + bpp])[:, None, None]
+    channels = np.arange(bpp)
+    for d in range(2, height + width - 1):
+        ys = np.arange(max(1, d - width + 1), min(height - 1, d - 1) + 1)
+        at = (row_starts[ys] + d * bpp)[:, None] + channels
+        current, a, b, c = flat[at - neighbors].astype(np.int16)
+        if used == {4}:
+            kind = None
+        else:
+            kind = kinds[ys][:, None]
+            predicted = np.where(kind == 1, a, 0) + np.where(kind == 2, b, 0)
+            if 3 in used:
+                predicted += np.where(kind == 3, (a + b) >> 1, 0)
+        if 4 in used:
+            pa, pb, pc = np.abs(b - c), np.abs(a - c), np.abs(a + b - 2 * c)
+            paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+            predicted = paeth if kind is None else predicted + np.where(kind == 4, paeth, 0)
+        flat[at] = (current + predicted) & 255
+
+
+def read_screenshot(path):
+    """
+    Memory-map a PNG or binary PPM/PGM screenshot and return its Raster.
+
+    PPM/PGM pixels are read straight from the mapping; a PNG is inflated
+    into one buffer (its pixels are compressed in the file).
+    """
+    import mmap
+
+    try:
+        with open(path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError as e:
+        raise ValueError(f"Cannot read screenshot {path}: {e.strerror}")
+    except ValueError:
+        raise ValueError(f"Screenshot {path} is empty")
+
+    if data[:len(PNG_SIGNATURE)] == PNG_SIGNATURE:
+        return read_png(data)
+    if data[:2] in (b'P5', b'P6'):
+        return read_pnm(data)
+    raise ValueError(f"{path} is not a PNG or binary PPM/PGM image")
+
+
+def _band_rgb_numpy(raster, band):
+    """Opaque r, g and b arrays of a (rows, width, channels) band, alpha composited over white."""
+    if raster.palette is not None:
+        rgb = np.array(raster.palette, dtype=np.uint8)[band[..., 0]]
+        return rgb[..., 0], rgb[..., 1], rgb[..., 2]
+
+    colors = [band[..., k] for k in range(3)] if raster.channels >= 3 else [band[..., 0]] * 3
+    if raster.channels in (2, 4):
+        alpha = band[..., -1] / 255
+        # Same operation order as composite(), so the results are identical
+        colors = [np.rint(alpha * c + (1 - alpha) * 255).astype(np.uint8) for c in colors]
+    return colors
+
+
+def _pixel_rgb(raster, key):
+    """Opaque (r, g, b) of one pixel given as its tuple of samples; see _band_rgb_numpy()."""
+    if raster.palette is not None:
+        return raster.palette[key[0]]
+    rgb = key[:3] if raster.channels >= 3 else key[:1] * 3
+    if raster.channels in (2, 4):
+        return composite(rgb + (key[-1] / 255,), WHITE)
+    return rgb
+
+
+def tile_histograms(raster, tile=SCREENSHOT_TILE):
+    """
+    Pixel count and r, g, b sums of every luma bin of every tile.
+
+    Returns:
+        (counts, sums): rows x columns x LUMA_BINS counts, and
+        rows x columns x LUMA_BINS x 3 channel sums (NumPy arrays, or
+        nested lists without NumPy)
+    """
+    width, height = raster.width, raster.height
+    columns, rows = -(-width // tile), -(-height // tile)
+
+    if np is not None:
+        pixels = raster.array()
+        size = columns * LUMA_BINS
+        # First histogram slot of each pixel's tile column
+        first_bin = np.repeat(np.arange(columns) * LUMA_BINS, tile)[:width]
+        counts = np.empty((rows, size))
+        sums = np.empty((rows, 3, size))
+        for row in range(rows):
+            r, g, b = _band_rgb_numpy(raster, pixels[row * tile:(row + 1) * tile])
+            luma = 54 * r.astype(np.int32) + 183 * g.astype(np.int32) + 19 * b.astype(np.int32)
+            index = (first_bin + (luma * LUMA_BINS >> 16)).ravel()
+            counts[row] = np.bincount(index, minlength=size)
+            for k, channel in enumerate((r, g, b)):
+                sums[row, k] = np.bincount(index, weights=channel.ravel(), minlength=size)
+        return (counts.reshape(rows, columns, LUMA_BINS),
+                sums.reshape(rows, 3, columns, LUMA_BINS).transpose(0, 2, 3, 1))
+
+    from collections import Counter
+
+    buffer, channels, step = raster.buffer, raster.channels, raster.sample_bytes
+    bpp = channels * step
+    colors = {}
+    counts = [[[0] * LUMA_BINS for _ in range(columns)] for _ in range(rows)]
+    sums = [[[[0, 0, 0] for _ in range(LUMA_BINS)] for _ in range(columns)] for _ in range(rows)]
+    for row in range(rows):
+        tallies = [Counter() for _ in range(columns)]
+        for y in range(row * tile, min(height, (row + 1) * tile)):
+            start = raster.offset + y * raster.stride
+            line = buffer[start:start + width * bpp]
+            samples = [line[k * step::bpp] for k in range(channels)]
+            for column, tally in enumerate(tallies):
+                x0, x1 = column * tile, min(width, (column + 1) * tile)
+                tally.update(zip(*[sample[x0:x1] for sample in samples]))
+        for column, tally in enumerate(tallies):
+            for key, n in tally.items():
+                if key not in colors:
+                    rgb = _pixel_rgb(raster, key)
+                    colors[key] = (rgb, (54 * rgb[0] + 183 * rgb[1] + 19 * rgb[2]) * LUMA_BINS >> 16)
+                rgb, luma = colors[key]
+                counts[row][column][luma] += n
+                total = sums[row][column][luma]
+                for k in range(3):
+                    total[k] += rgb[k] * n
+    return counts, sums
+
+
+def tile_pairs(counts, sums):
+    """
+    Estimate the dominant background/foreground pair of every tile.
+
+    The background is the tile's most common luma bin, and the foreground
+    the most common bin at least MIN_LUMA_GAP bins away that covers at
+    least MIN_FOREGROUND_SHARE of the tile; each is the mean color of its
+    bin. Anti-aliased edge pixels spread over the bins in between.
+
+    Returns:
+        rows x columns grid (list of lists) of None for tiles without a
+        foreground, or (contrast ratio, foreground rgb, background rgb)
+    """
+    if np is None:
+        grid = []
+        for count_row, sum_row in zip(counts, sums):
+            cells = []
+            for tile_counts, tile_sums in zip(count_row, sum_row):
+                background = max(range(LUMA_BINS), key=lambda k: (tile_counts[k], -k))
+                far = [k for k in range(LUMA_BINS) if abs(k - background) >= MIN_LUMA_GAP and tile_counts[k]]
+                foreground = max(far, key=lambda k: (tile_counts[k], -k)) if far else None
+                if foreground is None or tile_counts[foreground] < MIN_FOREGROUND_SHARE * sum(tile_counts):
+                    cells.append(None)
+                    continue
+                fg, bg = (tuple(int(round(total / tile_counts[k])) for total in tile_sums[k])
+                          for k in (foreground, background))
+                cells.append((luminance_contrast(relative_luminance(fg), relative_luminance(bg)), fg, bg))
+            grid.append(cells)
+        return grid
+
+    bins = np.arange(LUMA_BINS)
+    background = counts.argmax(axis=-1)
+    candidates = np.where(np.abs(bins - background[..., None]) >= MIN_LUMA_GAP, counts, 0)
+    foreground = candidates.argmax(axis=-1)
+    found = candidates.max(axis=-1)
+    has_pair = (found > 0) & (found >= MIN_FOREGROUND_SHARE * counts.sum(axis=-1))
+
+    def mean_color(k):
+        n = np.take_along_axis(counts, k[..., None], axis=-1)
+        total = np.take_along_axis(sums, k[..., None, None], axis=-2)[..., 0, :]
+        return np.rint(total / np.maximum(n, 1)).astype(np.intp)
+
+    fg, bg = mean_color(foreground), mean_color(background)
+    linear = np.array(SRGB_TO_LINEAR)
+    # Same operation order as relative_luminance(), so the results are identical
+    fg_lum = 0.2126 * linear[fg[..., 0]] + 0.7152 * linear[fg[..., 1]] + 0.0722 * linear[fg[..., 2]]
+    bg_lum = 0.2126 * linear[bg[..., 0]] + 0.7152 * linear[bg[..., 1]] + 0.0722 * linear[bg[..., 2]]
+    ratios = (np.maximum(fg_lum, bg_lum) + 0.05) / (np.minimum(fg_lum, bg_lum) + 0.05)
+
+    ratios, fg, bg, has_pair = ratios.tolist(), fg.tolist(), bg.tolist(), has_pair.tolist()
+    return [[(ratio, tuple(f), tuple(b)) if has else None for ratio, f, b, has in zip(*cells)]
+            for cells in zip(ratios, fg, bg, has_pair)]
+
+
+def failing_regions(grid, target, tile, width, height):
+    """
+    Group edge-adjacent tiles below the target into regions, worst first.
+
+    Returns:
+        List of dicts with the region's pixel bounds, tile count, and the
+        ratio, colors and APCA Lc of its worst tile
+    """
+    regions, seen = [], set()
+    for row, cells in enumerate(grid):
+        for column, cell in enumerate(cells):
+            if cell is None or cell[0] >= target or (row, column) in seen:
+                continue
+            seen.add((row, column))
+            stack, tiles = [(row, column)], []
+            while stack:
+                r, c = stack.pop()
+                tiles.append((r, c))
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if (0 <= nr < len(grid) and 0 <= nc < len(cells) and (nr, nc) not in seen
+                            and grid[nr][nc] is not None and grid[nr][nc][0] < target):
+                        seen.add((nr, nc))
+                        stack.append((nr, nc))
+
+            ratio, fg, bg = min(grid[r][c] for r, c in tiles)
+            top, left = min(r for r, _ in tiles) * tile, min(c for _, c in tiles) * tile
+            bottom = min(height, (max(r for r, _ in tiles) + 1) * tile)
+            right = min(width, (max(c for _, c in tiles) + 1) * tile)
+            regions.append({'x': left, 'y': top, 'width': right - left, 'height': bottom - top,
+                            'tiles': len(tiles), 'ratio': ratio,
+                            'foreground_hex': '#%02X%02X%02X' % fg, 'background_hex': '#%02X%02X%02X' % bg,
+                            'apca': round(apca_contrast(apca_luminance(fg), apca_luminance(bg)), 1)})
+    regions.sort(key=lambda region: region['ratio'])
+    return regions
+
+
+def audit_screenshot(path, tile=SCREENSHOT_TILE, target=4.5):
+    """
+    Check the rendered contrast of a screenshot tile by tile.
+
+    Returns:
+        Dict with the image size, tile size, target, tiles (checked and
+        failing counts), grid (rows of each tile's grade, an index into
+        GRADE_NAMES, or -1 for tiles without a foreground) and regions
+        (see failing_regions())
+    """
+    raster = read_screenshot(path)
+    grid = tile_pairs(*tile_histograms(raster, tile))
+
+    grades = [[-1 if cell is None else sum(cell[0] >= threshold for threshold in GRADE_THRESHOLDS)
+               for cell in cells] for cells in grid]
+    checked = sum(cell is not None for cells in grid for cell in cells)
+    failing = sum(cell is not None and cell[0] < target for cells in grid for cell in cells)
+    return {'path': path, 'width': raster.width, 'height': raster.height, 'tile': tile, 'target': target,
+            'tiles': {'columns': len(grid[0]), 'rows': len(grid), 'checked': checked, 'failing': failing},
+            'grid': grades, 'regions': failing_regions(grid, target, tile, raster.width, raster.height)}
+
+
+def print_screenshot(result):
+    """Print a screenshot audit: summary, heatmap of tile grades and failing regions."""
+    tiles = result['tiles']
+    print("\n" + "="*70)
+    print("                    SCREENSHOT CONTRAST AUDIT")
+    print("="*70)
+    print(f"\nImage: {result['path']} ({result['width']} x {result['height']})")
+    print(f"Tiles: {tiles['columns']} x {tiles['rows']} of {result['tile']} px    "
+          f"With text: {tiles['checked']}    Below {result['target']}:1: {tiles['failing']}")
+
+    print("\n" + "-"*70)
+    if tiles['columns'] <= MAX_HEATMAP_COLUMNS:
+        print("HEATMAP: " + "  ".join(f"{char} {name}" for char, name in zip(HEATMAP_CHARS, GRADE_NAMES))
+              + "  (blank: no text)")
+        print("-"*70)
+        print("+" + "-" * tiles['columns'] + "+")
+        for grades in result['grid']:
+            print("|" + "".join(HEATMAP_CHARS[grade] if grade >= 0 else ' ' for grade in grades) + "|")
+        print("+" + "-" * tiles['columns'] + "+")
+    else:
+        print(f"HEATMAP: over {MAX_HEATMAP_COLUMNS} tiles wide; use a larger --tile or --json")
+
+    regions = result['regions']
+    if regions:
+        print("\n" + "-"*70)
+        print("FAILING REGIONS:")
+        print("-"*70)
+        for region in regions[:MAX_PRINTED_FINDINGS]:
+            print(f"✗ x={region['x']} y={region['y']} {region['width']}x{region['height']} "
+                  f"({region['tiles']} tiles)  {region['foreground_hex']} on {region['background_hex']}  "
+                  f"{region['ratio']:.2f}:1  Lc {region['apca']:.1f}")
+        if len(regions) > MAX_PRINTED_FINDINGS:
+            print(f"... and {len(regions) - MAX_PRINTED_FINDINGS} more (use --json or --csv for all)")
+    else:
+        print(f"\n✓ Every tile with text reaches {result['target']}:1.")
+    print("\n" + "="*70 + "\n")
+
+
+def write_screenshot_csv(result, out):
+    """Write the failing regions of a screenshot audit as CSV."""
+    import csv
+
+    columns = ['x', 'y', 'width', 'height', 'tiles', 'foreground_hex', 'background_hex']
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(columns + ['ratio', 'apca'])
+    for region in result['regions']:
+        writer.writerow([region[column] for column in columns] + [f"{region['ratio']:.2f}", f"{region['apca']:.1f}"])
+
+
+def screenshot_main(args):
+    """Audit a screenshot: --screenshot FILE [--tile N] [--target LEVEL] [--json | --csv] [-o FILE]."""
+    path, output_format, output_file = None, None, None
+    tile, target = SCREENSHOT_TILE, TARGETS['aa']
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == '--screenshot' and i + 1 < len(args):
+            path = args[i + 1]
+            i += 1
+        elif arg in ('-o', '--output') and i + 1 < len(args):
+            output_file = args[i + 1]
+            i += 1
+        elif arg == '--target' and i + 1 < len(args) and args[i + 1].lower() in TARGETS:
+            target = TARGETS[args[i + 1].lower()]
+            i += 1
+        elif arg == '--tile' and i + 1 < len(args) and args[i + 1].isdigit() and int(args[i + 1]) >= 8:
+            tile = int(args[i + 1])
+            i += 1
+        elif arg in ('--json', '--csv') and output_format is None:
+            output_format = arg[2:]
+        else:
+            path = None
+            break
+        i += 1
+    if path is None:
+        print("Usage: python contrast-check.py --screenshot <file.png|file.ppm> [--tile N (>= 8)] "
+              "[--target aa|aaa|ui] [--json | --csv] [-o FILE]", file=sys.stderr)
+        sys.exit(2)
+
+    _load_numpy()
+    try:
+        result = audit_screenshot(path, tile, target)
+    except ValueError as e:
+        print(f"\nError: {e}\n", file=sys.stderr)
+        sys.exit(2)
+
+    if output_format is None:
+        print_screenshot(result)
+    else:
+        out = open(output_file, 'w', encoding='utf-8', newline='') if output_file else sys.stdout
+        try:
+            if output_format == 'json':
+                out.write(json.dumps({key: value for key, value in result.items() if key != 'grid'},
+                                     indent=2)[:-2])
+                out.write(',\n  "grid": [\n')
+                out.write(',\n'.join('    ' + json.dumps(row, separators=(',', ':')) for row in result['grid']))
+                out.write('\n  ]\n}\n')
+            else:
+                write_screenshot_csv(result, out)
+        finally:
+            if output_file:
+                out.close()
+        if output_file:
+            print(f"✓ Audit of {result['path']} exported to: {output_file}", file=sys.stderr)
+
+    # Exit code: 0 if every tile with text reaches the target, 1 if not
+    sys.exit(0 if not result['regions'] else 1)
+
+
 def main():
-    if len(sys.argv) != 3:
+    if '--screenshot' in sys.argv[1:]:
+        screenshot_main(sys.argv[1:])
+        return
+
+    if '--scan' in sys.argv[1:]:
+        scan_main(sys.argv[1:])
+        return
+
+    if '--palette' in sys.argv[1:]:
+        palette_main(sys.argv[1:])
+        return
+
+    args = sys.argv[1:]
+    target = TARGETS['aa']
+    if '--target' in args:
+        at = args.index('--target')
+        level = args[at + 1].lower() if at + 1 < len(args) else None
+        if level not in TARGETS:
+            print("Error: --target must be one of: " + ", ".join(TARGETS), file=sys.stderr)
+            sys.exit(2)
+        target = TARGETS[level]
+        del args[at:at + 2]
+
+    if len(args) < 2:
         print("\n" + "="*70)
         print("                    COLOR CONTRAST CHECKER")
         print("="*70)
         print("\nUsage:")
-        print("  python contrast-check.py <foreground> <background>")
+        print("  python contrast-check.py <foreground> <background> [<layer below>...] [--target aa|aaa|ui]")
+        print("  python contrast-check.py --palette <file|-> [--suggest] [--apca] [--over COLOR] [--json | --csv] [-o FILE]")
+        print("  python contrast-check.py --scan <path>... [--over COLOR] [--json | --csv] [--workers N] [--no-cache]")
+        print("  python contrast-check.py --screenshot <file.png|file.ppm> [--tile N] [--json | --csv] [-o FILE]")
         print("\nExamples:")
         print("  python contrast-check.py #000000 #ffffff")
         print("  python contrast-check.py 333 fff")
         print("  python contrast-check.py \"#1a1a1a\" \"#f5f5f5\"")
-        print("\nNote: Both 3-digit and 6-digit hex codes are supported.")
-        print("      The # symbol is optional.")
+        print("  python contrast-check.py \"#00000099\" \"#fff\"     # translucent text")
+        print("  python contrast-check.py fff 0008 0066cc         # on a translucent overlay")
+        print("\nNote: 3-, 4-, 6- and 8-digit hex codes are supported (4 and 8 carry alpha).")
+        print("      The # symbol is optional. Translucent colors are composited over")
+        print("      the layers after them, and the bottom layer over white.")
         print("\n" + "="*70 + "\n")
         sys.exit(1)
 
-    color1 = sys.argv[1]
-    color2 = sys.argv[2]
+    color1, color2 = args[0], args[1]
 
     try:
-        # Validate hex colors
-        hex_to_rgb(color1)
-        hex_to_rgb(color2)
+        # Validate and parse each color once, compositing translucent layers
+        background = flatten_layers(args[1:])
+        foreground = composite(hex_to_rgba(color1), background)
+        lum1 = relative_luminance(foreground)
+        lum2 = relative_luminance(background)
 
         # Calculate contrast
-        ratio = contrast_ratio(color1, color2)
+        ratio = luminance_contrast(lum1, lum2)
         results = check_wcag_compliance(ratio)
+        results['apca'] = apca_contrast(apca_luminance(foreground), apca_luminance(background))
+        results['layers'] = args[2:]
+        if len(args) > 2 or (foreground, background) != (hex_to_rgb(color1), hex_to_rgb(color2)):
+            results['rendered'] = ('#%02X%02X%02X' % foreground, '#%02X%02X%02X' % background)
+            color1, color2 = results['rendered']
 
         # Print results
-        print_results(color1, color2, results)
-        suggest_improvements(color1, color2, results)
+        print_results(args[0], args[1], results)
+        suggest_improvements(color1, color2, results, target)
 
         # Exit code: 0 if AA compliant, 1 if not
         sys.exit(0 if results['aa_normal'] else 1)
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the skill script tests.
+
+The scripts are standalone files (several with hyphenated names), so they
+are loaded by path. Each one is registered in sys.modules under an
+importable name and its directory is put on sys.path, which lets sibling
+modules (sprint_status, sprint_model) import and pickling work.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+SKILLS_DIR = Path(__file__).resolve().parent.parent / 'bmad-skills'
+
+
+def load_script(relative_path: str):
+    """Import a script below bmad-skills/ by path, once per test session."""
+    path = SKILLS_DIR / relative_path
+    name = 'bmad_' + path.stem.replace('-', '_')
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Point every cache at a per-test directory."""
+    directory = tmp_path / 'cache'
+    monkeypatch.setenv('BMAD_CACHE_DIR', str(directory))
+    return directory
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    """
+    Run a test once per backend: returns a function that switches a
+    loaded script to NumPy (skipped if it is not installed) or pure Python.
+    Scripts that import NumPy lazily have it loaded up front, or blocked.
+    """
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+
+    def use(module):
+        if request.param == 'numpy':
+            if hasattr(module, '_load_numpy'):
+                module._load_numpy()
+        else:
+            monkeypatch.setattr(module, 'np', None)
+            if hasattr(module, '_load_numpy'):
+                monkeypatch.setattr(module, '_numpy_tried', True)
+        return module
+
+    use.name = request.param
+    return use
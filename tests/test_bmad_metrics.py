@@ -0,0 +1,53 @@
+"""Cold-start tests for the bmad-metrics dispatcher and its commands."""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SKILLS_DIR, load_script
+
+metrics = load_script('shared/scripts/bmad-metrics.py')
+
+CLI = str(SKILLS_DIR / 'shared/scripts/bmad-metrics.py')
+PROBES = metrics.startup_probes()
+PROBE_IDS = [' '.join(args) for args, _, _ in PROBES]
+
+
+@pytest.fixture(autouse=True)
+def bytecode(monkeypatch):
+    """Let the scripts cache their bytecode, as a normal install does."""
+    monkeypatch.delenv('PYTHONDONTWRITEBYTECODE', raising=False)
+
+
+def _run(args):
+    return subprocess.run([sys.executable, CLI] + args, capture_output=True, text=True)
+
+
+@pytest.mark.parametrize('args, budget_ms, forbidden', PROBES, ids=PROBE_IDS)
+def test_no_heavy_imports(args, budget_ms, forbidden):
+    assert metrics.heavy_imports(args, forbidden) == []
+
+
+@pytest.mark.parametrize('args, budget_ms, forbidden', PROBES, ids=PROBE_IDS)
+def test_within_startup_budget(args, budget_ms, forbidden):
+    _run(args)  # writes the script's bytecode cache
+    assert metrics.startup_overhead(args, runs=5) <= budget_ms
+
+
+@pytest.mark.parametrize('command', list(metrics.COMMANDS))
+def test_help_and_usage_errors(command):
+    help_run = _run([command, '--help'])
+    assert help_run.returncode == 0
+    assert help_run.stdout.strip()
+
+    bad_run = _run([command] + metrics.BAD_ARGS[command])
+    assert bad_run.returncode != 0
+    assert 'usage' in (bad_run.stdout + bad_run.stderr).lower()
+
+
+def test_heavy_imports_are_detected(tmp_path):
+    pytest.importorskip('numpy')
+    palette = tmp_path / 'palette.txt'
+    palette.write_text('#000\n#fff\n')
+    assert 'numpy' in metrics.heavy_imports(['contrast', '--palette', str(palette)], ('numpy',))
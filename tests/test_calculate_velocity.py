@@ -0,0 +1,113 @@
+"""Tests for the velocity analytics engine and capacity recommendations."""
+
+import random
+import statistics
+
+import pytest
+
+from conftest import load_script
+
+velocity = load_script('scrum-master/scripts/calculate-velocity.py')
+from sprint_model import VelocityEntry  # noqa: E402  (importable once the script dir is on sys.path)
+
+
+def _history(completed, planned=30):
+    return [VelocityEntry.from_dict({'sprint': i + 1, 'planned': planned, 'completed': c})
+            for i, c in enumerate(completed)]
+
+
+def _slope(values):
+    xs = range(len(values))
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(values)
+    return (sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, values)) /
+            sum((x - mean_x) ** 2 for x in xs))
+
+
+def test_rolling_windows_match_direct_computation():
+    rng = random.Random(4)
+    completed = [rng.randint(0, 60) for _ in range(40)]
+    analytics = velocity.analyze_velocity(_history(completed), windows=(1, 3, 7))
+
+    for size in (1, 3, 7):
+        for i in range(len(completed)):
+            window = completed[max(0, i - size + 1):i + 1]
+            assert analytics['rolling_mean'][size][i] == pytest.approx(statistics.fmean(window))
+            expected_std = statistics.stdev(window) if len(window) > 1 else 0.0
+            assert analytics['rolling_std'][size][i] == pytest.approx(expected_std, abs=1e-9)
+            slope = analytics['rolling_slope'][size][i]
+            if len(window) < 2:
+                assert slope is None
+            else:
+                assert slope == pytest.approx(_slope(window), abs=1e-9)
+
+    assert analytics['std'] == pytest.approx(statistics.stdev(completed))
+
+
+def test_std_survives_a_large_offset():
+    completed = [1e9 + i % 3 for i in range(50)]
+    analytics = velocity.analyze_velocity(_history(completed), windows=(6,))
+    assert analytics['rolling_std'][6][-1] == pytest.approx(statistics.stdev(completed[-6:]), rel=1e-6)
+
+
+def test_summaries_and_percentiles():
+    analytics = velocity.analyze_velocity(_history([10, 20, 30, 40]), windows=())
+    assert analytics['mean'] == 25
+    assert analytics['trend_slope'] == pytest.approx(10)
+    assert analytics['percentiles'][50] == 25
+    assert analytics['completion_rates'][0] == pytest.approx(33.3)
+
+
+def test_empty_history():
+    analytics = velocity.analyze_velocity([])
+    assert (analytics['mean'], analytics['std'], analytics['trend_slope']) == (0.0, 0.0, None)
+
+
+def test_forecast_with_constant_velocity(backend):
+    backend(velocity)
+    forecast = velocity.forecast_capacity(_history([10, 10, 10]), backlog_points=35, simulations=2000, seed=1)
+
+    assert forecast['backend'] == backend.name
+    assert forecast['next_sprint'] == {50: 10, 85: 10, 95: 10}
+    assert forecast['sprints_to_complete'] == {50: 4, 85: 4, 95: 4}
+    assert forecast['unfinished'] == 0
+
+
+def test_forecast_is_reproducible_and_ordered(backend):
+    backend(velocity)
+    history = _history([5, 20, 35, 12, 28])
+    first = velocity.forecast_capacity(history, backlog_points=100, simulations=5000, seed=7)
+    assert velocity.forecast_capacity(history, backlog_points=100, simulations=5000, seed=7) == first
+
+    # Higher confidence: fewer points promised, more sprints needed
+    points = [first['next_sprint'][c] for c in velocity.FORECAST_CONFIDENCE]
+    sprints = [first['sprints_to_complete'][c] for c in velocity.FORECAST_CONFIDENCE]
+    assert points == sorted(points, reverse=True)
+    assert sprints == sorted(sprints)
+    assert set(points) <= {5, 20, 35, 12, 28}
+    assert 100 / 35 <= sprints[0] <= 100 / 5
+
+
+def test_forecast_without_velocity_never_finishes(backend):
+    backend(velocity)
+    forecast = velocity.forecast_capacity(_history([0, 0]), backlog_points=10, simulations=50, seed=3)
+    assert forecast['unfinished'] == 50
+    assert forecast['sprints_to_complete'] == {50: None, 85: None, 95: None}
+
+
+@pytest.mark.parametrize('records, expected', [
+    ([], 40),
+    ([{'sprint': 1, 'planned': 30}], 40),
+    ([{'sprint': 1, 'planned': 30, 'completed': 0}], 0),
+    ([{'sprint': 1, 'planned': 30, 'completed': 26}], 26),
+])
+def test_capacity_for_short_histories(records, expected):
+    history = [VelocityEntry.from_dict(r) for r in records]
+    assert velocity.recommend_next_sprint_capacity(history, 0.0, 'insufficient_data') == expected
+
+
+def test_capacity_follows_the_trend():
+    history = _history([20, 30, 40])
+    average = velocity.calculate_three_sprint_average(history)
+    trend = velocity.calculate_velocity_trend(history)
+    assert trend == 'increasing'
+    assert velocity.recommend_next_sprint_capacity(history, average, trend) == round(30 * 1.05)
@@ -0,0 +1,411 @@
+"""Tests for the contrast-check palette, scan, APCA and screenshot engines."""
+
+import pytest
+
+from conftest import load_script
+
+contrast = load_script('ux-designer/scripts/contrast-check.py')
+
+PALETTE = [('ink', '#111'), ('paper', '#FFFFFF'), ('muted', '#767676'), ('brand', '#3366CC'),
+           ('accent', '#E0A500'), ('mist', '#EEEEEE'), ('ink-50', '#11111180')]
+
+
+def _nested(value):
+    """Nested lists from a NumPy array or lists."""
+    return value.tolist() if hasattr(value, 'tolist') else value
+
+
+def test_contrast_matrix_matches_pairwise_ratios(backend):
+    backend(contrast)
+    colors = contrast.flatten_palette([color for _, color in PALETTE])
+    ratios = _nested(contrast.contrast_matrix(contrast.palette_luminances(colors)))
+
+    for i, first in enumerate(colors):
+        assert ratios[i][i] == 1.0
+        for j, second in enumerate(colors):
+            assert ratios[i][j] == ratios[j][i] == pytest.approx(contrast.contrast_ratio(first, second))
+
+    grades = _nested(contrast.contrast_grades(contrast.contrast_matrix(contrast.palette_luminances(colors))))
+    assert grades[0][1] == 3   # #111 on white passes AAA
+    assert grades[1][2] == 2   # #767676 on white passes AA, not AAA
+    assert grades[1][5] == 0   # #EEE on white fails everything
+
+
+def test_translucent_colors_are_flattened_over_the_base():
+    assert contrast.flatten_palette(['#11111180', '#FFF', '#00000000']) == ['#888888', '#FFFFFF', '#FFFFFF']
+    assert contrast.flatten_palette(['#11111180'], base=(0, 0, 0)) == ['#090909']
+
+
+def test_ratio_cells_never_round_up_to_a_threshold(backend, monkeypatch):
+    backend(contrast)
+    # 1.3399999999999999 * 100 == 134.0, so plain truncation would print the threshold
+    monkeypatch.setattr(contrast, 'GRADE_THRESHOLDS', (1.34, 4.5, 7.0))
+    ratios = [[1.3399999999999999, 1.34, 4.499999, 4.5, 6.9999, 21.0, 1.0]]
+    if backend.name == 'numpy':
+        ratios = contrast.np.array(ratios)
+    assert _nested(contrast._ratio_cells(ratios)) == [['1.33', '1.34', '4.49', '4.50', '6.99', '21.00', '1.00']]
+
+
+def test_parse_palette_formats():
+    assert contrast.parse_palette('// brand\nink: #111\npaper, #fff\n#abc\n') == \
+        [('ink', '#111'), ('paper', '#fff'), ('#abc', '#abc')]
+    assert contrast.parse_palette('{"ink": "#111", "paper": "#FFFFFF"}') == \
+        [('ink', '#111'), ('paper', '#FFFFFF')]
+    with pytest.raises(ValueError, match='Invalid hex color for bad'):
+        contrast.parse_palette('bad #12')
+
+
+def _random_colors(seed, n):
+    import random
+
+    rng = random.Random(seed)
+    return ['#%06X' % rng.randrange(1 << 24) for _ in range(n)]
+
+
+def _on_both_backends(monkeypatch, compute):
+    """compute() with NumPy, then without it."""
+    pytest.importorskip('numpy')
+    contrast._load_numpy()
+    with_numpy = compute()
+    monkeypatch.setattr(contrast, 'np', None)
+    return with_numpy, compute()
+
+
+@pytest.mark.parametrize('target', [3.0, 4.5, 7.0])
+def test_nearest_compliant_reaches_the_target(backend, target):
+    backend(contrast)
+    colors = _random_colors(1, 30) + ['#777777', '#FFFF00']
+    partners = [contrast.relative_luminance(contrast.hex_to_rgb(color)) for color in _random_colors(2, 32)]
+
+    for color, partner, found in zip(colors, partners, contrast.nearest_compliant(colors, partners, target)):
+        if found is None:
+            # Neither black nor white of any hue reaches it
+            assert contrast.luminance_contrast(0.0, partner) < target
+            assert contrast.luminance_contrast(1.0, partner) < target
+            continue
+        hex_color, ratio = found
+        assert ratio >= target
+        assert ratio == pytest.approx(contrast.luminance_contrast(
+            contrast.relative_luminance(contrast.hex_to_rgb(hex_color)), partner))
+
+
+def test_failing_colors_move_just_past_the_target():
+    # #999 on white is 2.85:1; the nearest gray reaching 4.5:1 is #767676
+    (gray, ratio), = contrast.nearest_compliant(['#999999'], [1.0], 4.5)
+    assert gray == '#767676' and 4.5 <= ratio < 4.6
+    (blue, ratio), = contrast.nearest_compliant(['#6699FF'], [1.0], 4.5)
+    r, g, b = contrast.hex_to_rgb(blue)
+    assert b > g > r and 4.5 <= ratio < 4.7
+
+
+def test_nearest_compliant_backends_agree(monkeypatch):
+    colors = _random_colors(3, 40)
+    partners = [i / 39 for i in range(40)]
+    with_numpy, without = _on_both_backends(monkeypatch,
+                                            lambda: contrast.nearest_compliant(colors, partners, 4.5))
+    assert with_numpy == without
+
+
+def test_palette_suggestions_backends_agree(monkeypatch):
+    palette = [(color, color) for color in _random_colors(4, 25)]
+
+    def suggest():
+        luminances = contrast.palette_luminances([color for _, color in palette])
+        ratios = contrast.contrast_matrix(luminances)
+        return (contrast.palette_suggestions(palette, luminances, ratios, 4.5),
+                contrast.palette_suggestions(palette, luminances, ratios, 4.5, limit=5),
+                contrast.suggestion_columns(palette, luminances, ratios, 4.5))
+
+    with_numpy, without = _on_both_backends(monkeypatch, suggest)
+    assert with_numpy == without
+    (count, suggestions), (limited_count, limited), columns = without
+    assert count == limited_count == len(suggestions) == len(columns[0])
+    assert limited == suggestions[:5]
+    assert all(i < j and ratio < 4.5 for i, j, ratio, _, _ in suggestions)
+
+
+def test_stylesheet_comments_strings_and_urls():
+    css = (
+        '/* header\n   comment */\n'
+        '.hero { background: url(//cdn.example.com/a.png) #FFF; color: #222; }\n'
+        '.quote::before { content: "/* not a comment"; color: #333; background: #EEE }\n'
+        '.link { background-image: url("x;y.png"); color: var(--ink, #000); background-color: $paper; }\n'
+    )
+    rules = contrast._extract_stylesheet(css)['rules']
+    assert [(line, selector, color, background) for line, selector, color, background, _, _ in rules] == [
+        (3, '.hero', '#222', '#FFF'),
+        (4, '.quote::before', '#333', '#EEE'),
+        (5, '.link', 'var(--ink, #000)', '$paper'),
+    ]
+    assert rules[2][4] == ('ref', '--ink', ('hex', '000000'))
+
+
+def test_minified_css_and_line_comments():
+    minified = ':root{--fg:#111;--bg:#fafafa}.a{color:#fff;background:#000}.b{color:red}'
+    extraction = contrast._extract_stylesheet(minified)
+    assert [d[:2] for d in extraction['definitions']] == [('--fg', '#111'), ('--bg', '#fafafa')]
+    assert [r[1:4] for r in extraction['rules']] == [('.a', '#fff', '#000')]
+
+    scss = '$ink: #123; // $ink: #fff;\n.c { color: $ink; // color: red;\n  background: url(//x/y) #fed; }\n'
+    extraction = contrast._extract_stylesheet(scss, line_comments=True)
+    assert [d[:3] for d in extraction['definitions']] == [('$ink', '#123', 1)]
+    assert [r[:4] for r in extraction['rules']] == [(2, '.c', '$ink', '#fed')]
+    # Plain CSS has no // comments: the line stays part of the value
+    assert contrast._extract_stylesheet('.d { color: #fff; background: #000 // x\n}')['rules'][0][3] == '#000 // x'
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('#abc', ('hex', 'AABBCC')),
+    ('#11223380', ('hex', '11223380')),
+    ('rgb(255 0 0 / 50%)', ('hex', 'FF000080')),
+    ('rgba(0, 0, 0, 1)', ('hex', '000000')),
+    ('1px solid Navy', ('hex', '000080')),
+    ('var(--a, var(--b))', ('ref', '--a', ('ref', '--b', None))),
+    ('var(--a, var(--b, rgb(0, 0, 0))) solid', ('ref', '--a', ('ref', '--b', ('hex', '000000')))),
+    ('{color.brand.value}', ('ref', 'color.brand', None)),
+    ('@ink', ('ref', '@ink', None)),
+    ('url(navy.png) transparent', ('unsupported', 'transparent')),
+    ('hsl(0 0% 0%)', ('unsupported', 'hsl(...)')),
+    ('#12345', ('unsupported', 'hex color #12345')),
+    ('none', None),
+])
+def test_color_reference(value, expected):
+    assert contrast.color_reference(value) == expected
+
+
+def test_scan_resolves_tokens_across_files_and_reuses_the_cache(tmp_path):
+    (tmp_path / 'tokens.json').write_text(
+        '{"color": {"brand": {"value": "#3366CC"}, "on-brand": {"$value": "{color.brand.value}"},'
+        ' "ink": {"fg": {"value": "#111"}, "bg": {"value": "#FFF"}}}}')
+    (tmp_path / 'site.css').write_text(
+        '.btn { color: var(--color-ink-fg); background: var(--color-brand); }\n'
+        '.ghost { color: var(--missing); background: #fff; }\n')
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'skip.css').write_text('.x { color: #fff; background: #fff; }')
+
+    result = contrast.scan_contrast([str(tmp_path)], workers=1)
+    assert (result['files'], result['cached'], result['errors']) == (2, 0, [])
+    pairs = {(p['subject'], p['foreground_hex'], p['background_hex'], p['passes']) for p in result['pairs']}
+    assert pairs == {('.btn', '#111111', '#3366CC', False),
+                     ('color.on-brand on color.brand', '#3366CC', '#3366CC', False),
+                     ('color.ink.fg on color.ink.bg', '#111111', '#FFFFFF', True)}
+    assert [u['reason'] for u in result['unresolved']] == ['foreground: undefined --missing']
+
+    assert contrast.scan_contrast([str(tmp_path)], workers=2)['cached'] == 2
+    (tmp_path / 'site.css').write_text('.btn { color: #fff; background: var(--color-brand); }\n')
+    rescanned = contrast.scan_contrast([str(tmp_path)], workers=2)
+    assert rescanned['cached'] == 1
+    assert [p['foreground_hex'] for p in rescanned['pairs'] if p['kind'] == 'rule'] == ['#FFFFFF']
+
+
+# Reference Lc values published with the APCA-W3 0.0.98G-4g constants
+@pytest.mark.parametrize('text, background, lc', [
+    ('#000000', '#FFFFFF', 106.04067321268862),
+    ('#FFFFFF', '#000000', -107.88473318309848),
+    ('#888888', '#FFFFFF', 63.056469930209424),
+    ('#FFFFFF', '#888888', -68.54146436644962),
+    ('#112233', '#DDEEFF', 91.66830811481631),
+    ('#777777', '#777777', 0.0),
+])
+def test_apca_reference_values(backend, text, background, lc):
+    backend(contrast)
+    text_y = contrast.apca_luminance(contrast.hex_to_rgb(text))
+    background_y = contrast.apca_luminance(contrast.hex_to_rgb(background))
+    assert contrast.apca_contrast(text_y, background_y) == pytest.approx(lc, abs=1e-9)
+
+    _, lcs = contrast.pair_contrast([contrast.hex_to_rgba(text)], [contrast.hex_to_rgba(background)])
+    assert lcs[0] == pytest.approx(lc, abs=1e-9)
+
+
+def test_apca_levels():
+    assert contrast.apca_level(106) == 'preferred for body text'
+    assert contrast.apca_level(-62) == 'content text'
+    assert contrast.apca_level(10) is None
+
+
+def test_pair_contrast_composites_translucent_layers(backend):
+    backend(contrast)
+    # 50% black text on 50% white over black: background #808080, text #404040
+    ratios, lcs = contrast.pair_contrast([(0, 0, 0, 0.5)], [(255, 255, 255, 0.5)], base=(0, 0, 0))
+    assert ratios[0] == pytest.approx(contrast.contrast_ratio('#404040', '#808080'))
+    assert contrast.flatten_layers(['#00000080', '#FFFFFF80'], base=(0, 0, 0)) == (64, 64, 64)
+
+    ratios, _ = contrast.pair_contrast([(0, 0, 0, 1.0)], [(0, 0, 0, 0.0)])
+    assert ratios[0] == pytest.approx(21.0)
+
+
+def test_pair_contrast_backends_agree(monkeypatch):
+    import random
+
+    rng = random.Random(6)
+    foregrounds = [(rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.choice((1.0, 0.5, 0.2)))
+                   for _ in range(200)]
+    backgrounds = [(rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.choice((1.0, 0.7, 0.0)))
+                   for _ in range(200)]
+    with_numpy, without = _on_both_backends(
+        monkeypatch, lambda: contrast.pair_contrast(foregrounds, backgrounds, base=(20, 30, 40)))
+    assert with_numpy[0] == pytest.approx(without[0], rel=1e-12)
+    assert with_numpy[1] == pytest.approx(without[1], abs=1e-9)
+
+    colors = _random_colors(7, 12)
+    with_numpy, without = _on_both_backends(monkeypatch, lambda: _nested(contrast.apca_matrix(colors)))
+    for numpy_row, python_row in zip(with_numpy, without):
+        assert numpy_row == pytest.approx(python_row, abs=1e-9)
+
+
+
+@pytest.mark.parametrize('options', [
+    [], ['--apca'], ['--suggest'], ['--suggest', '--target', 'aaa', '--over', '#222'],
+    ['--json', '--apca'], ['--csv', '--apca'], ['--json', '--suggest'], ['--csv', '--suggest'],
+], ids=lambda options: ' '.join(options) or 'table')
+def test_palette_output_is_the_same_on_both_backends(tmp_path, monkeypatch, capsys, options):
+    palette = tmp_path / 'palette.txt'
+    palette.write_text(''.join(f'{name} {color}\n' for name, color in PALETTE))
+
+    def run():
+        contrast.palette_main(['--palette', str(palette)] + options)
+        return capsys.readouterr().out
+
+    with_numpy, without = _on_both_backends(monkeypatch, run)
+    assert with_numpy == without
+    assert 'ink-50' in without
+
+def _filter_rows(rows, kinds, bpp):
+    """Apply PNG scanline filters (the inverse of _unfilter) and prefix each row with its type."""
+    out, prior = bytearray(), bytes(len(rows[0]))
+    for row, kind in zip(rows, kinds):
+        out.append(kind)
+        for i, x in enumerate(row):
+            a = row[i - bpp] if i >= bpp else 0
+            b = prior[i]
+            c = prior[i - bpp] if i >= bpp else 0
+            predicted = (0, a, b, (a + b) >> 1, contrast._paeth(a, b, c))[kind]
+            out.append((x - predicted) & 255)
+        prior = row
+    return out
+
+
+def _png(rows, kinds, width, depth, color_type, chunks=()):
+    import struct
+    import zlib
+
+    def chunk(kind, body):
+        return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+    bpp = contrast.PNG_CHANNELS[color_type] * depth // 8
+    header = struct.pack('>IIBBBBB', width, len(rows), depth, color_type, 0, 0, 0)
+    data = zlib.compress(bytes(_filter_rows(rows, kinds, bpp)))
+    return (contrast.PNG_SIGNATURE + chunk(b'IHDR', header) + b''.join(chunk(k, b) for k, b in chunks)
+            + chunk(b'IDAT', data[:len(data) // 2]) + chunk(b'IDAT', data[len(data) // 2:])
+            + chunk(b'IEND', b''))
+
+
+def _random_rows(seed, height, row_bytes):
+    import random
+
+    rng = random.Random(seed)
+    return [bytes(rng.randrange(256) for _ in range(row_bytes)) for _ in range(height)]
+
+
+def _raster_rows(raster):
+    return [bytes(raster.buffer[raster.offset + y * raster.stride:
+                                raster.offset + y * raster.stride + raster.width * raster.channels
+                                * raster.sample_bytes])
+            for y in range(raster.height)]
+
+
+@pytest.mark.parametrize('kinds', [
+    [0, 1, 2, 1, 0, 2], [3] * 6, [4] * 6, [0, 4, 3, 1, 2, 4], [4, 3, 3, 4, 0, 1],
+], ids=['none-sub-up', 'average', 'paeth', 'mixed', 'mixed-first-row'])
+@pytest.mark.parametrize('bpp', [1, 3, 4, 8])
+def test_unfilter_backends_match_the_reference(backend, kinds, bpp):
+    backend(contrast)
+    rows = _random_rows(bpp, len(kinds), 7 * bpp)
+    raw = _filter_rows(rows, kinds, bpp)
+    (contrast._unfilter_numpy if backend.name == 'numpy' else contrast._unfilter)(raw, len(rows), 7 * bpp, bpp)
+    assert [bytes(raw[y * (7 * bpp + 1) + 1:(y + 1) * (7 * bpp + 1)]) for y in range(len(rows))] == rows
+
+
+def test_unknown_filter_type_is_rejected(backend):
+    backend(contrast)
+    raw = bytearray([0, 1, 2, 5, 3, 4])
+    with pytest.raises(ValueError, match='Unknown PNG filter type 5'):
+        (contrast._unfilter_numpy if backend.name == 'numpy' else contrast._unfilter)(raw, 2, 2, 1)
+
+
+@pytest.mark.parametrize('depth, color_type', [(8, 0), (8, 2), (8, 4), (8, 6), (16, 2), (16, 6)])
+def test_read_png_decodes_every_filter(backend, depth, color_type):
+    backend(contrast)
+    bpp = contrast.PNG_CHANNELS[color_type] * depth // 8
+    rows = _random_rows(depth + color_type, 5, 6 * bpp)
+    raster = contrast.read_png(_png(rows, [0, 1, 2, 3, 4], 6, depth, color_type))
+
+    assert (raster.width, raster.height, raster.channels, raster.sample_bytes) == \
+        (6, 5, contrast.PNG_CHANNELS[color_type], depth // 8)
+    assert _raster_rows(raster) == rows
+
+
+def test_read_png_palette_with_transparency():
+    rows = [bytes([0, 1, 2]), bytes([2, 1, 0])]
+    chunks = [(b'PLTE', bytes([255, 0, 0, 0, 0, 255, 10, 20, 30])), (b'tRNS', bytes([0, 128]))]
+    raster = contrast.read_png(_png(rows, [0, 0], 3, 8, 3, chunks))
+    # Transparent red and half-transparent blue are composited over white once, in the palette
+    assert raster.palette[:3] == [(255, 255, 255), (127, 127, 255), (10, 20, 30)]
+
+
+@pytest.mark.parametrize('data, message', [
+    (contrast.PNG_SIGNATURE, 'missing or truncated'),
+    (b'P6 4 4 100\n' + bytes(48), 'maximum value 100'),
+    (b'P6 4 4 255\n' + bytes(47), 'truncated'),
+    (b'P6 4', 'Malformed'),
+])
+def test_bad_images_are_rejected(data, message):
+    reader = contrast.read_png if data.startswith(contrast.PNG_SIGNATURE) else contrast.read_pnm
+    with pytest.raises(ValueError, match=message):
+        reader(data)
+
+
+def test_read_pnm_with_comments_and_16_bit_samples():
+    raster = contrast.read_pnm(b'P5\n# made by a test\n2 1\n# depth\n65535\n' + bytes([1, 2, 3, 4]))
+    assert (raster.width, raster.height, raster.channels, raster.sample_bytes) == (2, 1, 1, 2)
+    assert _raster_rows(raster) == [bytes([1, 2, 3, 4])]
+
+
+def _screenshot(tmp_path):
+    """A 96 x 64 PPM: dark text on white on the left, light gray text on white on the right."""
+    width, height = 96, 64
+    pixels = bytearray(b'\xff' * width * height * 3)
+    for y in range(8, 56, 4):
+        for x in range(width):
+            if x % 3:
+                continue
+            shade = 0x22 if x < 48 else 0xCC
+            pixels[(y * width + x) * 3:(y * width + x) * 3 + 3] = bytes([shade] * 3)
+    path = tmp_path / 'shot.ppm'
+    path.write_bytes(b'P6\n%d %d\n255\n' % (width, height) + pixels)
+    return str(path)
+
+
+def test_screenshot_audit_finds_the_low_contrast_region(tmp_path, backend):
+    backend(contrast)
+    result = contrast.audit_screenshot(_screenshot(tmp_path), tile=16)
+
+    assert result['tiles'] == {'columns': 6, 'rows': 4, 'checked': 24, 'failing': 12}
+    assert [row[:3] for row in result['grid']] == [[3] * 3] * 4
+    assert [row[3:] for row in result['grid']] == [[0] * 3] * 4
+    (region,) = result['regions']
+    assert (region['x'], region['y'], region['width'], region['height'], region['tiles']) == (48, 0, 48, 64, 12)
+    assert (region['foreground_hex'], region['background_hex']) == ('#CCCCCC', '#FFFFFF')
+
+
+def test_screenshot_backends_agree(tmp_path, monkeypatch):
+    import random
+
+    rng = random.Random(8)
+    width, height = 70, 45
+    rows = [bytes(rng.choice((0, 40, 200, 255)) for _ in range(width * 4)) for _ in range(height)]
+    path = tmp_path / 'shot.png'
+    path.write_bytes(_png(rows, [rng.randrange(5) for _ in range(height)], width, 8, 6))
+
+    with_numpy, without = _on_both_backends(monkeypatch, lambda: contrast.audit_screenshot(str(path), tile=16))
+    assert with_numpy == without
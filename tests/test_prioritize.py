@@ -0,0 +1,230 @@
+"""Tests for RICE batch scoring, discovery, the score store, sensitivity and the portfolio optimizer."""
+
+import itertools
+import random
+
+import pytest
+
+from conftest import load_script
+
+prioritize = load_script('product-manager/scripts/prioritize.py')
+
+
+def _table(rows):
+    """FeatureTable from (name, rice_score, effort) rows, with reach chosen to give that score."""
+    features = prioritize.FeatureTable()
+    features.extend([r[0] for r in rows], [r[1] * r[2] for r in rows], [1.0] * len(rows),
+                    [100.0] * len(rows), [r[2] for r in rows], [r[1] for r in rows])
+    return features
+
+
+def _brute_force(values, weights, capacity):
+    best = 0.0
+    for size in range(len(values) + 1):
+        for subset in itertools.combinations(range(len(values)), size):
+            if sum(weights[i] for i in subset) <= capacity + prioritize.EFFORT_TOLERANCE:
+                best = max(best, sum(values[i] for i in subset))
+    return best
+
+
+def _random_items(seed, n=9, decimals=0):
+    rng = random.Random(seed)
+    values = [round(rng.uniform(1, 100), 2) for _ in range(n)]
+    weights = [round(rng.uniform(0.5, 8), decimals) or 1 for _ in range(n)]
+    return values, weights, round(sum(weights) * rng.uniform(0.2, 0.7), decimals)
+
+
+BATCH = """\
+name,reach,impact,confidence,effort
+Alpha,1000,2,80,4
+Beta,-5,1,50,1
+Gamma,300,0.7,50,1
+
+Delta,200,0.5,150,2
+Epsilon,oops,1,50,1
+Zeta,400,3,100,0
+Eta,50,0.25,100,0.5
+Theta,1e3,1,nan,1
+"""
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 3, 100])
+def test_batch_loading_keeps_valid_rows_and_warns_in_file_order(tmp_path, capsys, backend, chunk_rows):
+    backend(prioritize)
+    path = tmp_path / 'features.csv'
+    path.write_text(BATCH)
+
+    features = prioritize.batch_mode(str(path), chunk_rows=chunk_rows)
+    assert features.name == ['Alpha', 'Eta']
+    assert list(features.rice_score) == [400.0, 25.0]
+    assert list(features.effort) == [4.0, 0.5]
+
+    # Rows are numbered as csv.DictReader yields them: the blank line is not counted
+    warnings = capsys.readouterr().out.splitlines()
+    assert [line.split(' - ')[0] for line in warnings] == [
+        'Warning: Row 3', 'Warning: Row 4', 'Warning: Row 5', 'Warning: Row 6', 'Warning: Row 7',
+        'Warning: Row 9']
+    assert warnings[0].endswith(prioritize.SKIP_REASONS[0] + ', skipping')
+    assert warnings[1].endswith(prioritize.SKIP_REASONS[1] + ', skipping')
+    assert warnings[2].endswith(prioritize.SKIP_REASONS[2] + ', skipping')
+    assert 'Invalid data' in warnings[3]
+    assert warnings[4].endswith(prioritize.SKIP_REASONS[3] + ', skipping')
+    assert warnings[5].endswith(prioritize.SKIP_REASONS[2] + ', skipping')
+
+
+def test_batch_ranking_matches_in_memory_ranking(tmp_path, backend):
+    backend(prioritize)
+    rng = random.Random(5)
+    lines = ['name,reach,impact,confidence,effort']
+    for i in range(500):
+        lines.append(f"F{i},{rng.randint(1, 50)},{rng.choice(prioritize.ALLOWED_IMPACTS)},"
+                     f"{rng.choice((50, 80, 100))},{rng.choice((1, 2, 4))}")
+    path = tmp_path / 'features.csv'
+    path.write_text('\n'.join(lines) + '\n')
+
+    expected = prioritize.ranked_rows(prioritize.batch_mode(str(path)))
+    assert list(prioritize.rank_batch(str(path), chunk_rows=64)) == expected
+    assert list(prioritize.rank_batch(str(path), top=25, chunk_rows=64)) == expected[:25]
+
+
+def test_generated_exports_are_skipped(tmp_path):
+    (tmp_path / 'nested').mkdir()
+    for name in ('features.csv', 'nested/more.csv', 'features_results.csv', 'features_portfolio.csv',
+                 'features_sensitivity.csv', 'nested/' + prioritize.MULTI_FILE_OUTPUT, 'results.csv'):
+        (tmp_path / name).write_text('name,reach,impact,confidence,effort\n')
+
+    found = prioritize.find_feature_files([str(tmp_path)])
+    assert [p[len(str(tmp_path)) + 1:] for p in found] == ['features.csv', 'nested/more.csv', 'results.csv']
+
+    # Files named explicitly are still used as given
+    explicit = str(tmp_path / 'features_portfolio.csv')
+    assert prioritize.find_feature_files([explicit]) == [explicit]
+
+
+@pytest.mark.parametrize('suffix', prioritize.GENERATED_SUFFIXES)
+def test_default_exports_are_recognised(suffix):
+    path = prioritize.default_export_path('lines/q3.features.csv', suffix)
+    assert path == f'lines/q3.features{suffix}.csv'
+    assert prioritize.is_generated_export(path)
+    assert not prioritize.is_generated_export('lines/q3.features.csv')
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_knapsack_dp_is_optimal(backend, seed):
+    backend(prioritize)
+    values, weights, capacity = _random_items(seed)
+    chosen = prioritize._knapsack_dp(values, [int(w) for w in weights], int(capacity))
+
+    assert len(set(chosen)) == len(chosen)
+    assert sum(weights[i] for i in chosen) <= capacity
+    assert sum(values[i] for i in chosen) == pytest.approx(_brute_force(values, weights, capacity))
+
+
+@pytest.mark.parametrize('seed', range(6))
+def test_branch_and_bound_is_optimal_and_greedy_is_bounded(seed):
+    values, weights, capacity = _random_items(seed, decimals=3)
+    order = prioritize._by_density(values, weights)
+    optimum = _brute_force(values, weights, capacity)
+
+    greedy = prioritize._knapsack_greedy(values, weights, order, capacity)
+    greedy_value = sum(values[i] for i in greedy)
+    assert sum(weights[i] for i in greedy) <= capacity + prioritize.EFFORT_TOLERANCE
+    assert optimum / 2 <= greedy_value <= optimum + 1e-9
+    assert prioritize._fractional_bound(values, weights, order, capacity) >= optimum - 1e-9
+
+    exact = prioritize._knapsack_branch_and_bound(values, weights, order, capacity, greedy, 10 ** 6)
+    assert sum(weights[i] for i in exact) <= capacity + prioritize.EFFORT_TOLERANCE
+    assert sum(values[i] for i in exact) == pytest.approx(optimum)
+
+    assert prioritize._knapsack_branch_and_bound(values, weights, order, capacity, greedy, 1) is None
+
+
+def test_portfolio_honours_required_and_excluded(backend):
+    backend(prioritize)
+    features = _table([('A', 90, 5), ('B', 60, 3), ('C', 50, 3), ('D', 10, 1), ('E', 0, 1)])
+
+    result = prioritize.optimize_portfolio(features, 7)
+    assert result['method'] == 'dynamic programming'
+    assert sorted(features.name[i] for i in result['selected']) == ['B', 'C', 'D']
+    assert result['total_score'] == 120 and result['gap'] == 0
+
+    result = prioritize.optimize_portfolio(features, 7, required=['A'], excluded=['D'])
+    assert sorted(features.name[i] for i in result['selected']) == ['A']
+    assert result['total_score'] == 90
+
+    with pytest.raises(ValueError, match='over the budget'):
+        prioritize.optimize_portfolio(features, 4, required=['A'])
+    with pytest.raises(ValueError, match='Unknown'):
+        prioritize.optimize_portfolio(features, 4, excluded=['Z'])
+
+
+def test_sensitivity_without_noise_reproduces_the_ranking(backend):
+    backend(prioritize)
+    # C and D tie: ties keep input order in every trial
+    features = _table([('A', 10, 1), ('B', 40, 1), ('C', 20, 1), ('D', 20, 1), ('E', 5, 1)])
+    result = prioritize.sensitivity_analysis(features, trials=20, top_n=2,
+                                             spreads={'reach': 0, 'confidence': 0, 'effort': 0}, seed=1)
+
+    assert result['backend'] == backend.name
+    assert [f['name'] for f in result['features']] == ['B', 'C', 'D', 'A', 'E']
+    for feature in result['features']:
+        assert feature['rank_low'] == feature['rank_high'] == feature['mean_rank'] == feature['rank']
+        assert feature['top_probability'] == (1.0 if feature['rank'] <= 2 else 0.0)
+
+
+@pytest.mark.parametrize('distribution', prioritize.DISTRIBUTIONS)
+def test_sensitivity_statistics_are_consistent(backend, distribution):
+    backend(prioritize)
+    rng = random.Random(2)
+    features = _table([('Leader', 500, 1)] + [(f'F{i}', rng.uniform(20, 100), 1) for i in range(28)]
+                      + [('Laggard', 1, 1)])
+    result = prioritize.sensitivity_analysis(features, trials=400, top_n=5, distribution=distribution, seed=3)
+
+    assert result == prioritize.sensitivity_analysis(features, trials=400, top_n=5, distribution=distribution,
+                                                     seed=3)
+    ranked = result['features']
+    assert sum(f['top_probability'] for f in ranked) == pytest.approx(5)
+    assert sum(f['mean_rank'] for f in ranked) == pytest.approx(sum(range(1, 31)))
+    for f in ranked:
+        assert 1 <= f['rank_low'] <= f['rank_high'] <= 30
+        assert 1 <= f['mean_rank'] <= 30
+    # The clear leader stays near the top; the clear laggard near the bottom
+    assert (ranked[0]['name'], ranked[0]['top_probability']) == ('Leader', 1.0)
+    assert (ranked[-1]['name'], ranked[-1]['rank_low']) == ('Laggard', 30)
+
+
+def test_sensitivity_bins_ranks_of_large_backlogs(backend, monkeypatch):
+    backend(prioritize)
+    monkeypatch.setattr(prioritize, 'RANK_BINS', 8)
+    features = _table([(f'F{i}', 100 - i, 1) for i in range(50)])
+    result = prioritize.sensitivity_analysis(features, trials=10, top_n=3,
+                                             spreads={'reach': 0, 'confidence': 0, 'effort': 0})
+
+    # Bins of 7 ranks: intervals are rounded outward to bin edges
+    for f in result['features']:
+        bin_start = (f['rank'] - 1) // 7 * 7
+        assert (f['rank_low'], f['rank_high']) == (bin_start + 1, min(50, bin_start + 7))
+
+
+def test_store_tracks_rank_moves_between_runs(tmp_path):
+    store = str(tmp_path / 'rice.sqlite')
+    source = str(tmp_path / 'features.csv')
+
+    rows, summary = prioritize.update_store(store, source, _table([('A', 30, 1), ('B', 20, 1), ('C', 10, 1)]))
+    assert [row[-1] for row in rows] == [None, None, None]
+    assert summary == {'new': 3, 'changed': 0, 'unchanged': 0, 'removed': []}
+
+    # B overtakes A, C is dropped, D arrives, a second A is a separate feature
+    rows, summary = prioritize.update_store(store, source,
+                                            _table([('A', 30, 1), ('B', 50, 1), ('D', 5, 1), ('A', 1, 1)]))
+    assert [(row[0], row[-1]) for row in rows] == [('B', 1), ('A', -1), ('D', None), ('A', None)]
+    assert summary == {'new': 2, 'changed': 1, 'unchanged': 1, 'removed': ['C']}
+
+    # Another backlog in the same store is tracked separately
+    _, summary = prioritize.update_store(store, str(tmp_path / 'other.csv'), _table([('A', 30, 1)]))
+    assert summary['new'] == 1
+
+    rows, summary = prioritize.update_store(store, source,
+                                            _table([('A', 30, 1), ('B', 50, 1), ('D', 5, 1), ('A', 1, 1)]))
+    assert [row[-1] for row in rows] == [0, 0, 0, 0]
+    assert summary == {'new': 0, 'changed': 0, 'unchanged': 4, 'removed': []}
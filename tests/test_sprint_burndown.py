@@ -0,0 +1,112 @@
+"""Tests for the burndown series backends and incremental recomputation."""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SKILLS_DIR, load_script
+
+burndown = load_script('scrum-master/scripts/sprint-burndown.py')
+from sprint_model import Sprint  # noqa: E402  (importable once the script dir is on sys.path)
+
+
+def _sprint(burndown_entries, start='2025-01-01', end='2025-01-10', points=20, stories=()):
+    return Sprint.from_dict({
+        'number': 1, 'start_date': start, 'end_date': end, 'capacity': points,
+        'burndown': list(burndown_entries), 'stories': list(stories),
+    })
+
+
+SPRINT = _sprint([
+    {'date': '2025-01-02', 'remaining_points': 15, 'completed_points': 5},
+    {'date': '2025-01-05', 'remaining_points': 8, 'completed_points': 12},
+    {'date': '2025-01-05', 'remaining_points': 9, 'completed_points': 11},
+    {'date': '2025-01-08', 'remaining_points': 0, 'completed_points': 20},
+])
+
+
+def test_series_carry_the_last_entry_forward(backend):
+    backend(burndown)
+    data = burndown.generate_burndown_data(SPRINT)
+
+    assert data['dates'][:3] == ['2025-01-01', '2025-01-02', '2025-01-03']
+    assert data['actual'] == [20, 15, 15, 15, 9, 9, 9, 0, 0, 0]
+    assert data['completed'] == [0, 5, 5, 5, 11, 11, 11, 20, 20, 20]
+    assert data['ideal'][0] == 20 and data['ideal'][-1] == 0.0
+    assert data['status'][1] == burndown.STATUS_AHEAD
+    assert data['status'][-1] == burndown.STATUS_COMPLETE
+    assert data['duplicate_dates'] == ['2025-01-05']
+
+
+@pytest.mark.parametrize('total, days', [(7, 20), (10, 3), (35, 10), (1, 1), (100, 0)])
+def test_ideal_line_rounds_like_round(backend, total, days):
+    backend(burndown)
+    per_day = total / days if days else 0
+    expected = [round(total - per_day * d, 1) for d in range(days + 1)] if days else [total]
+    assert burndown.calculate_ideal_burndown(total, days) == expected
+
+
+def test_story_burndown_buckets_events(backend):
+    backend(burndown)
+    sprint = _sprint([], points=0, stories=[
+        {'id': 'A', 'points': 5, 'status': 'completed', 'completed_date': '2025-01-03'},
+        {'id': 'B', 'points': 3, 'added_date': '2025-01-04'},
+        {'id': 'C', 'points': 2, 'status': 'completed'},
+    ])
+    data = burndown.generate_story_burndown_data(sprint)
+
+    assert data['scope'][:5] == [7, 7, 7, 10, 10]
+    assert data['actual'][:5] == [7, 7, 2, 5, 5]
+    assert data['undated_completions'] == ['C']
+
+
+def test_refresh_matches_a_full_rebuild(backend):
+    backend(burndown)
+    state, first_day = burndown.refresh_burndown(None, SPRINT)
+    assert first_day == 0
+
+    edited = _sprint([
+        {'date': '2025-01-02', 'remaining_points': 15, 'completed_points': 5},
+        {'date': '2025-01-06', 'remaining_points': 4, 'completed_points': 16},
+    ])
+    state, first_day = burndown.refresh_burndown(state, edited)
+
+    assert first_day == 4
+    full = burndown.generate_burndown_data(edited)
+    for key in ('actual', 'completed', 'status'):
+        assert state['burndown'][key] == full[key]
+
+
+def test_single_sprint_does_not_import_numpy(tmp_path):
+    status = tmp_path / 'sprint-status.yaml'
+    status.write_text(
+        'current_sprint: 1\n'
+        'sprints:\n'
+        '  - {number: 1, start_date: "2025-01-01", end_date: "2025-01-10", capacity: 20}\n')
+    script = SKILLS_DIR / 'scrum-master/scripts/sprint-burndown.py'
+    result = subprocess.run(
+        [sys.executable, '-c',
+         'import runpy, sys; sys.argv = sys.argv[1:]; sys.path.insert(0, sys.argv[0].rpartition("/")[0]); '
+         'runpy.run_path(sys.argv[0], run_name="__main__"); print("numpy" in sys.modules, file=sys.stderr)',
+         str(script), str(status), '--no-cache'],
+        capture_output=True, text=True, check=True)
+    assert result.stderr.strip().splitlines()[-1] == 'False'
+
+
+@pytest.mark.parametrize('sprint', [
+    SPRINT,
+    _sprint([{'date': '2024-12-30', 'remaining_points': 18.5, 'completed_points': 1.5}], points=20.5),
+    _sprint([], end='2025-01-01'),
+    _sprint([], end='2024-12-25'),
+    _sprint([{'date': '2025-01-04', 'remaining_points': 0, 'completed_points': 7}], points=7, end='2025-01-21'),
+], ids=['entries', 'before-start', 'one-day', 'reversed', 'long'])
+def test_lazy_rows_match_the_series(backend, sprint):
+    backend(burndown)
+    lazy = burndown.generate_burndown_rows(sprint)
+    eager = burndown.generate_burndown_data(sprint)
+
+    assert list(burndown.iter_burndown_rows(lazy)) == list(burndown.iter_burndown_rows(eager))
+    assert lazy['duplicate_dates'] == eager['duplicate_dates']
+    assert burndown.format_as_table(burndown.generate_burndown_rows(sprint), sprint) == \
+        burndown.format_as_table(eager, sprint)
@@ -0,0 +1,239 @@
+"""Tests for the shared sprint-status loader and its parsed-status cache."""
+
+import os
+import pickle
+
+import pytest
+
+from conftest import load_script
+
+sprint_status = load_script('scrum-master/scripts/sprint_status.py')
+
+STATUS = """\
+project: Demo
+current_sprint: 2
+sprints:
+  - number: 1
+    stories: [{id: S-1, points: 3}]
+  - number: 2
+    stories: [{id: S-2, points: 5}]
+velocity_history:
+  - {sprint: 1, planned: 8, completed: 3}
+"""
+
+
+@pytest.fixture
+def status_file(tmp_path):
+    path = tmp_path / 'sprint-status.yaml'
+    path.write_text(STATUS)
+    return str(path)
+
+
+@pytest.fixture
+def counted(monkeypatch):
+    """Count YAML parses and content hashes done by load_status()."""
+    calls = {'parse': 0, 'hash': 0}
+    parse, content_hash = sprint_status._parse, sprint_status._content_hash
+
+    def counting_parse(*args):
+        calls['parse'] += 1
+        return parse(*args)
+
+    def counting_hash(path):
+        calls['hash'] += 1
+        return content_hash(path)
+
+    monkeypatch.setattr(sprint_status, '_parse', counting_parse)
+    monkeypatch.setattr(sprint_status, '_content_hash', counting_hash)
+    return calls
+
+
+def _move_mtime(path, seconds=5):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_warm_load_skips_parsing(status_file, counted):
+    first = sprint_status.load_status(status_file)
+    assert sprint_status.load_status(status_file) == first
+    assert counted['parse'] == 1
+
+
+def test_changed_content_invalidates(status_file, counted):
+    sprint_status.load_status(status_file)
+    with open(status_file, 'a') as f:
+        f.write('  - {sprint: 2, planned: 5, completed: 5}\n')
+    _move_mtime(status_file)
+
+    data = sprint_status.load_status(status_file)
+    assert len(data['velocity_history']) == 2
+    assert counted['parse'] == 2
+
+
+def test_same_size_edit_invalidates(status_file, counted):
+    sprint_status.load_status(status_file)
+    with open(status_file, 'w') as f:
+        f.write(STATUS.replace('planned: 8', 'planned: 9'))
+    _move_mtime(status_file)
+
+    assert sprint_status.load_status(status_file)['velocity_history'][0]['planned'] == 9
+    assert counted['parse'] == 2
+
+
+def test_touch_is_served_and_refreshes_the_header(status_file, counted):
+    sprint_status.load_status(status_file)
+    _move_mtime(status_file)
+
+    sprint_status.load_status(status_file)
+    assert (counted['parse'], counted['hash']) == (1, 2)
+
+    # The entry now carries the new mtime, so the next run does not re-hash
+    sprint_status.load_status(status_file)
+    assert (counted['parse'], counted['hash']) == (1, 2)
+
+
+def test_requests_are_cached_separately(status_file, counted):
+    full = sprint_status.load_status(status_file)
+    current = sprint_status.load_status(status_file, sprint=sprint_status.CURRENT_SPRINT)
+    assert [s['number'] for s in full['sprints']] == [1, 2]
+    assert [s['number'] for s in current['sprints']] == [2]
+    assert counted['parse'] == 2
+
+
+def test_stale_version_is_a_miss(status_file, counted, cache_dir):
+    sprint_status.load_status(status_file)
+    (entry,) = cache_dir.glob('*.pickle')
+    with open(entry, 'rb') as f:
+        header, data = pickle.load(f), pickle.load(f)
+    header['version'] = sprint_status.CACHE_VERSION - 1
+    with open(entry, 'wb') as f:
+        pickle.dump(header, f)
+        pickle.dump(data, f)
+
+    sprint_status.load_status(status_file)
+    assert counted['parse'] == 2
+
+
+def test_corrupt_entry_is_a_miss(status_file, counted, cache_dir):
+    expected = sprint_status.load_status(status_file)
+    (entry,) = cache_dir.glob('*.pickle')
+    entry.write_bytes(b'not a pickle')
+
+    assert sprint_status.load_status(status_file) == expected
+    assert counted['parse'] == 2
+
+
+def test_no_cache_writes_nothing(status_file, cache_dir):
+    sprint_status.load_status(status_file, use_cache=False)
+    assert not cache_dir.exists()
+
+
+SHAPES = {
+    'current-after-sprints': """\
+sprints:
+  - {number: 1, goal: first}
+  - {number: 2, goal: second}
+velocity_history: [{sprint: 1, completed: 4}]
+current_sprint: 2
+""",
+    'alias-into-skipped-section': """\
+defaults: &base {capacity: 30}
+current_sprint: 1
+sprints:
+  - number: 1
+    settings: *base
+""",
+    'merge-key': """\
+<<: {project: Merged}
+current_sprint: 1
+sprints: [{number: 1}]
+""",
+    'anchored-sprint': """\
+current_sprint: 1
+sprints:
+  - &one {number: 1, stories: [{id: S-1}]}
+  - {number: 2, previous: *one}
+velocity_history: []
+""",
+    'missing-sprint': """\
+current_sprint: 9
+sprints: [{number: 1}]
+""",
+}
+
+
+@pytest.mark.parametrize('sections, sprint', [
+    ((), None),
+    (('velocity_history',), None),
+    ((), sprint_status.CURRENT_SPRINT),
+    (('velocity_history',), 2),
+    (('sprints',), 1),
+])
+@pytest.mark.parametrize('shape', SHAPES, ids=list(SHAPES))
+def test_selective_load_matches_slicing_the_full_document(tmp_path, shape, sections, sprint):
+    path = tmp_path / 'sprint-status.yaml'
+    path.write_text(SHAPES[shape])
+    full = sprint_status.load_status(str(path), use_cache=False)
+
+    selected = sprint_status.load_status(str(path), sections=sections, sprint=sprint, use_cache=False)
+    assert selected == sprint_status._slice(full, set(sections), sprint)
+
+
+def test_selective_load_skips_unrequested_sections(status_file):
+    data = sprint_status.load_status(status_file, sections=(), sprint=1, use_cache=False)
+    assert data == {'project': 'Demo', 'current_sprint': 2,
+                    'sprints': [{'number': 1, 'stories': [{'id': 'S-1', 'points': 3}]}]}
+
+
+def test_empty_file_loads_as_empty(tmp_path):
+    path = tmp_path / 'sprint-status.yaml'
+    path.write_text('')
+    assert sprint_status.load_status(str(path), use_cache=False) == {}
+    assert sprint_status.load_status(str(path), sprint=sprint_status.CURRENT_SPRINT, use_cache=False) == {}
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Enable the in-process cache for one test and count disk cache reads."""
+    monkeypatch.setattr(sprint_status, '_memory', None)
+    monkeypatch.setattr(sprint_status, '_memory_max_entries', 0)
+    sprint_status.enable_memory_cache(max_entries=2)
+    reads = []
+    read = sprint_status._read_cache_entry
+
+    def counting_read(*args):
+        reads.append(args[0])
+        return read(*args)
+
+    monkeypatch.setattr(sprint_status, '_read_cache_entry', counting_read)
+    return reads
+
+
+def test_memory_cache_serves_repeats_without_the_disk(status_file, counted, memory_cache):
+    first = sprint_status.load_status(status_file)
+    assert sprint_status.load_status(status_file) is first
+    assert (counted['parse'], len(memory_cache)) == (1, 1)
+
+
+def test_memory_cache_revalidates_against_the_file(status_file, counted, memory_cache):
+    sprint_status.load_status(status_file)
+    with open(status_file, 'w') as f:
+        f.write(STATUS.replace('planned: 8', 'planned: 9'))
+    _move_mtime(status_file)
+
+    assert sprint_status.load_status(status_file)['velocity_history'][0]['planned'] == 9
+    assert counted['parse'] == 2
+
+
+def test_memory_cache_drops_the_least_recently_used(status_file, counted, memory_cache):
+    full = sprint_status.load_status(status_file)
+    sprint_status.load_status(status_file, sprint=1)
+    sprint_status.load_status(status_file)  # full is now the most recent
+    sprint_status.load_status(status_file, sprint=2)  # evicts sprint=1
+
+    assert len(sprint_status._memory) == 2
+    assert sprint_status.load_status(status_file) is full
+    reads = len(memory_cache)
+    sprint_status.load_status(status_file, sprint=1)
+    assert len(memory_cache) == reads + 1  # back from the disk cache, not parsed again
+    assert counted['parse'] == 3